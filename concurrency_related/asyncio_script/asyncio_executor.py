@@ -1,10 +1,24 @@
 """Asyncio-based concurrent query execution utilities."""
 
 import asyncio
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Callable, Coroutine, Dict, List, Optional
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Coroutine,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from loguru import logger
 
@@ -29,32 +43,109 @@ class ExecutionResult:
     is_success: bool = True
 
 
+ArgumentsSource = Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]]
+
+
+async def _aiter_arguments(arguments: ArgumentsSource) -> AsyncIterator[Dict[str, Any]]:
+    """Iterate lazily over a sync or async iterable of argument dicts."""
+    if hasattr(arguments, "__aiter__"):
+        async for args in arguments:
+            yield args
+    else:
+        for args in arguments:
+            yield args
+
+
 class AsyncioQueryExecutor:
     """Executor for running async queries concurrently using asyncio."""
 
-    def __init__(self, timeout: Optional[float] = None):
+    # Concurrency of iter_function_concurrent when no limit is configured
+    DEFAULT_MAX_CONCURRENCY = 100
+
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        max_workers: Optional[int] = None,
+        chunksize: int = 1,
+        max_concurrency: Optional[int] = None,
+    ):
         """
         Initialize asyncio executor.
 
+        Plain (non-async) functions are run on a thread pool.  The pool is
+        created per call unless the executor is started (``start()``,
+        ``with`` or ``async with``), in which case one pool is reused by every
+        call until ``close()``.
+
         Args:
             timeout: Timeout per query execution in seconds
+            max_workers: Threads for plain functions (default: ThreadPoolExecutor's)
+            chunksize: Plain-function tasks handed to a thread as one work item
+            max_concurrency: Maximum number of tasks in flight.  ``None``
+                keeps execute_function_concurrent unbounded (all tasks are
+                gathered at once) and iter_function_concurrent at
+                DEFAULT_MAX_CONCURRENCY.
         """
+        if chunksize < 1:
+            raise AsyncioExecutionError("chunksize must be at least 1")
+        if max_concurrency is not None and max_concurrency < 1:
+            raise AsyncioExecutionError("max_concurrency must be at least 1")
         self.timeout = timeout
+        self.max_workers = max_workers
+        self.chunksize = chunksize
+        self.max_concurrency = max_concurrency
         self.results: List[ExecutionResult] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def start(self) -> "AsyncioQueryExecutor":
+        """Start a long-lived thread pool for plain functions until close()."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self
+
+    def close(self) -> None:
+        """Shut down the long-lived thread pool, waiting for running tasks."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self) -> "AsyncioQueryExecutor":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "AsyncioQueryExecutor":
+        return self.start()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        # Join the pool threads without blocking the event loop
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
 
     async def execute_function_concurrent(
         self,
         async_function: Callable[..., Coroutine],
-        arguments_list: List[Dict[str, Any]],
+        arguments_list: ArgumentsSource,
         query_ids: Optional[List[str]] = None,
+        chunksize: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
     ) -> List[ExecutionResult]:
         """
         Execute an async function concurrently across multiple argument sets.
 
+        A plain (non-async) function is run on the executor's thread pool in
+        chunks of ``chunksize`` tasks instead.  With a concurrency limit, or
+        when ``arguments_list`` is not a list, the work goes through
+        iter_function_concurrent and the results are put back in input order.
+
         Args:
             async_function: Async callable that accepts keyword arguments
-            arguments_list: List of dicts containing function arguments
+            arguments_list: List (or any sync/async iterable) of dicts
+                containing function arguments
             query_ids: Optional list of identifiers for each execution
+            chunksize: Plain-function tasks per work item (default: the
+                executor's chunksize)
+            max_concurrency: Maximum tasks in flight (default: the executor's)
 
         Returns:
             List of ExecutionResult objects
@@ -62,9 +153,27 @@ class AsyncioQueryExecutor:
         Raises:
             AsyncioExecutionError: If execution fails
         """
+        max_concurrency = max_concurrency or self.max_concurrency
+        if max_concurrency is not None or not isinstance(arguments_list, list):
+            indexed = [
+                item
+                async for item in self._iter_indexed(
+                    async_function, arguments_list, query_ids, max_concurrency
+                )
+            ]
+            if not indexed:
+                raise AsyncioExecutionError("arguments_list cannot be empty")
+            self.results = [result for _, result in sorted(indexed, key=lambda x: x[0])]
+            return self.results
+
         if not arguments_list:
             raise AsyncioExecutionError("arguments_list cannot be empty")
 
+        if not asyncio.iscoroutinefunction(async_function):
+            return await self._execute_sync_concurrent(
+                async_function, arguments_list, query_ids, chunksize or self.chunksize
+            )
+
         try:
             # Create tasks for all executions
             tasks = []
@@ -102,6 +211,214 @@ class AsyncioQueryExecutor:
         except Exception as e:
             raise AsyncioExecutionError(f"Asyncio execution failed: {e}")
 
+    async def iter_function_concurrent(
+        self,
+        async_function: Callable[..., Coroutine],
+        arguments: ArgumentsSource,
+        query_ids: Optional[Iterable[str]] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> AsyncIterator[ExecutionResult]:
+        """
+        Run tasks with bounded concurrency and yield results as they finish.
+
+        ``arguments`` is consumed lazily by a producer feeding a bounded queue
+        read by ``max_concurrency`` worker tasks, and finished results wait in
+        a bounded queue until the caller takes them.  Memory therefore stays
+        proportional to ``max_concurrency``, not to the number of tasks, and
+        a slow consumer pauses the workers (backpressure).  Results are not
+        kept in ``self.results``.
+
+        Leaving the ``async for`` early cancels the tasks still in flight.
+
+        Args:
+            async_function: Async (or plain) callable accepting keyword arguments
+            arguments: Sync or async iterable of argument dicts
+            query_ids: Optional iterable of identifiers (default: query_<i>)
+            max_concurrency: Maximum tasks in flight (default: the executor's,
+                else DEFAULT_MAX_CONCURRENCY)
+
+        Yields:
+            ExecutionResult objects in completion order
+
+        Raises:
+            AsyncioExecutionError: If iterating over ``arguments`` fails
+        """
+        indexed = self._iter_indexed(
+            async_function, arguments, query_ids, max_concurrency
+        )
+        try:
+            async for _, result in indexed:
+                yield result
+        finally:
+            # Close the engine now (not at garbage collection) to cancel its tasks
+            await indexed.aclose()
+
+    async def _iter_indexed(
+        self,
+        function: Callable,
+        arguments: ArgumentsSource,
+        query_ids: Optional[Iterable[str]],
+        max_concurrency: Optional[int],
+    ) -> AsyncIterator[Tuple[int, ExecutionResult]]:
+        """Worker-queue engine behind iter_function_concurrent."""
+        limit = max_concurrency or self.max_concurrency or self.DEFAULT_MAX_CONCURRENCY
+        if limit < 1:
+            raise AsyncioExecutionError("max_concurrency must be at least 1")
+
+        ids = iter(query_ids) if query_ids is not None else None
+        work: asyncio.Queue = asyncio.Queue(maxsize=limit)
+        done: asyncio.Queue = asyncio.Queue(maxsize=limit)
+        source_error: Optional[Exception] = None
+
+        async def produce() -> None:
+            nonlocal source_error
+            i = 0
+            try:
+                async for args in _aiter_arguments(arguments):
+                    query_id = next(ids, None) if ids is not None else None
+                    await work.put((i, query_id or f"query_{i}", args))
+                    i += 1
+            except Exception as e:
+                source_error = e
+            await work.put(None)
+
+        async def consume() -> None:
+            while True:
+                item = await work.get()
+                if item is None:
+                    # Pass the end marker on to the next worker
+                    work.put_nowait(None)
+                    await done.put(None)
+                    return
+                i, query_id, args = item
+                await done.put((i, await self._run_one(function, query_id, args)))
+
+        producer = asyncio.create_task(produce())
+        workers = [asyncio.create_task(consume()) for _ in range(limit)]
+        try:
+            finished = 0
+            while finished < limit:
+                item = await done.get()
+                if item is None:
+                    finished += 1
+                else:
+                    yield item
+            if source_error is not None:
+                raise AsyncioExecutionError(
+                    f"Reading arguments failed: {source_error}"
+                ) from source_error
+        finally:
+            for task in (producer, *workers):
+                task.cancel()
+            await asyncio.gather(producer, *workers, return_exceptions=True)
+
+    async def _run_one(
+        self, function: Callable, query_id: str, kwargs: Dict[str, Any]
+    ) -> ExecutionResult:
+        """Run one task, on the event loop or (plain functions) a pool thread."""
+        if asyncio.iscoroutinefunction(function):
+            return await self._run_task(function, query_id, kwargs)
+        (result,) = await self._run_sync_chunk(
+            self._executor, function, [(query_id, kwargs)]
+        )
+        return result
+
+    async def _execute_sync_concurrent(
+        self,
+        function: Callable,
+        arguments_list: List[Dict[str, Any]],
+        query_ids: Optional[List[str]],
+        chunksize: int,
+    ) -> List[ExecutionResult]:
+        """Run a plain function on the thread pool, one work item per chunk."""
+        tasks = [
+            (query_ids[i] if query_ids else f"query_{i}", args)
+            for i, args in enumerate(arguments_list)
+        ]
+        chunks = [tasks[i : i + chunksize] for i in range(0, len(tasks), chunksize)]
+
+        executor = self._executor or ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            chunk_results = await asyncio.gather(
+                *(self._run_sync_chunk(executor, function, chunk) for chunk in chunks)
+            )
+        except Exception as e:
+            raise AsyncioExecutionError(f"Asyncio execution failed: {e}")
+        finally:
+            if executor is not self._executor:
+                executor.shutdown(wait=False)
+
+        self.results = [result for chunk in chunk_results for result in chunk]
+        return self.results
+
+    async def _run_sync_chunk(
+        self,
+        executor: Optional[ThreadPoolExecutor],
+        function: Callable,
+        chunk: List[Tuple[str, Dict[str, Any]]],
+    ) -> List[ExecutionResult]:
+        """
+        Run a chunk of plain-function tasks on one pool thread.
+
+        ``executor=None`` uses the event loop's default executor.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(executor, self._call_chunk, function, chunk)
+        timeout = self.timeout * len(chunk) if self.timeout else None
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            return [
+                ExecutionResult(
+                    query_id=query_id,
+                    task_name="timeout",
+                    start_time=datetime.now(),
+                    end_time=datetime.now(),
+                    duration_seconds=0,
+                    result=None,
+                    error=f"Timeout after {timeout}s",
+                    is_success=False,
+                )
+                for query_id, _ in chunk
+            ]
+
+    @staticmethod
+    def _call_chunk(
+        function: Callable, chunk: List[Tuple[str, Dict[str, Any]]]
+    ) -> List[ExecutionResult]:
+        """
+        Call a plain function for each task of a chunk (runs on a pool thread).
+
+        Args:
+            function: Callable to execute
+            chunk: List of (query_id, kwargs) tuples
+
+        Returns:
+            List of ExecutionResult, one per task
+        """
+        task_name = threading.current_thread().name
+        results = []
+        for query_id, kwargs in chunk:
+            start_time = datetime.now()
+            start_perf = time.perf_counter()
+            try:
+                result, error = function(**kwargs), None
+            except Exception as e:
+                result, error = None, str(e)
+            results.append(
+                ExecutionResult(
+                    query_id=query_id,
+                    task_name=task_name,
+                    start_time=start_time,
+                    end_time=datetime.now(),
+                    duration_seconds=time.perf_counter() - start_perf,
+                    result=result,
+                    error=error,
+                    is_success=error is None,
+                )
+            )
+        return results
+
     async def _run_task(
         self,
         async_function: Callable[..., Coroutine],
@@ -334,6 +334,109 @@ async def test_error_handling():
             logger.warning(f"Could not delete {db_path} - file is still in use")
 
 
+def count_rows(db_path: str, table: str) -> int:
+    """Plain (non-async) query function, run on the executor's thread pool."""
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+async def test_persistent_pool_chunked():
+    """Test reusing one thread pool across calls with chunked submission."""
+    db_path = "test_asyncio.db"
+    setup_test_database(db_path)
+
+    logger.info("\n" + "=" * 70)
+    logger.info("Testing Persistent Pool With Chunked Submission")
+    logger.info("=" * 70)
+
+    arguments_list = [
+        {"db_path": db_path, "table": "users" if i % 2 else "orders"} for i in range(50)
+    ]
+
+    async with AsyncioQueryExecutor(max_workers=2, chunksize=8) as executor:
+        pool = executor._executor
+        first = await executor.execute_function_concurrent(count_rows, arguments_list)
+        second = await executor.execute_function_concurrent(
+            count_rows, arguments_list[:5], chunksize=1
+        )
+        assert executor._executor is pool
+    assert executor._executor is None
+
+    assert len(first) == 50 and all(r.is_success for r in first)
+    assert [r.query_id for r in first] == [f"query_{i}" for i in range(50)]
+    assert [r.result for r in first[:2]] == [10, 8]
+    assert len(second) == 5 and all(r.is_success for r in second)
+    logger.success("Persistent pool test passed")
+
+    time.sleep(0.5)
+    if Path(db_path).exists():
+        Path(db_path).unlink()
+
+
+def test_bounded_streaming():
+    """Test max_concurrency, lazy inputs and as-completed streaming."""
+    logger.info("\n" + "=" * 70)
+    logger.info("Testing Bounded Concurrency And Streaming Results")
+    logger.info("=" * 70)
+
+    state = {"in_flight": 0, "peak": 0, "produced": 0, "max_backlog": 0}
+
+    async def slow_echo(x: int) -> int:
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        try:
+            await asyncio.sleep(0.001 * (x % 3))
+            return x
+        finally:
+            state["in_flight"] -= 1
+
+    def lazy_arguments(n: int):
+        for i in range(n):
+            state["produced"] += 1
+            yield {"x": i}
+
+    async def async_arguments(n: int):
+        for i in range(n):
+            await asyncio.sleep(0)
+            yield {"x": i}
+
+    async def run():
+        executor = AsyncioQueryExecutor(max_concurrency=8)
+
+        # Lazily consumed generator: the backlog stays bounded
+        seen = 0
+        async for result in executor.iter_function_concurrent(
+            slow_echo, lazy_arguments(2000)
+        ):
+            seen += 1
+            state["max_backlog"] = max(state["max_backlog"], state["produced"] - seen)
+        assert seen == 2000
+        assert state["peak"] <= 8
+        assert state["max_backlog"] <= 3 * 8 + 1
+
+        # Async iterable input, results put back in input order
+        results = await executor.execute_function_concurrent(
+            slow_echo, async_arguments(50)
+        )
+        assert [r.result for r in results] == list(range(50))
+        assert results[7].query_id == "query_7"
+
+        # Leaving the loop early cancels the tasks in flight
+        stream = executor.iter_function_concurrent(
+            slow_echo, ({"x": 2} for _ in range(1000))
+        )
+        async for _ in stream:
+            break
+        await stream.aclose()
+        assert state["in_flight"] == 0
+
+    asyncio.run(run())
+    logger.success("Bounded streaming test passed")
+
+
 async def main():
     """Run all async tests."""
     logger.info("=" * 70)
@@ -344,9 +447,12 @@ async def main():
     await test_concurrent_queries()
     print("\n")
     await test_error_handling()
+    print("\n")
+    await test_persistent_pool_chunked()
 
     logger.success("\nAll tests completed!")
 
 
 if __name__ == "__main__":
     asyncio.run(main())
+    test_bounded_streaming()
@@ -0,0 +1,151 @@
+"""Per-task overhead of the four executors: per-call pools vs persistent + chunked.
+
+Every task is a no-op, so the wall time is pure scheduling overhead: pool
+start-up, queue/future bookkeeping, IPC and pickling.  Each executor is run in
+two modes:
+
+* ``per-call``   - the original behaviour: a fresh pool per call, one task per
+  work item (``chunksize=1``).
+* ``persistent`` - the pool is started once (``with executor:``), outside the
+  timed region, and tasks are submitted in chunks of
+  ``ceil(n / (4 * workers))``.
+
+Usage:
+    python overhead_benchmark.py                      # 10, 1k and 100k tasks
+    python overhead_benchmark.py --sizes 10 1000 --workers 2
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from loguru import logger
+
+# Add parent directories to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "concurrent_script"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "asyncio_script"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "multiprocessing_script"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "threading_script"))
+
+from asyncio_executor import AsyncioQueryExecutor
+from multiprocessing_executor import MultiprocessingQueryExecutor
+from threading_executor import ThreadingQueryExecutor
+from threadpool_executor import ThreadPoolQueryExecutor
+
+# Executors log a summary per call; keep the benchmark output readable
+logger.remove()
+logger.add(sys.stderr, level="WARNING")
+
+EXECUTORS = {
+    "ThreadPoolExecutor": ThreadPoolQueryExecutor,
+    "Threading": ThreadingQueryExecutor,
+    "Multiprocessing": MultiprocessingQueryExecutor,
+    "Asyncio": AsyncioQueryExecutor,
+}
+
+
+def task_noop(task_id: int) -> int:
+    """No-op task: returns its argument."""
+    return task_id
+
+
+def _make_executor(name: str, workers: int, chunksize: int):
+    if name == "Asyncio":
+        return AsyncioQueryExecutor(max_workers=workers, chunksize=chunksize)
+    return EXECUTORS[name](max_workers=workers, chunksize=chunksize)
+
+
+def _run(executor, arguments_list: List[Dict[str, Any]]) -> int:
+    """Run one call and return the number of successful tasks."""
+    if isinstance(executor, AsyncioQueryExecutor):
+        results = asyncio.run(
+            executor.execute_function_concurrent(task_noop, arguments_list)
+        )
+    else:
+        results = executor.execute_function_concurrent(task_noop, arguments_list)
+    return sum(r.is_success for r in results)
+
+
+def _time_call(call: Callable[[], int], n_tasks: int, repeat: int) -> float:
+    """Best-of-``repeat`` wall time of ``call`` in seconds."""
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        n_ok = call()
+        best = min(best, time.perf_counter() - start)
+        assert n_ok == n_tasks, f"{n_ok}/{n_tasks} tasks succeeded"
+    return best
+
+
+def benchmark(sizes: List[int], workers: int, repeat: int) -> List[Dict[str, Any]]:
+    """
+    Measure per-task overhead for every executor, mode and size.
+
+    Args:
+        sizes: Numbers of tasks per call
+        workers: Worker threads/processes per executor
+        repeat: Calls per measurement (the best is kept)
+
+    Returns:
+        One dict per (executor, size) with per-task overheads in microseconds
+    """
+    rows = []
+    for name in EXECUTORS:
+        for n_tasks in sizes:
+            arguments_list = [{"task_id": i} for i in range(n_tasks)]
+            chunksize = max(1, math.ceil(n_tasks / (4 * workers)))
+
+            per_call = _make_executor(name, workers, chunksize=1)
+            per_call_seconds = _time_call(
+                lambda: _run(per_call, arguments_list), n_tasks, repeat
+            )
+
+            with _make_executor(name, workers, chunksize) as persistent:
+                _run(persistent, arguments_list[:1])  # warm the pool
+                persistent_seconds = _time_call(
+                    lambda: _run(persistent, arguments_list), n_tasks, repeat
+                )
+
+            row = {
+                "executor": name,
+                "n_tasks": n_tasks,
+                "chunksize": chunksize,
+                "per_call_us_per_task": per_call_seconds / n_tasks * 1e6,
+                "persistent_us_per_task": persistent_seconds / n_tasks * 1e6,
+                "speedup": per_call_seconds / persistent_seconds,
+            }
+            rows.append(row)
+            print(
+                f"{name:20s} n={n_tasks:>7,d}  "
+                f"per-call {row['per_call_us_per_task']:10.1f} us/task  "
+                f"persistent {row['persistent_us_per_task']:8.1f} us/task "
+                f"(chunksize {chunksize:>5d})  x{row['speedup']:.1f}",
+                flush=True,
+            )
+    return rows
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1_000, 100_000])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", type=Path, help="Write the results to this file")
+    args = parser.parse_args()
+
+    rows = benchmark(args.sizes, args.workers, args.repeat)
+    if args.json:
+        args.json.write_text(json.dumps(rows, indent=2))
+
+
+if __name__ == "__main__":
+    import multiprocessing
+
+    multiprocessing.freeze_support()
+    main()
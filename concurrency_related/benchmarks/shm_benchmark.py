@@ -0,0 +1,141 @@
+"""Argument transfer cost of MultiprocessingQueryExecutor: pickled vs shared memory.
+
+Every task receives the same large float64 array and returns a reduction of
+it, so the wall time is dominated by moving the input to the workers.  Each
+size is run in two modes on a persistent pool:
+
+* ``pickled`` - the default: the array is pickled into every task.
+* ``shared``  - ``shared_memory=True``: the array is copied once into
+  ``multiprocessing.shared_memory`` and tasks carry a small handle.
+
+A second measurement returns the array itself (``x * 2``) to time results
+coming back through shared memory.
+
+Usage:
+    python shm_benchmark.py                        # 10 MB, 100 MB and 1 GB
+    python shm_benchmark.py --sizes-mb 10 100 --tasks 8 --workers 2
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+from loguru import logger
+
+# Add parent directories to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "multiprocessing_script"))
+
+from multiprocessing_executor import MultiprocessingQueryExecutor
+
+# Executors log a summary per call; keep the benchmark output readable
+logger.remove()
+logger.add(sys.stderr, level="WARNING")
+
+
+def task_reduce(data: np.ndarray) -> float:
+    """Read-only task: returns the sum of the array."""
+    return float(data.sum())
+
+
+def task_transform(data: np.ndarray) -> np.ndarray:
+    """Task returning an array of the same size as its input."""
+    return data * 2
+
+
+def _time_call(call: Callable[[], int], n_tasks: int, repeat: int) -> float:
+    """Best-of-``repeat`` wall time of ``call`` in seconds."""
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        n_ok = call()
+        best = min(best, time.perf_counter() - start)
+        assert n_ok == n_tasks, f"{n_ok}/{n_tasks} tasks succeeded"
+    return best
+
+
+def _measure(
+    function: Callable, data: np.ndarray, n_tasks: int, workers: int, repeat: int
+) -> Dict[str, float]:
+    """Time ``function`` over ``n_tasks`` copies of ``data`` in both modes."""
+    arguments_list = [{"data": data} for _ in range(n_tasks)]
+    seconds = {}
+    for mode in ("pickled", "shared"):
+        with MultiprocessingQueryExecutor(
+            max_workers=workers, shared_memory=mode == "shared"
+        ) as executor:
+
+            def call() -> int:
+                results = executor.execute_function_concurrent(function, arguments_list)
+                return sum(r.is_success for r in results)
+
+            seconds[mode] = _time_call(call, n_tasks, repeat)
+    return seconds
+
+
+def benchmark(
+    sizes_mb: List[int], n_tasks: int, workers: int, repeat: int
+) -> List[Dict[str, Any]]:
+    """
+    Measure transfer time for every input size, task and mode.
+
+    Args:
+        sizes_mb: Input array sizes in MB
+        n_tasks: Tasks per call, all receiving the same array
+        workers: Worker processes
+        repeat: Calls per measurement (the best is kept)
+
+    Returns:
+        One dict per (size, task) with wall times in seconds
+    """
+    rows = []
+    for size_mb in sizes_mb:
+        data = np.random.default_rng(0).random(size_mb * (1 << 20) // 8)
+        for name, function, tasks in (
+            ("reduce", task_reduce, n_tasks),
+            ("transform", task_transform, 1),
+        ):
+            seconds = _measure(function, data, tasks, workers, repeat)
+            row = {
+                "size_mb": size_mb,
+                "task": name,
+                "n_tasks": tasks,
+                "pickled_seconds": seconds["pickled"],
+                "shared_seconds": seconds["shared"],
+                "speedup": seconds["pickled"] / seconds["shared"],
+            }
+            rows.append(row)
+            print(
+                f"{size_mb:>6,d} MB  {name:10s} x{tasks:<3d} "
+                f"pickled {seconds['pickled']:8.3f}s  "
+                f"shared {seconds['shared']:8.3f}s  x{row['speedup']:.1f}",
+                flush=True,
+            )
+        del data
+    return rows
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes-mb", type=int, nargs="+", default=[10, 100, 1_000])
+    parser.add_argument("--tasks", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", type=Path, help="Write the results to this file")
+    args = parser.parse_args()
+
+    rows = benchmark(args.sizes_mb, args.tasks, args.workers, args.repeat)
+    if args.json:
+        args.json.write_text(json.dumps(rows, indent=2))
+
+
+if __name__ == "__main__":
+    import multiprocessing
+
+    multiprocessing.freeze_support()
+    main()
@@ -326,6 +326,46 @@ def test_error_handling():
             logger.warning(f"Could not delete {db_path} - file is still in use")
 
 
+def count_rows(db_path: str, table: str) -> int:
+    """Return the row count of a table."""
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_persistent_pool_chunked():
+    """Test reusing one worker pool across calls with chunked submission."""
+    db_path = "test_concurrent.db"
+    setup_test_database(db_path)
+
+    logger.info("\n" + "=" * 70)
+    logger.info("Testing Persistent Pool With Chunked Submission")
+    logger.info("=" * 70)
+
+    arguments_list = [
+        {"db_path": db_path, "table": "users" if i % 2 else "orders"} for i in range(50)
+    ]
+
+    with ThreadPoolQueryExecutor(max_workers=2, chunksize=8) as executor:
+        first = executor.execute_function_concurrent(count_rows, arguments_list)
+        second = executor.execute_function_concurrent(
+            count_rows, arguments_list[:5], chunksize=1
+        )
+
+    assert len(first) == 50 and all(r.is_success for r in first)
+    assert sorted(r.query_id for r in first) == sorted(f"query_{i}" for i in range(50))
+    by_id = {r.query_id: r.result for r in first}
+    assert (by_id["query_0"], by_id["query_1"]) == (10, 8)
+    assert len(second) == 5 and all(r.is_success for r in second)
+    logger.success("Persistent pool test passed")
+
+    time.sleep(0.5)
+    if Path(db_path).exists():
+        Path(db_path).unlink()
+
+
 if __name__ == "__main__":
     logger.info("=" * 70)
     logger.info("ThreadPoolQueryExecutor Test Suite")
@@ -335,5 +375,7 @@ if __name__ == "__main__":
     test_concurrent_queries()
     print("\n")
     test_error_handling()
+    print("\n")
+    test_persistent_pool_chunked()
 
     logger.success("\nAll tests completed!")
@@ -33,23 +33,53 @@ class ExecutionResult:
 class ThreadPoolQueryExecutor:
     """Executor for running queries concurrently using ThreadPoolExecutor."""
 
-    def __init__(self, max_workers: int = 5, timeout: Optional[float] = None):
+    def __init__(
+        self, max_workers: int = 5, timeout: Optional[float] = None, chunksize: int = 1
+    ):
         """
         Initialize thread pool executor.
 
+        The worker pool is created per call unless the executor is started
+        (``start()`` or ``with ThreadPoolQueryExecutor(...) as executor:``),
+        in which case one pool is reused by every call until ``close()``.
+
         Args:
             max_workers: Maximum number of worker threads
             timeout: Timeout per query execution in seconds
+            chunksize: Number of tasks submitted to the pool as one work item
         """
+        if chunksize < 1:
+            raise ThreadPoolExecutionError("chunksize must be at least 1")
         self.max_workers = max_workers
         self.timeout = timeout
+        self.chunksize = chunksize
         self.results: List[ExecutionResult] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def start(self) -> "ThreadPoolQueryExecutor":
+        """Start a long-lived worker pool shared by all calls until close()."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self
+
+    def close(self) -> None:
+        """Shut down the long-lived worker pool, waiting for running tasks."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self) -> "ThreadPoolQueryExecutor":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
 
     def execute_function_concurrent(
         self,
         function: Callable,
         arguments_list: List[Dict[str, Any]],
         query_ids: Optional[List[str]] = None,
+        chunksize: Optional[int] = None,
     ) -> List[ExecutionResult]:
         """
         Execute a function concurrently across multiple argument sets.
@@ -58,6 +88,7 @@ class ThreadPoolQueryExecutor:
             function: Callable that accepts keyword arguments
             arguments_list: List of dicts containing function arguments
             query_ids: Optional list of identifiers for each execution
+            chunksize: Tasks per work item (default: the executor's chunksize)
 
         Returns:
             List of ExecutionResult objects
@@ -68,25 +99,28 @@ class ThreadPoolQueryExecutor:
         if not arguments_list:
             raise ThreadPoolExecutionError("arguments_list cannot be empty")
 
+        chunksize = chunksize or self.chunksize
+        tasks = [
+            (query_ids[i] if query_ids else f"query_{i}", args)
+            for i, args in enumerate(arguments_list)
+        ]
+        chunks = [tasks[i : i + chunksize] for i in range(0, len(tasks), chunksize)]
         results = []
 
+        executor = self._executor or ThreadPoolExecutor(max_workers=self.max_workers)
         try:
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                # Submit all tasks
-                future_to_index = {}
-                for i, args in enumerate(arguments_list):
-                    query_id = query_ids[i] if query_ids else f"query_{i}"
-                    future = executor.submit(self._run_task, function, query_id, args)
-                    future_to_index[future] = i
-
-                # Collect results as they complete
-                for future in as_completed(future_to_index, timeout=self.timeout):
-                    try:
-                        result = future.result(timeout=self.timeout)
-                        results.append(result)
-                    except Exception as e:
-                        idx = future_to_index[future]
-                        query_id = query_ids[idx] if query_ids else f"query_{idx}"
+            # Submit one work item per chunk of tasks
+            future_to_chunk = {
+                executor.submit(self._run_chunk, function, chunk): chunk
+                for chunk in chunks
+            }
+
+            # Collect results as they complete
+            for future in as_completed(future_to_chunk, timeout=self.timeout):
+                try:
+                    results.extend(future.result(timeout=self.timeout))
+                except Exception as e:
+                    for query_id, _ in future_to_chunk[future]:
                         results.append(
                             ExecutionResult(
                                 query_id=query_id,
@@ -102,10 +136,20 @@ class ThreadPoolQueryExecutor:
 
         except Exception as e:
             raise ThreadPoolExecutionError(f"Threadpool execution failed: {e}")
+        finally:
+            if executor is not self._executor:
+                executor.shutdown(wait=True)
 
         self.results = results
         return results
 
+    @classmethod
+    def _run_chunk(
+        cls, function: Callable, chunk: List[Tuple[str, Dict[str, Any]]]
+    ) -> List[ExecutionResult]:
+        """Run a chunk of (query_id, kwargs) tasks on one worker thread."""
+        return [cls._run_task(function, query_id, kwargs) for query_id, kwargs in chunk]
+
     @staticmethod
     def _run_task(
         function: Callable, query_id: str, kwargs: Dict[str, Any]
@@ -1,10 +1,12 @@
 """Multiprocessing-based concurrent query execution utilities."""
 
 import multiprocessing
+import threading
 import time
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional
+from multiprocessing import resource_tracker
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from loguru import logger
 
@@ -31,7 +33,10 @@ class ExecutionResult:
 
 
 def _worker_function(
-    function: Callable, query_id: str, kwargs: Dict[str, Any]
+    function: Callable,
+    query_id: str,
+    kwargs: Dict[str, Any],
+    min_shared_bytes: Optional[int] = None,
 ) -> ExecutionResult:
     """
     Worker function to run in separate process.
@@ -39,7 +44,9 @@ def _worker_function(
     Args:
         function: Callable to execute
         query_id: Identifier for this execution
-        kwargs: Keyword arguments for function
+        kwargs: Keyword arguments for function (may hold shared-memory handles)
+        min_shared_bytes: If set, array results of at least this size are
+            returned through shared memory
 
     Returns:
         ExecutionResult with metrics
@@ -49,9 +56,18 @@ def _worker_function(
     process_name = process.name
     start_time = datetime.now()
     start_perf = time.perf_counter()
+    segments = []
+    if min_shared_bytes is not None:
+        # NumPy / pandas are only needed in shared-memory mode
+        from shared_arrays import attach_kwargs, release, share_result
 
     try:
+        if min_shared_bytes is not None:
+            kwargs, segments = attach_kwargs(kwargs)
         result = function(**kwargs)
+        del kwargs
+        if min_shared_bytes is not None:
+            result = share_result(result, min_shared_bytes)
         end_perf = time.perf_counter()
         end_time = datetime.now()
         duration = end_perf - start_perf
@@ -83,36 +99,114 @@ def _worker_function(
             error=str(e),
             is_success=False,
         )
+    finally:
+        if segments:
+            release(segments)
+
+
+def _chunk_worker(
+    function: Callable,
+    chunk: List[Tuple[str, Dict[str, Any]]],
+    min_shared_bytes: Optional[int] = None,
+) -> List[ExecutionResult]:
+    """
+    Worker function running a chunk of tasks in one process.
+
+    The function is pickled once per chunk instead of once per task.
+
+    Args:
+        function: Callable to execute
+        chunk: List of (query_id, kwargs) tuples
+        min_shared_bytes: See _worker_function
+
+    Returns:
+        List of ExecutionResult, one per task
+    """
+    return [
+        _worker_function(function, query_id, kwargs, min_shared_bytes)
+        for query_id, kwargs in chunk
+    ]
 
 
 class MultiprocessingQueryExecutor:
     """Executor for running queries concurrently using multiprocessing.Pool."""
 
-    def __init__(self, max_workers: int = None, timeout: Optional[float] = None):
+    def __init__(
+        self,
+        max_workers: int = None,
+        timeout: Optional[float] = None,
+        chunksize: int = 1,
+        shared_memory: bool = False,
+        min_shared_bytes: int = 1 << 20,
+    ):
         """
         Initialize multiprocessing executor.
 
+        The process pool is created per call unless the executor is started
+        (``start()`` or ``with MultiprocessingQueryExecutor(...) as executor:``),
+        in which case one pool is reused by every call until ``close()``.
+
         Args:
             max_workers: Maximum number of worker processes (default: CPU count)
             timeout: Timeout per query execution in seconds
+            chunksize: Number of tasks sent to a worker process in one message
+            shared_memory: Pass NumPy arrays / DataFrames of at least
+                ``min_shared_bytes`` through ``multiprocessing.shared_memory``
+                instead of pickling them into every task.  Large array
+                results come back the same way.
+            min_shared_bytes: Size threshold for shared-memory transfer
         """
+        if chunksize < 1:
+            raise MultiprocessingExecutionError("chunksize must be at least 1")
         self.max_workers = max_workers or multiprocessing.cpu_count()
         self.timeout = timeout
+        self.chunksize = chunksize
+        self.shared_memory = shared_memory
+        self.min_shared_bytes = min_shared_bytes
         self.results: List[ExecutionResult] = []
+        self._pool = None
+
+    def start(self) -> "MultiprocessingQueryExecutor":
+        """Start a long-lived process pool shared by all calls until close()."""
+        if self._pool is None:
+            self._pool = self._new_pool()
+        return self
+
+    def close(self) -> None:
+        """Shut down the long-lived process pool, waiting for running tasks."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self) -> "MultiprocessingQueryExecutor":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is not None and self._pool is not None:
+            self._pool.terminate()
+        self.close()
 
     def execute_function_concurrent(
         self,
         function: Callable,
         arguments_list: List[Dict[str, Any]],
         query_ids: Optional[List[str]] = None,
+        chunksize: Optional[int] = None,
     ) -> List[ExecutionResult]:
         """
         Execute a function concurrently across multiple argument sets using processes.
 
+        Tasks are sent to the workers in chunks of ``chunksize``, so the
+        function and the IPC round trip are paid once per chunk.  The timeout
+        of a chunk is ``timeout * len(chunk)``; if it expires every task of
+        the chunk is reported as timed out.
+
         Args:
             function: Callable that accepts keyword arguments
             arguments_list: List of dicts containing function arguments
             query_ids: Optional list of identifiers for each execution
+            chunksize: Tasks per message (default: the executor's chunksize)
 
         Returns:
             List of ExecutionResult objects
@@ -123,61 +217,126 @@ class MultiprocessingQueryExecutor:
         if not arguments_list:
             raise MultiprocessingExecutionError("arguments_list cannot be empty")
 
+        chunksize = chunksize or self.chunksize
+        arena = None
+        if self.shared_memory:
+            from shared_arrays import SharedMemoryArena, collect_result, discard_result
+
+            arena = SharedMemoryArena(self.min_shared_bytes)
+        min_shared_bytes = self.min_shared_bytes if self.shared_memory else None
+        tasks = [
+            (
+                query_ids[i] if query_ids else f"query_{i}",
+                arena.share_kwargs(args) if arena else args,
+            )
+            for i, args in enumerate(arguments_list)
+        ]
+        chunks = [tasks[i : i + chunksize] for i in range(0, len(tasks), chunksize)]
+        if arena is not None and arena.shared_bytes:
+            logger.debug(f"Placed {arena.shared_bytes:,} bytes in shared memory")
         results = []
 
-        try:
-            with multiprocessing.Pool(processes=self.max_workers) as pool:
-                # Create async results for all tasks
-                async_results = []
-                for i, args in enumerate(arguments_list):
-                    query_id = query_ids[i] if query_ids else f"query_{i}"
-                    async_result = pool.apply_async(
-                        _worker_function, (function, query_id, args)
+        # A chunk that times out may still finish later (on a persistent
+        # pool); its shared-memory results are then unlinked on arrival
+        # by the pool's result thread instead of leaking.
+        lock = threading.Lock()
+        delivered, abandoned = set(), set()
+
+        def on_arrival(index: int, chunk_results: List[ExecutionResult]) -> None:
+            with lock:
+                delivered.add(index)
+                if index not in abandoned:
+                    return
+            for result in chunk_results:
+                try:
+                    discard_result(result.result)
+                except FileNotFoundError as e:
+                    logger.warning(
+                        f"Shared result of {result.query_id} already gone: {e}"
                     )
-                    async_results.append((i, query_id, async_result))
 
-                # Collect results
-                for i, query_id, async_result in async_results:
+        pool = self._pool or self._new_pool()
+        try:
+            # Create async results for all chunks
+            async_results = [
+                (
+                    i,
+                    chunk,
+                    pool.apply_async(
+                        _chunk_worker,
+                        (function, chunk, min_shared_bytes),
+                        callback=(lambda r, i=i: on_arrival(i, r)) if arena else None,
+                    ),
+                )
+                for i, chunk in enumerate(chunks)
+            ]
+
+            # Collect results
+            for i, chunk, async_result in async_results:
+                timeout = self.timeout * len(chunk) if self.timeout else None
+                try:
                     try:
-                        result = async_result.get(timeout=self.timeout)
-                        results.append(result)
+                        chunk_results = async_result.get(timeout=timeout)
                     except multiprocessing.TimeoutError:
-                        results.append(
-                            ExecutionResult(
-                                query_id=query_id,
-                                process_id=0,
-                                process_name="timeout",
-                                start_time=datetime.now(),
-                                end_time=datetime.now(),
-                                duration_seconds=0,
-                                result=None,
-                                error=f"Timeout after {self.timeout}s",
-                                is_success=False,
-                            )
-                        )
-                    except Exception as e:
-                        results.append(
-                            ExecutionResult(
-                                query_id=query_id,
-                                process_id=0,
-                                process_name="error",
-                                start_time=datetime.now(),
-                                end_time=datetime.now(),
-                                duration_seconds=0,
-                                result=None,
-                                error=str(e),
-                                is_success=False,
-                            )
+                        with lock:
+                            if i not in delivered:
+                                abandoned.add(i)
+                                raise
+                        # arrived while timing out: the callback left it to us
+                        chunk_results = async_result.get()
+                    if arena is not None:
+                        for result in chunk_results:
+                            result.result = collect_result(result.result)
+                    results.extend(chunk_results)
+                except multiprocessing.TimeoutError:
+                    results.extend(
+                        self._failed_result(
+                            query_id, "timeout", f"Timeout after {timeout}s"
                         )
+                        for query_id, _ in chunk
+                    )
+                except Exception as e:
+                    results.extend(
+                        self._failed_result(query_id, "error", str(e))
+                        for query_id, _ in chunk
+                    )
 
         except Exception as e:
             raise MultiprocessingExecutionError(
                 f"Multiprocessing execution failed: {e}"
             )
+        finally:
+            if pool is not self._pool:
+                pool.terminate()
+            if arena is not None:
+                arena.close()
 
         self.results = results
         return results
 
+    def _new_pool(self):
+        """Create a process pool sized to max_workers."""
+        if self.shared_memory:
+            # Workers must inherit the parent's resource tracker, otherwise
+            # each one starts its own and "cleans up" segments on exit
+            resource_tracker.ensure_running()
+        return multiprocessing.Pool(processes=self.max_workers)
+
+    @staticmethod
+    def _failed_result(query_id: str, process_name: str, error: str) -> ExecutionResult:
+        """Build the ExecutionResult of a task that did not return."""
+        return ExecutionResult(
+            query_id=query_id,
+            process_id=0,
+            process_name=process_name,
+            start_time=datetime.now(),
+            end_time=datetime.now(),
+            duration_seconds=0,
+            result=None,
+            error=error,
+            is_success=False,
+        )
+
     def get_summary(self) -> Dict[str, Any]:
         """
         Get summary statistics of all executions.
@@ -0,0 +1,270 @@
+"""Shared-memory transport for NumPy arrays and DataFrames sent to worker processes.
+
+By default every argument of a multiprocessing task is pickled, written to a
+pipe and unpickled in the worker, once per task.  For large arrays shared by
+many tasks that copy dominates.  Here the parent copies each large array once
+into ``multiprocessing.shared_memory`` and tasks carry small picklable handles
+instead; workers map the segment and read it without copying.
+"""
+
+import itertools
+import os
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+# Segments whose buffer is still referenced after a task (e.g. a view kept in
+# a global), kept mapped for the life of the worker instead of closed
+_LINGERING: List[shared_memory.SharedMemory] = []
+
+_counter = itertools.count()
+
+
+def _segment_name() -> str:
+    return f"mpx_{os.getpid()}_{next(_counter)}"
+
+
+@dataclass(frozen=True)
+class SharedArrayHandle:
+    """Picklable reference to a NumPy array held in shared memory."""
+
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+    def attach(self) -> Tuple[np.ndarray, shared_memory.SharedMemory]:
+        """
+        Map the segment and return a read-only view of the array.
+
+        Returns:
+            Tuple of (array view, SharedMemory); close the SharedMemory once
+            the view is no longer used
+        """
+        shm = shared_memory.SharedMemory(name=self.name)
+        array = np.ndarray(self.shape, dtype=np.dtype(self.dtype), buffer=shm.buf)
+        array.flags.writeable = False
+        return array, shm
+
+
+@dataclass(frozen=True)
+class SharedFrameHandle:
+    """Picklable reference to a DataFrame whose numeric columns are shared."""
+
+    columns: Tuple[Any, ...]
+    values: Tuple[Any, ...]  # SharedArrayHandle or the column's own values
+    index: Any  # SharedArrayHandle or a pandas Index
+
+    def attach(self) -> Tuple[pd.DataFrame, List[shared_memory.SharedMemory]]:
+        """
+        Rebuild the DataFrame on top of the shared column buffers.
+
+        Returns:
+            Tuple of (DataFrame, list of SharedMemory to close after use)
+        """
+        segments = []
+
+        def resolve(value):
+            if isinstance(value, SharedArrayHandle):
+                array, shm = value.attach()
+                segments.append(shm)
+                return array
+            return value
+
+        data = {
+            column: resolve(value) for column, value in zip(self.columns, self.values)
+        }
+        frame = pd.DataFrame(data, index=resolve(self.index), copy=False)
+        return frame, segments
+
+
+def _new_segment(
+    array: np.ndarray,
+) -> Tuple[SharedArrayHandle, shared_memory.SharedMemory]:
+    """Copy an array into a new shared-memory segment."""
+    array = np.ascontiguousarray(array)
+    shm = shared_memory.SharedMemory(
+        name=_segment_name(), create=True, size=max(array.nbytes, 1)
+    )
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    return SharedArrayHandle(shm.name, array.shape, array.dtype.str), shm
+
+
+def _shareable(array: np.ndarray, min_bytes: int) -> bool:
+    return array.dtype != object and array.nbytes >= min_bytes
+
+
+class SharedMemoryArena:
+    """
+    Owner of the shared-memory segments created for one batch of tasks.
+
+    Each distinct object is placed in shared memory once, however many tasks
+    reference it.  Use as a context manager (or call ``close()``) to unlink
+    the segments.
+
+    Args:
+        min_bytes: Arrays smaller than this are pickled as usual
+    """
+
+    def __init__(self, min_bytes: int = 1 << 20):
+        self.min_bytes = min_bytes
+        self.shared_bytes = 0
+        self._segments: List[shared_memory.SharedMemory] = []
+        # id(obj) -> (obj, handle); obj is kept so its id is not reused
+        self._handles: Dict[int, Tuple[Any, Any]] = {}
+
+    def __enter__(self) -> "SharedMemoryArena":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _share_array(self, array: np.ndarray) -> SharedArrayHandle:
+        handle, shm = _new_segment(array)
+        self._segments.append(shm)
+        self.shared_bytes += array.nbytes
+        return handle
+
+    def share(self, value: Any) -> Any:
+        """
+        Return a shared-memory handle for a large array or DataFrame.
+
+        Args:
+            value: Any task argument
+
+        Returns:
+            A SharedArrayHandle / SharedFrameHandle, or ``value`` unchanged
+            when it is small or of another type
+        """
+        key = id(value)
+        if key in self._handles:
+            return self._handles[key][1]
+
+        if isinstance(value, np.ndarray) and _shareable(value, self.min_bytes):
+            handle = self._share_array(value)
+        elif isinstance(value, pd.DataFrame) and value.memory_usage().sum() >= (
+            self.min_bytes
+        ):
+            values = []
+            for _, column in value.items():
+                array = column.to_numpy()
+                values.append(
+                    self._share_array(array) if _shareable(array, 0) else array
+                )
+            index = value.index
+            if isinstance(index, pd.RangeIndex) or not _shareable(index.to_numpy(), 0):
+                shared_index = index
+            else:
+                shared_index = self._share_array(index.to_numpy())
+            handle = SharedFrameHandle(
+                tuple(value.columns), tuple(values), shared_index
+            )
+        else:
+            return value
+
+        self._handles[key] = (value, handle)
+        return handle
+
+    def share_kwargs(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply :meth:`share` to every value of a kwargs dict."""
+        return {name: self.share(value) for name, value in kwargs.items()}
+
+    def close(self) -> None:
+        """Close and unlink every segment of the arena."""
+        for shm in self._segments:
+            try:
+                shm.close()
+                shm.unlink()
+            except (BufferError, FileNotFoundError) as e:
+                logger.warning(f"Could not release shared memory {shm.name}: {e}")
+        self._segments = []
+        self._handles = {}
+
+
+# ----------------------------------------------------------------------
+#  Worker side
+# ----------------------------------------------------------------------
+
+
+def attach_kwargs(
+    kwargs: Dict[str, Any],
+) -> Tuple[Dict[str, Any], List[shared_memory.SharedMemory]]:
+    """
+    Replace shared-memory handles in a kwargs dict by the objects they refer to.
+
+    Args:
+        kwargs: Task kwargs, possibly containing handles
+
+    Returns:
+        Tuple of (resolved kwargs, segments to release after the task)
+    """
+    resolved, segments = {}, []
+    for name, value in kwargs.items():
+        if isinstance(value, SharedArrayHandle):
+            value, shm = value.attach()
+            segments.append(shm)
+        elif isinstance(value, SharedFrameHandle):
+            value, frame_segments = value.attach()
+            segments.extend(frame_segments)
+        resolved[name] = value
+    return resolved, segments
+
+
+def release(segments: List[shared_memory.SharedMemory]) -> None:
+    """Close segments mapped by attach_kwargs (the parent unlinks them)."""
+    for shm in segments:
+        try:
+            shm.close()
+        except BufferError:
+            # A view of the segment outlived the task; keep it mapped
+            _LINGERING.append(shm)
+
+
+def share_result(result: Any, min_bytes: int) -> Any:
+    """
+    Move a large array result into a new segment owned by the parent.
+
+    Args:
+        result: Task return value
+        min_bytes: Arrays smaller than this are returned unchanged
+
+    Returns:
+        A SharedArrayHandle for large arrays, otherwise ``result``
+    """
+    if isinstance(result, np.ndarray) and _shareable(result, min_bytes):
+        handle, shm = _new_segment(result)
+        shm.close()
+        return handle
+    return result
+
+
+def collect_result(result: Any) -> Any:
+    """
+    Copy a result returned by share_result out of shared memory and unlink it.
+
+    Args:
+        result: Value returned by a worker
+
+    Returns:
+        The array (a private copy) or ``result`` unchanged
+    """
+    if not isinstance(result, SharedArrayHandle):
+        return result
+    view, shm = result.attach()
+    try:
+        return view.copy()
+    finally:
+        del view
+        shm.close()
+        shm.unlink()
+
+
+def discard_result(result: Any) -> None:
+    """Unlink the segment of a result returned by share_result, unread."""
+    if isinstance(result, SharedArrayHandle):
+        shm = shared_memory.SharedMemory(name=result.name)
+        shm.close()
+        shm.unlink()
@@ -6,6 +6,8 @@ import time
 from pathlib import Path
 from typing import Any, Dict
 
+import numpy as np
+import pandas as pd
 from loguru import logger
 from multiprocessing_executor import MultiprocessingQueryExecutor
 
@@ -328,6 +330,141 @@ def test_error_handling():
             logger.warning(f"Could not delete {db_path} - file is still in use")
 
 
+def count_rows(db_path: str, table: str) -> int:
+    """Return the row count of a table."""
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_persistent_pool_chunked():
+    """Test reusing one worker pool across calls with chunked submission."""
+    db_path = "test_multiprocessing.db"
+    setup_test_database(db_path)
+
+    logger.info("\n" + "=" * 70)
+    logger.info("Testing Persistent Pool With Chunked Submission")
+    logger.info("=" * 70)
+
+    arguments_list = [
+        {"db_path": db_path, "table": "users" if i % 2 else "orders"} for i in range(50)
+    ]
+
+    with MultiprocessingQueryExecutor(max_workers=2, chunksize=8) as executor:
+        first = executor.execute_function_concurrent(count_rows, arguments_list)
+        second = executor.execute_function_concurrent(
+            count_rows, arguments_list[:5], chunksize=1
+        )
+
+    assert len(first) == 50 and all(r.is_success for r in first)
+    assert sorted(r.query_id for r in first) == sorted(f"query_{i}" for i in range(50))
+    by_id = {r.query_id: r.result for r in first}
+    assert (by_id["query_0"], by_id["query_1"]) == (10, 8)
+    assert len(second) == 5 and all(r.is_success for r in second)
+    logger.success("Persistent pool test passed")
+
+    time.sleep(0.5)
+    if Path(db_path).exists():
+        Path(db_path).unlink()
+
+
+def weighted_total(values: np.ndarray, frame: pd.DataFrame, column: str) -> float:
+    """Return the dot product of an array with a DataFrame column."""
+    return float(values @ frame[column].to_numpy())
+
+
+def scale(values: np.ndarray, factor: float) -> np.ndarray:
+    """Return a scaled copy of an array."""
+    return values * factor
+
+
+def slow_scale(values: np.ndarray, factor: float, seconds: float) -> np.ndarray:
+    """Return a scaled copy of an array after sleeping."""
+    time.sleep(seconds)
+    return values * factor
+
+
+def test_shared_memory_arguments():
+    """Test passing arrays and DataFrames to workers through shared memory."""
+    db_path = "test_multiprocessing.db"
+    setup_test_database(db_path)
+
+    logger.info("\n" + "=" * 70)
+    logger.info("Testing Shared-Memory Arguments")
+    logger.info("=" * 70)
+
+    conn = sqlite3.connect(db_path)
+    orders = pd.read_sql_query("SELECT * FROM orders", conn)
+    conn.close()
+    values = np.arange(len(orders), dtype=float)
+    big = np.random.default_rng(0).random(200_000)
+
+    with MultiprocessingQueryExecutor(
+        max_workers=2, shared_memory=True, min_shared_bytes=64
+    ) as executor:
+        totals = executor.execute_function_concurrent(
+            weighted_total,
+            [
+                {"values": values, "frame": orders, "column": c}
+                for c in ("amount", "id")
+            ],
+        )
+        scaled = executor.execute_function_concurrent(
+            scale, [{"values": big, "factor": f} for f in (1.0, 2.0, 3.0)], chunksize=2
+        )
+
+    assert all(r.is_success for r in totals), [r.error for r in totals]
+    expected = {
+        "query_0": float(values @ orders["amount"].to_numpy()),
+        "query_1": float(values @ orders["id"].to_numpy()),
+    }
+    assert {r.query_id: r.result for r in totals} == expected
+    for r in scaled:
+        assert r.is_success, r.error
+        factor = int(r.query_id[-1]) + 1
+        np.testing.assert_array_equal(r.result, big * factor)
+    logger.success("Shared-memory test passed")
+
+    time.sleep(0.5)
+    if Path(db_path).exists():
+        Path(db_path).unlink()
+
+
+def test_shared_memory_timeout_does_not_leak():
+    """Test that results of timed-out tasks are unlinked when they arrive."""
+    logger.info("\n" + "=" * 70)
+    logger.info("Testing Shared-Memory Results of Timed-Out Tasks")
+    logger.info("=" * 70)
+
+    shm_dir = Path("/dev/shm")
+    before = set(shm_dir.glob("mpx_*")) if shm_dir.exists() else set()
+    big = np.random.default_rng(0).random(200_000)
+
+    with MultiprocessingQueryExecutor(
+        max_workers=2, timeout=0.2, shared_memory=True, min_shared_bytes=64
+    ) as executor:
+        results = executor.execute_function_concurrent(
+            slow_scale,
+            [
+                {"values": big, "factor": 2.0, "seconds": 0.0},
+                {"values": big, "factor": 3.0, "seconds": 1.0},
+            ],
+        )
+        # let the timed-out task finish on the persistent pool
+        time.sleep(1.5)
+
+    by_id = {r.query_id: r for r in results}
+    np.testing.assert_array_equal(by_id["query_0"].result, big * 2.0)
+    assert not by_id["query_1"].is_success
+    assert "Timeout" in by_id["query_1"].error
+    if shm_dir.exists():
+        leaked = set(shm_dir.glob("mpx_*")) - before
+        assert not leaked, leaked
+    logger.success("Shared-memory timeout test passed")
+
+
 def main():
     """Main entry point."""
     logger.info("=" * 70)
@@ -338,6 +475,12 @@ def main():
     test_concurrent_queries()
     print("\n")
     test_error_handling()
+    print("\n")
+    test_persistent_pool_chunked()
+    print("\n")
+    test_shared_memory_arguments()
+    print("\n")
+    test_shared_memory_timeout_does_not_leak()
 
     logger.success("\nAll tests completed!")
 
@@ -1,12 +1,13 @@
 """Test file for ThreadingQueryExecutor using SQLite3."""
 
 import sqlite3
+import threading
 import time
 from pathlib import Path
 from typing import Any, Dict
 
 from loguru import logger
-from threading_executor import ThreadingQueryExecutor
+from threading_executor import ThreadingQueryExecutor, check_cancelled
 
 # Configure loguru logger
 logger.remove()  # Remove default handler
@@ -326,6 +327,140 @@ def test_error_handling():
             logger.warning(f"Could not delete {db_path} - file is still in use")
 
 
+def count_rows(db_path: str, table: str) -> int:
+    """Return the row count of a table."""
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_persistent_pool_chunked():
+    """Test reusing one worker pool across calls with chunked submission."""
+    db_path = "test_threading.db"
+    setup_test_database(db_path)
+
+    logger.info("\n" + "=" * 70)
+    logger.info("Testing Persistent Pool With Chunked Submission")
+    logger.info("=" * 70)
+
+    arguments_list = [
+        {"db_path": db_path, "table": "users" if i % 2 else "orders"} for i in range(50)
+    ]
+
+    with ThreadingQueryExecutor(max_workers=2, chunksize=8) as executor:
+        first = executor.execute_function_concurrent(count_rows, arguments_list)
+        second = executor.execute_function_concurrent(
+            count_rows, arguments_list[:5], chunksize=1
+        )
+
+    assert len(first) == 50 and all(r.is_success for r in first)
+    assert sorted(r.query_id for r in first) == sorted(f"query_{i}" for i in range(50))
+    by_id = {r.query_id: r.result for r in first}
+    assert (by_id["query_0"], by_id["query_1"]) == (10, 8)
+    assert len(second) == 5 and all(r.is_success for r in second)
+    logger.success("Persistent pool test passed")
+
+    time.sleep(0.5)
+    if Path(db_path).exists():
+        Path(db_path).unlink()
+
+
+def work_for(seconds: float) -> float:
+    """Busy task that checks for cancellation every 10ms."""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        check_cancelled()
+        time.sleep(0.01)
+    return seconds
+
+
+def test_priority_cancellation_deadlines():
+    """Test cost ordering, per-task deadlines, cancellation and progress."""
+    logger.info("\n" + "=" * 70)
+    logger.info("Testing Priority Queue, Deadlines And Cancellation")
+    logger.info("=" * 70)
+
+    # One worker runs the most expensive tasks first; results keep input order
+    durations = [0.01, 0.05, 0.02, 0.04, 0.03]
+    executor = ThreadingQueryExecutor(max_workers=1)
+    results = executor.execute_function_concurrent(
+        work_for, [{"seconds": d} for d in durations], costs=lambda kw: kw["seconds"]
+    )
+    assert [r.result for r in results] == durations
+    started = sorted(results, key=lambda r: r.start_time)
+    assert [r.result for r in started] == sorted(durations, reverse=True)
+
+    # Overdue tasks are reported at their deadline, whether they ignore it or
+    # stop themselves through check_cancelled(), and the other tasks still run
+    executor = ThreadingQueryExecutor(max_workers=2, timeout=0.2, chunksize=2)
+    start = time.perf_counter()
+    results = executor.execute_function_concurrent(
+        lambda kind, seconds: (
+            time.sleep(seconds) if kind == "hang" else work_for(seconds)
+        ),
+        [
+            {"kind": "hang", "seconds": 1.0},
+            {"kind": "ok", "seconds": 0.01},
+            {"kind": "work", "seconds": 1.0},
+            {"kind": "ok", "seconds": 0.01},
+        ],
+    )
+    assert time.perf_counter() - start < 0.8
+    assert results[0].error == "Timeout"
+    assert results[2].error in ("Timeout", "query_2 deadline exceeded")
+    assert results[1].is_success and results[3].is_success
+
+    # Cancelling stops the running task and skips the queued ones
+    snapshots = []
+    with ThreadingQueryExecutor(max_workers=1) as executor:
+
+        def cancel_soon():
+            time.sleep(0.1)
+            snapshots.append(executor.progress())
+            executor.cancel()
+
+        threading.Thread(target=cancel_soon).start()
+        results = executor.execute_function_concurrent(work_for, [{"seconds": 1.0}] * 4)
+        assert executor.progress()["total"] == 0
+
+    assert snapshots[0]["total"] == 4 and snapshots[0]["running"] == 1
+    assert snapshots[0]["queued"] == 3
+    assert "cancelled" in results[0].error
+    assert [r.error for r in results[1:]] == ["Cancelled"] * 3
+    logger.success("Priority, deadline and cancellation test passed")
+
+
+def exit_or_echo(value: int) -> int:
+    """Return value, or raise SystemExit (not an Exception) for 0."""
+    if value == 0:
+        raise SystemExit("worker exit")
+    return value
+
+
+def test_worker_base_exception():
+    """Test that a task raising SystemExit fails instead of hanging the call."""
+    logger.info("\n" + "=" * 70)
+    logger.info("Testing BaseException In A Task")
+    logger.info("=" * 70)
+
+    with ThreadingQueryExecutor(max_workers=2, chunksize=2) as executor:
+        results = executor.execute_function_concurrent(
+            exit_or_echo, [{"value": v} for v in (1, 0, 2, 3)]
+        )
+        # the dead worker was replaced: a second call still completes
+        again = executor.execute_function_concurrent(
+            exit_or_echo, [{"value": v} for v in (4, 5, 6)]
+        )
+
+    assert results[0].result == 1
+    assert results[1].error == "SystemExit: worker exit"
+    assert [r.is_success for r in results[2:]] == [True, True]
+    assert [r.result for r in again] == [4, 5, 6]
+    logger.success("BaseException test passed")
+
+
 if __name__ == "__main__":
     logger.info("=" * 70)
     logger.info("ThreadingQueryExecutor Test Suite")
@@ -335,5 +470,11 @@ if __name__ == "__main__":
     test_concurrent_queries()
     print("\n")
     test_error_handling()
+    print("\n")
+    test_persistent_pool_chunked()
+    print("\n")
+    test_priority_cancellation_deadlines()
+    print("\n")
+    test_worker_base_exception()
 
     logger.success("\nAll tests completed!")
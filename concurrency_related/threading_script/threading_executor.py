@@ -1,14 +1,19 @@
 """Threading-based concurrent query execution utilities using manual thread management."""
 
+import itertools
+import math
 import queue
 import threading
 import time
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from loguru import logger
 
+# How often the caller checks running tasks against their deadlines
+POLL_INTERVAL = 0.05
+
 
 class ThreadingExecutionError(Exception):
     """Custom exception for threading execution errors."""
@@ -16,6 +21,12 @@ class ThreadingExecutionError(Exception):
     pass
 
 
+class TaskCancelledError(ThreadingExecutionError):
+    """Raised by check_cancelled() inside a task that should stop."""
+
+    pass
+
+
 @dataclass
 class ExecutionResult:
     """Result of a query execution."""
@@ -31,27 +42,256 @@ class ExecutionResult:
     is_success: bool = True
 
 
+# Estimated cost per task: one number per task, or a function of its kwargs
+CostEstimate = Union[List[float], Callable[[Dict[str, Any]], float]]
+
+# Task being run by the current worker thread, read by check_cancelled()
+_current = threading.local()
+
+
+def check_cancelled() -> None:
+    """
+    Stop the calling task if its call was cancelled or it passed its deadline.
+
+    Threads cannot be interrupted from outside, so long-running task
+    functions should call this at safe points (e.g. between batches of rows).
+    It does nothing when called outside an executor task.
+
+    Raises:
+        TaskCancelledError: If the task should stop
+    """
+    task = getattr(_current, "task", None)
+    if task is not None:
+        reason = task.stop_reason()
+        if reason:
+            raise TaskCancelledError(f"{task.query_id} {reason}")
+
+
+class _Task:
+    """A running task, shared by its worker thread and the waiting caller."""
+
+    __slots__ = (
+        "index",
+        "query_id",
+        "batch",
+        "thread",
+        "rest",
+        "start",
+        "deadline",
+        "lock",
+        "finished",
+        "abandoned",
+    )
+
+    def __init__(
+        self,
+        index: int,
+        query_id: str,
+        batch: "_ResultBatch",
+        thread: threading.Thread,
+        timeout: Optional[float],
+        rest: Tuple[float, Callable, List, int],
+    ):
+        self.index = index
+        self.query_id = query_id
+        self.batch = batch
+        # (priority, function, chunk, position) of the tasks after this one
+        # in its chunk, requeued by the caller if this task is abandoned
+        self.rest = rest
+        self.thread = thread
+        self.start = time.perf_counter()
+        self.deadline = self.start + timeout if timeout else None
+        # Decides whether the worker's result or the caller's timeout wins
+        self.lock = threading.Lock()
+        self.finished = False
+        self.abandoned = False
+
+    def stop_reason(self) -> Optional[str]:
+        if self.batch.cancelled.is_set():
+            return "cancelled"
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            return "deadline exceeded"
+        return None
+
+
+class _ResultBatch:
+    """
+    Collects the results of one execute_function_concurrent call.
+
+    Every thread appends to its own buffer, so recording a result takes no
+    shared lock; the buffers are merged in input order at the end.
+    """
+
+    def __init__(self, expected: int):
+        self.expected = expected
+        self.buffers: Dict[int, List[Tuple[int, ExecutionResult]]] = {}
+        self.running: Dict[int, _Task] = {}
+        self.cancelled = threading.Event()
+        self.done = threading.Event()
+
+    def buffer(self) -> List[Tuple[int, ExecutionResult]]:
+        """Return the calling thread's result buffer."""
+        # dict.setdefault is atomic in CPython
+        return self.buffers.setdefault(threading.get_ident(), [])
+
+    def check_done(self) -> None:
+        """Signal the waiting caller once every task has a result."""
+        if self.completed() >= self.expected:
+            self.done.set()
+
+    def completed(self) -> int:
+        return sum(len(buffer) for buffer in list(self.buffers.values()))
+
+    def snapshot(self) -> List[ExecutionResult]:
+        """Merge the buffers, in input order."""
+        merged = [item for buffer in list(self.buffers.values()) for item in buffer]
+        return [result for _, result in sorted(merged, key=lambda item: item[0])]
+
+    def progress(self) -> Dict[str, int]:
+        results = [r for buffer in list(self.buffers.values()) for _, r in buffer]
+        failed = sum(not r.is_success for r in results)
+        running = len(self.running)
+        return {
+            "total": self.expected,
+            "queued": self.expected - len(results) - running,
+            "running": running,
+            "completed": len(results),
+            "succeeded": len(results) - failed,
+            "failed": failed,
+        }
+
+
 class ThreadingQueryExecutor:
-    """Executor for running queries concurrently using manual thread management."""
+    """
+    Executor for running queries concurrently using manual thread management.
 
-    def __init__(self, max_workers: int = 5, timeout: Optional[float] = None):
+    Workers pull from one priority queue.  When cost estimates are given,
+    the most expensive tasks are dequeued first, so long tasks do not start
+    last and leave the other workers idle at the tail.
+    """
+
+    def __init__(
+        self, max_workers: int = 5, timeout: Optional[float] = None, chunksize: int = 1
+    ):
         """
         Initialize threading executor.
 
+        Worker threads are started per call unless the executor is started
+        (``start()`` or ``with ThreadingQueryExecutor(...) as executor:``),
+        in which case the same workers serve every call until ``close()``.
+
         Args:
             max_workers: Maximum number of worker threads
-            timeout: Timeout per query execution in seconds
+            timeout: Deadline of each task in seconds, counted from its start.
+                An overdue task is reported as timed out, its thread is
+                abandoned and replaced, and check_cancelled() raises in it.
+            chunksize: Number of tasks put on the work queue as one item
         """
+        if chunksize < 1:
+            raise ThreadingExecutionError("chunksize must be at least 1")
         self.max_workers = max_workers
         self.timeout = timeout
+        self.chunksize = chunksize
         self.results: List[ExecutionResult] = []
         self.results_lock = threading.Lock()
+        self._work_queue: Optional[queue.PriorityQueue] = None
+        self._threads: List[threading.Thread] = []
+        self._batches: List[_ResultBatch] = []
+        self._state_lock = threading.Lock()
+        # Tie-breaker keeping equal priorities in FIFO order
+        self._sequence = itertools.count()
+        self._worker_ids = itertools.count()
+
+    def start(self, num_threads: Optional[int] = None) -> "ThreadingQueryExecutor":
+        """
+        Start long-lived worker threads shared by all calls until close().
+
+        Args:
+            num_threads: Number of workers (default: max_workers)
+        """
+        if self._threads:
+            return self
+        self._work_queue = queue.PriorityQueue()
+        for _ in range(num_threads or self.max_workers):
+            self._add_worker()
+        return self
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Stop the worker threads once the queued work is done.
+
+        Args:
+            wait: Join the threads before returning
+        """
+        if not self._threads:
+            return
+        # Sentinels sort after every work item
+        for _ in self._threads:
+            self._work_queue.put((math.inf, next(self._sequence), None))
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads = []
+        self._work_queue = None
+
+    def __enter__(self) -> "ThreadingQueryExecutor":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _add_worker(self) -> None:
+        thread = threading.Thread(
+            target=self._worker,
+            args=(self._work_queue,),
+            name=f"Worker-{next(self._worker_ids)}",
+            daemon=True,
+        )
+        thread.start()
+        self._threads.append(thread)
+
+    def _replace_worker(self, thread: threading.Thread) -> None:
+        """Start a new worker in place of a lost one (call under _state_lock)."""
+        if thread in self._threads:
+            self._threads.remove(thread)
+            self._add_worker()
+
+    def cancel(self) -> None:
+        """
+        Cancel the calls in progress, from another thread or from a task.
+
+        Queued tasks are reported as cancelled without running; running tasks
+        stop at their next check_cancelled() or finish normally.
+        """
+        with self._state_lock:
+            for batch in self._batches:
+                batch.cancelled.set()
+
+    def progress(self) -> Dict[str, int]:
+        """
+        Get live task counters of the calls in progress.
+
+        Returns:
+            Dictionary with total, queued, running, completed, succeeded and
+            failed task counts
+        """
+        with self._state_lock:
+            batches = list(self._batches)
+        totals = dict.fromkeys(
+            ["total", "queued", "running", "completed", "succeeded", "failed"], 0
+        )
+        for batch in batches:
+            for key, value in batch.progress().items():
+                totals[key] += value
+        return totals
 
     def execute_function_concurrent(
         self,
         function: Callable,
         arguments_list: List[Dict[str, Any]],
         query_ids: Optional[List[str]] = None,
+        chunksize: Optional[int] = None,
+        costs: Optional[CostEstimate] = None,
     ) -> List[ExecutionResult]:
         """
         Execute a function concurrently across multiple argument sets using threads.
@@ -60,9 +300,13 @@ class ThreadingQueryExecutor:
             function: Callable that accepts keyword arguments
             arguments_list: List of dicts containing function arguments
             query_ids: Optional list of identifiers for each execution
+            chunksize: Tasks per work item (default: the executor's chunksize)
+            costs: Estimated cost of each task, as a list or as a function of
+                the task's kwargs (e.g. expected row count).  Tasks are
+                dequeued most expensive first; without it, in input order.
 
         Returns:
-            List of ExecutionResult objects
+            List of ExecutionResult objects, in input order
 
         Raises:
             ThreadingExecutionError: If execution fails
@@ -70,69 +314,224 @@ class ThreadingQueryExecutor:
         if not arguments_list:
             raise ThreadingExecutionError("arguments_list cannot be empty")
 
-        # Reset results
-        self.results = []
-
-        # Create a queue for work items
-        work_queue = queue.Queue()
-
-        # Populate the queue
-        for i, args in enumerate(arguments_list):
-            query_id = query_ids[i] if query_ids else f"query_{i}"
-            work_queue.put((query_id, args))
-
-        # Create and start worker threads
-        threads = []
-        num_threads = min(self.max_workers, len(arguments_list))
-
-        for i in range(num_threads):
-            thread = threading.Thread(
-                target=self._worker,
-                args=(function, work_queue),
-                name=f"Worker-{i}",
-                daemon=False,
-            )
-            thread.start()
-            threads.append(thread)
-
-        # Wait for all threads to complete
-        for thread in threads:
-            if self.timeout:
-                thread.join(timeout=self.timeout * len(arguments_list))
-            else:
-                thread.join()
-
-        # Check if any threads are still alive (timeout)
-        alive_threads = [t for t in threads if t.is_alive()]
-        if alive_threads:
-            logger.warning(f"{len(alive_threads)} threads still running after timeout")
-
+        chunksize = chunksize or self.chunksize
+        estimates = self._estimate_costs(costs, arguments_list)
+        tasks = [
+            (i, query_ids[i] if query_ids else f"query_{i}", args)
+            for i, args in enumerate(arguments_list)
+        ]
+        if estimates is not None:
+            tasks.sort(key=lambda task: -estimates[task[0]])
+        chunks = [tasks[i : i + chunksize] for i in range(0, len(tasks), chunksize)]
+
+        # Without start(), run on temporary workers as before
+        temporary = not self._threads
+        if temporary:
+            self.start(num_threads=min(self.max_workers, len(chunks)))
+
+        batch = _ResultBatch(len(tasks))
+        with self._state_lock:
+            self._batches.append(batch)
+        try:
+            for chunk in chunks:
+                priority = (
+                    -sum(estimates[index] for index, _, _ in chunk)
+                    if estimates is not None
+                    else 0
+                )
+                self._work_queue.put(
+                    (priority, next(self._sequence), (function, chunk, batch))
+                )
+            self._wait(batch)
+        finally:
+            with self._state_lock:
+                self._batches.remove(batch)
+            if temporary:
+                self.close(wait=batch.done.is_set())
+
+        with self.results_lock:
+            self.results = batch.snapshot()
         return self.results
 
-    def _worker(self, function: Callable, work_queue: queue.Queue) -> None:
+    @staticmethod
+    def _estimate_costs(
+        costs: Optional[CostEstimate], arguments_list: List[Dict[str, Any]]
+    ) -> Optional[List[float]]:
+        """Resolve the costs argument to one number per task."""
+        if costs is None:
+            return None
+        if callable(costs):
+            return [float(costs(args)) for args in arguments_list]
+        if len(costs) != len(arguments_list):
+            raise ThreadingExecutionError("costs must have one estimate per task")
+        return [float(cost) for cost in costs]
+
+    def _wait(self, batch: _ResultBatch) -> None:
+        """Wait for a batch, timing out tasks that pass their deadline."""
+        if self.timeout is None:
+            batch.done.wait()
+            return
+        poll_interval = min(self.timeout, POLL_INTERVAL)
+        while not batch.done.wait(poll_interval):
+            self._expire_overdue(batch)
+
+    def _expire_overdue(self, batch: _ResultBatch) -> None:
+        """Report overdue tasks as timed out and replace their threads."""
+        now = time.perf_counter()
+        buffer = batch.buffer()
+        for task in list(batch.running.values()):
+            if task.deadline is None or now <= task.deadline:
+                continue
+            with task.lock:
+                if task.finished:
+                    continue
+                task.abandoned = True
+            batch.running.pop(task.thread.ident, None)
+            logger.warning(
+                f"{task.query_id} still running on {task.thread.name} after "
+                f"{self.timeout}s; abandoning the thread"
+            )
+            buffer.append(
+                (
+                    task.index,
+                    self._failed_result(
+                        task.query_id,
+                        task.thread,
+                        datetime.now() - timedelta(seconds=now - task.start),
+                        "Timeout",
+                    ),
+                )
+            )
+            with self._state_lock:
+                priority, function, chunk, position = task.rest
+                if position < len(chunk):
+                    item = (function, chunk[position:], batch)
+                    self._work_queue.put((priority, next(self._sequence), item))
+                self._replace_worker(task.thread)
+            batch.check_done()
+
+    def _worker(self, work_queue: queue.PriorityQueue) -> None:
         """
-        Worker thread that processes items from the queue.
+        Worker thread that processes items from the queue until a sentinel.
 
         Args:
-            function: Callable to execute
-            work_queue: Queue containing work items
+            work_queue: Queue of (priority, sequence, item) entries, where item
+                is (function, chunk, batch) or None to stop
         """
         while True:
+            priority, _, item = work_queue.get()
             try:
-                # Get work item with timeout
-                query_id, kwargs = work_queue.get(block=True, timeout=0.1)
-            except queue.Empty:
-                break
-
-            try:
-                result = self._run_task(function, query_id, kwargs)
-                with self.results_lock:
-                    self.results.append(result)
-            except Exception as e:
-                logger.error(f"Worker error for {query_id}: {e}")
+                if item is None:
+                    break
+                function, chunk, batch = item
+                try:
+                    abandoned = self._run_chunk(function, chunk, batch, priority)
+                except BaseException as e:
+                    # e.g. SystemExit from a task: the chunk is recorded as
+                    # failed; replace this thread and let it exit
+                    logger.error(
+                        f"{threading.current_thread().name} stopped by "
+                        f"{type(e).__name__}: {e}"
+                    )
+                    with self._state_lock:
+                        self._replace_worker(threading.current_thread())
+                    break
+                if abandoned:
+                    # Abandoned after a deadline and already replaced
+                    break
             finally:
                 work_queue.task_done()
 
+    def _run_chunk(
+        self,
+        function: Callable,
+        chunk: List[Tuple[int, str, Dict[str, Any]]],
+        batch: _ResultBatch,
+        priority: float,
+    ) -> bool:
+        """
+        Run a chunk of tasks into this thread's buffer of the batch.
+
+        Returns:
+            True if this thread was abandoned and should exit
+        """
+        buffer = batch.buffer()
+        thread = threading.current_thread()
+        position, task = 0, None
+        try:
+            for position, (index, query_id, kwargs) in enumerate(chunk):
+                task = None
+                if batch.cancelled.is_set():
+                    buffer.append(
+                        (
+                            index,
+                            self._failed_result(
+                                query_id, thread, datetime.now(), "Cancelled"
+                            ),
+                        )
+                    )
+                    continue
+
+                task = _Task(
+                    index,
+                    query_id,
+                    batch,
+                    thread,
+                    self.timeout,
+                    (priority, function, chunk, position + 1),
+                )
+                batch.running[thread.ident] = task
+                _current.task = task
+                try:
+                    result = self._run_task(function, query_id, kwargs)
+                finally:
+                    _current.task = None
+                    batch.running.pop(thread.ident, None)
+
+                with task.lock:
+                    if task.abandoned:
+                        return True
+                    task.finished = True
+                buffer.append((index, result))
+        except BaseException as e:
+            # A task raised past _run_task (e.g. SystemExit): record the rest
+            # of the chunk so the waiting caller is not left hanging
+            if task is not None:
+                with task.lock:
+                    if task.abandoned:
+                        raise
+                    task.finished = True
+            error = f"{type(e).__name__}: {e}"
+            for index, query_id, _ in chunk[position:]:
+                buffer.append(
+                    (
+                        index,
+                        self._failed_result(query_id, thread, datetime.now(), error),
+                    )
+                )
+            batch.check_done()
+            raise
+        batch.check_done()
+        return False
+
+    @staticmethod
+    def _failed_result(
+        query_id: str, thread: threading.Thread, start_time: datetime, error: str
+    ) -> ExecutionResult:
+        """Build the ExecutionResult of a task that did not return."""
+        end_time = datetime.now()
+        return ExecutionResult(
+            query_id=query_id,
+            thread_id=thread.ident,
+            thread_name=thread.name,
+            start_time=start_time,
+            end_time=end_time,
+            duration_seconds=(end_time - start_time).total_seconds(),
+            result=None,
+            error=error,
+            is_success=False,
+        )
+
     def _run_task(
         self, function: Callable, query_id: str, kwargs: Dict[str, Any]
     ) -> ExecutionResult:
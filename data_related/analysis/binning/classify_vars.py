@@ -3,7 +3,7 @@ import re
 import pandas as pd
 
 _DTYPE_RULES: list[tuple[str, re.Pattern[str]]] = [
-    ("str", re.compile(r"^(object|category|string)$")),
+    ("str", re.compile(r"^(object|category|string|str)$")),
     ("float", re.compile(r"^float")),
     ("int", re.compile(r"^[uU]?[iI]nt")),
     ("dt", re.compile(r"datetime")),
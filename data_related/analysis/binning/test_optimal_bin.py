@@ -0,0 +1,58 @@
+# %%
+import itertools
+
+import numpy as np
+import pandas as pd
+from optimal_bin import _solve, make_binned_column_optimal, optimal_monotone_bins
+
+
+def brute_force(counts, bads, n_bins, min_count, sign):
+    """Best Gini over every partition of the fine bins."""
+    cum_n = np.concatenate([[0], np.cumsum(counts)])
+    cum_bad = np.concatenate([[0], np.cumsum(bads)])
+    best = -np.inf
+    for cuts in itertools.combinations(range(1, len(counts)), n_bins - 1):
+        bounds = [0, *cuts, len(counts)]
+        n, bad = np.diff(cum_n[bounds]), np.diff(cum_bad[bounds])
+        if (n < min_count).any() or (np.diff(sign * bad / n) < 0).any():
+            continue
+        good = n - bad
+        gini = np.abs(np.cumsum(bad) / bad.sum() - np.cumsum(good) / good.sum()).sum()
+        best = max(best, gini)
+    return best
+
+
+# %%
+# dynamic programming agrees with exhaustive search
+rng = np.random.default_rng(0)
+for _ in range(30):
+    m, n_bins = int(rng.integers(6, 14)), int(rng.integers(2, 5))
+    counts = rng.integers(1, 30, m).astype(float)
+    bads = np.floor(counts * rng.random(m))
+    min_count, sign = float(rng.integers(1, 20)), rng.choice([1.0, -1.0])
+    expected = brute_force(counts, bads, n_bins, min_count, sign)
+    try:
+        _, gini = _solve(counts, bads, n_bins, min_count, sign)
+    except ValueError:
+        gini = -np.inf
+    assert np.isclose(gini, expected), (gini, expected)
+
+# %%
+# constraints hold on larger data
+x = rng.normal(size=100_000)
+y = (rng.random(len(x)) < 1 / (1 + np.exp(2 - x))).astype(int)
+res = optimal_monotone_bins(x, y, n_bins=10, min_bin_frac=0.05)
+print(res)
+assert len(res.cuts) == 9
+assert res.counts.min() >= 0.05 * len(x)
+assert np.all(np.diff(res.bad_rates) >= 0)
+
+res = optimal_monotone_bins(-x, y, n_bins=5, direction="decreasing")
+assert np.all(np.diff(res.bad_rates) <= 0)
+
+# %%
+srs = pd.Series(x)
+srs[::100] = np.nan
+binned = make_binned_column_optimal(srs, pd.Series(y), bins=8)
+print(binned.value_counts(dropna=False).sort_index())
+assert binned.isna().sum() == srs.isna().sum()
@@ -0,0 +1,238 @@
+"""Batch single-factor analysis (SFA) over many candidate variables.
+
+calculate_signal groups the whole DataFrame once per variable.  Here the
+target and exposure are encoded once as float arrays shared by every
+variable, each variable is encoded once as integer bin codes, and its signal
+table is built with np.bincount.  Variables can be spread over a process
+pool; workers inherit the data on fork instead of receiving a pickle per
+variable.
+
+The result is one long table (variable x bin) with the calculate_signal
+columns plus WoE and information value, ranked by information value.
+"""
+
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from binning.auto_bin import make_binned_column_quantile
+from binning.classify_vars import classify_vars
+
+# Guard against log(0) for bins without events or non-events
+EPS = 1e-9
+
+OTHER = "_other"
+
+# Integer variables spanning fewer values than this are coded by offset
+MAX_DENSE = 1 << 16
+
+# Data of the running batch in each worker process, set by _init_worker
+_WORKER_DATA: Dict[str, Any] = {}
+
+
+def bin_variables(
+    df: pd.DataFrame,
+    cols: List[str],
+    nunique_threshold: int = 20,
+    bins: int = 10,
+    max_categories: int = 20,
+) -> pd.DataFrame:
+    """Bin candidate variables by their classify_vars group.
+
+    - orig:            low-cardinality, used as-is.
+    - float, int, dt:  quantile bins from make_binned_column_quantile.
+    - str:             the max_categories - 1 most frequent values, the rest
+                       grouped as "_other".
+
+    Returns a new DataFrame of binned columns, same index as df.
+    """
+    df_info = pd.DataFrame(
+        {"dtypes": df[cols].dtypes.astype(str), "nunique": df[cols].nunique()}
+    )
+    groups = classify_vars(df_info, nunique_threshold=nunique_threshold)
+
+    binned = {}
+    for col in groups["orig"]:
+        binned[col] = df[col]
+    for col in groups["float"] + groups["int"] + groups["dt"]:
+        binned[col] = make_binned_column_quantile(df[col], bins=bins)
+    for col in groups["str"]:
+        srs = df[col]
+        top = srs.value_counts().index[: max_categories - 1]
+        binned[col] = srs.where(srs.isin(top) | srs.isna(), OTHER)
+    return pd.DataFrame({col: binned[col] for col in cols}, index=df.index)
+
+
+def encode_targets(
+    df: pd.DataFrame,
+    target_col: str,
+    exposure_col: Optional[str] = None,
+    exposure_on_target_too: bool = True,
+) -> Dict[str, np.ndarray]:
+    """Encode target (and exposure) once as float arrays, missing as 0.
+
+    Keys are the output column names: target_col, exposure_col and
+    "{target_col}_{exposure_col}" for the product.
+    """
+    target = df[target_col].astype(float).fillna(0).to_numpy()
+    targets = {target_col: target}
+    if exposure_col is not None:
+        exposure = df[exposure_col].astype(float).fillna(0).to_numpy()
+        targets[exposure_col] = exposure
+        if exposure_on_target_too:
+            targets[f"{target_col}_{exposure_col}"] = target * exposure
+    return targets
+
+
+def _encode_variable(srs: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """Integer codes and bin labels of a variable; missing is the last bin.
+
+    Categoricals keep all their categories, like observed=False.
+    """
+    values = srs.to_numpy()
+    if isinstance(srs.dtype, pd.CategoricalDtype):
+        codes = srs.cat.codes.to_numpy().astype(np.intp)
+        labels = srs.cat.categories
+    elif values.dtype.kind in "iu" and len(values) and np.ptp(values) < MAX_DENSE:
+        # small-range integers (e.g. pre-binned codes): offset, no hashing
+        low = values.min()
+        codes = values.astype(np.intp) - low
+        present = np.bincount(codes) > 0
+        labels = pd.Index(np.flatnonzero(present) + low, dtype=values.dtype)
+        if not present.all():
+            codes = (np.cumsum(present) - 1)[codes]
+        return codes, labels
+    else:
+        codes, labels = pd.factorize(srs, sort=True)
+    if (codes < 0).any():
+        codes = np.where(codes < 0, len(labels), codes)
+        labels = labels.insert(len(labels), np.nan)
+    return codes, labels
+
+
+def variable_table(
+    srs: pd.Series,
+    targets: Dict[str, np.ndarray],
+    target_col: str,
+    exposure_col: Optional[str] = None,
+) -> pd.DataFrame:
+    """Signal table of one variable, with WoE and IV (target as event flag)."""
+    codes, labels = _encode_variable(srs)
+    n_bins = len(labels)
+
+    table = pd.DataFrame(index=pd.Index(labels, name="bin"))
+    table["count"] = np.bincount(codes, minlength=n_bins)
+    for key, weights in targets.items():
+        table[key] = np.bincount(codes, weights=weights, minlength=n_bins)
+    totals = table.sum()
+
+    # same columns as calculate_signal
+    table["count_dist"] = table["count"] / totals["count"]
+    table[f"{target_col}_dist"] = table[target_col] / totals[target_col]
+    table[f"{target_col}_rate"] = table[target_col] / table["count"]
+    tar_exp = f"{target_col}_{exposure_col}"
+    if tar_exp in targets:
+        table[f"{tar_exp}_dist"] = table[tar_exp] / totals[tar_exp]
+        table[f"{tar_exp}_rate"] = table[tar_exp] / table[exposure_col]
+
+    # WoE / IV
+    events = table[target_col]
+    non_events = table["count"] - events
+    event_rate = events / events.sum()
+    non_event_rate = non_events / non_events.sum()
+    table["woe"] = np.log((event_rate + EPS) / (non_event_rate + EPS))
+    table["iv_component"] = (event_rate - non_event_rate) * table["woe"]
+    table["iv"] = table["iv_component"].sum()
+
+    table = table.reset_index()
+    table.insert(0, "variable", srs.name)
+    return table
+
+
+def _init_worker(frame: pd.DataFrame, targets: Dict[str, np.ndarray]) -> None:
+    _WORKER_DATA["frame"] = frame
+    _WORKER_DATA["targets"] = targets
+
+
+def _worker_tables(
+    cols: List[str], target_col: str, exposure_col: Optional[str]
+) -> List[pd.DataFrame]:
+    frame, targets = _WORKER_DATA["frame"], _WORKER_DATA["targets"]
+    return [
+        variable_table(frame[col], targets, target_col, exposure_col) for col in cols
+    ]
+
+
+def batch_signal(
+    df: pd.DataFrame,
+    cols: List[str],
+    target_col: str,
+    exposure_col: Optional[str] = None,
+    exposure_on_target_too: bool = True,
+    bin_kwargs: Optional[dict] = None,
+    n_jobs: int = 1,
+) -> pd.DataFrame:
+    """Signal tables of many variables in one long table, ranked by IV.
+
+    Args:
+        df: Input data, not modified.
+        cols: Candidate variables.
+        target_col: Binary (0/1) target; events for WoE/IV.
+        exposure_col: Optional exposure, as in calculate_signal.
+        exposure_on_target_too: Add the target x exposure columns.
+        bin_kwargs: If given, variables are first binned with
+            bin_variables(df, cols, **bin_kwargs); otherwise every distinct
+            value is a bin.
+        n_jobs: Worker processes; 1 runs in this process.
+
+    Returns:
+        One row per (variable, bin) with the calculate_signal columns, "woe",
+        "iv_component", the variable's "iv" and "iv_rank" (1 = highest IV),
+        sorted by rank.
+    """
+    if n_jobs < 1:
+        raise ValueError(f"n_jobs must be at least 1, got {n_jobs}")
+
+    frame = bin_variables(df, cols, **bin_kwargs) if bin_kwargs is not None else df
+    targets = encode_targets(df, target_col, exposure_col, exposure_on_target_too)
+
+    if n_jobs == 1:
+        tables = [
+            variable_table(frame[col], targets, target_col, exposure_col)
+            for col in cols
+        ]
+    else:
+        # a few chunks per worker balances uneven column costs
+        size = max(1, math.ceil(len(cols) / (4 * n_jobs)))
+        chunks = [cols[i : i + size] for i in range(0, len(cols), size)]
+        # fork hands the data to workers without pickling it
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        with ProcessPoolExecutor(
+            max_workers=n_jobs,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(frame, targets),
+        ) as pool:
+            tables = [
+                table
+                for chunk_tables in pool.map(
+                    _worker_tables,
+                    chunks,
+                    [target_col] * len(chunks),
+                    [exposure_col] * len(chunks),
+                )
+                for table in chunk_tables
+            ]
+
+    result = pd.concat(tables, ignore_index=True)
+    iv = result.groupby("variable", sort=False)["iv"].first()
+    rank = iv.rank(ascending=False, method="min").astype(int)
+    result["iv_rank"] = result["variable"].map(rank)
+    return result.sort_values(["iv_rank", "variable"], kind="stable").reset_index(
+        drop=True
+    )
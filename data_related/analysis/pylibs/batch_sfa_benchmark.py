@@ -0,0 +1,81 @@
+"""Benchmark batch_signal against one calculate_signal call per variable.
+
+Synthetic data: n_rows x n_vars pre-binned int8 variables with 10 levels
+(every 10th one drives the target), a 0/1 target and a gamma exposure.
+
+The per-variable baseline is slow at full size, so it runs on the first
+--baseline-vars variables only; all timings are reported per variable.
+
+Usage (from data_related/analysis):
+    python pylibs/batch_sfa_benchmark.py                    # 10M x 300
+    python pylibs/batch_sfa_benchmark.py --rows 2000000 --jobs 1 4
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pylibs.batch_sfa import batch_signal
+
+
+def make_data(n_rows: int, n_vars: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    data = {
+        f"v{i:03d}": rng.integers(0, 10, n_rows, dtype=np.int8) for i in range(n_vars)
+    }
+    logit = -2 + sum(0.1 * (data[f"v{i:03d}"] - 4.5) for i in range(0, n_vars, 10))
+    data["target"] = (rng.random(n_rows) < 1 / (1 + np.exp(-logit))).astype(np.int8)
+    data["exposure"] = rng.gamma(2.0, 1.0, n_rows).astype(np.float32)
+    return pd.DataFrame(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--vars", type=int, default=300)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--baseline-vars", type=int, default=20)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    df = make_data(args.rows, args.vars)
+    cols = [col for col in df.columns if col.startswith("v")]
+    print(
+        f"data: {args.rows:,} x {args.vars} "
+        f"({df.memory_usage().sum() / 2**20:,.0f} MB) "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+
+    try:
+        from pylibs.sfa import calculate_signal
+    except ImportError as e:
+        print(f"calculate_signal baseline skipped: {e}")
+    else:
+        baseline_cols = cols[: args.baseline_vars]
+        start = time.perf_counter()
+        for col in baseline_cols:
+            calculate_signal(df, col, "target", exposure_col="exposure")
+        seconds = (time.perf_counter() - start) / len(baseline_cols)
+        print(f"calculate_signal per variable : {seconds:8.3f}s/var")
+
+    for n_jobs in args.jobs:
+        start = time.perf_counter()
+        result = batch_signal(df, cols, "target", "exposure", n_jobs=n_jobs)
+        seconds = time.perf_counter() - start
+        print(
+            f"batch_signal n_jobs={n_jobs:<2d}        : {seconds / len(cols):8.3f}s/var "
+            f"({seconds:.1f}s total)"
+        )
+
+    top = result.drop_duplicates("variable").head(5)
+    print(top[["variable", "iv", "iv_rank"]].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
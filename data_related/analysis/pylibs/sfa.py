@@ -1,9 +1,16 @@
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
 
-VERSION = "2025-09-06"
+VERSION = "2026-10-18"
 
 
 def calculate_signal(
@@ -14,61 +21,163 @@ def calculate_signal(
     exposure_col=None,
     exposure_on_target_too=True,
 ):
+    """
+    Signal table of target_col (and exposure_col) by col, within each segment.
 
-    df = df.copy()
+    Single vectorized pass: one groupby aggregation over the columns used,
+    then distributions within each segment by a grouped transform. The input
+    DataFrame is not copied or modified.
+    """
 
-    # placeholder col for segment column
-    if seg_col is None:
-        seg_col = "_seg"
-        if seg_col in df.columns:
-            raise ValueError(f"Column '{seg_col}' is reserved, change column name.")
-        df[seg_col] = "all"
+    keys = [col] if seg_col is None else [seg_col, col]
+
+    # only the columns used, plus the target x exposure product
+    values = [target_col] if exposure_col is None else [target_col, exposure_col]
+    data = df[keys + values]
+    if exposure_col is not None and exposure_on_target_too:
+        tar_exp = f"{target_col}_{exposure_col}"
+        data = data.assign(**{tar_exp: df[target_col].mul(df[exposure_col])})
+        values.append(tar_exp)
 
     # aggregate
     agg_dict = {}
-    agg_dict["count"] = (target_col, np.size)
-    agg_dict[target_col] = (target_col, "sum")
-    if exposure_col is not None:
-        agg_dict[exposure_col] = (exposure_col, "sum")
-
-        if exposure_on_target_too:
-            tar_exp = f"{target_col}_{exposure_col}"
-            df[tar_exp] = df[target_col].mul(df[exposure_col])
-            agg_dict[tar_exp] = (tar_exp, "sum")
+    agg_dict["count"] = (target_col, "size")
+    for value in values:
+        agg_dict[value] = (value, "sum")
+    _ = data.groupby(keys, dropna=False, observed=False).agg(**agg_dict)
 
-    _ = df.groupby([seg_col, col], dropna=False, observed=False)
-    _ = _.agg(**agg_dict)
+    # segment totals aligned to every row
+    if seg_col is None:
+        totals = _.sum()
+    else:
+        totals = _.groupby(level=0, dropna=False, observed=False).transform("sum")
 
     # count dist
-    grps = _.groupby(seg_col, dropna=False, observed=False)
-    for name, group in grps:
-        group["count_dist"] = group["count"].div(group["count"].sum())
-        _.loc[group.index, ["count_dist"]] = group[["count_dist"]]
+    _["count_dist"] = _["count"].div(totals["count"])
 
     # rates
-    grps = _.groupby(seg_col, dropna=False, observed=False)
-    for name, group in grps:
-        group[f"{target_col}_dist"] = group[target_col].div(group[target_col].sum())
-        group[f"{target_col}_rate"] = group[target_col].div(group["count"])
-        _.loc[group.index, [f"{target_col}_dist", f"{target_col}_rate"]] = group[
-            [f"{target_col}_dist", f"{target_col}_rate"]
-        ]
+    _[f"{target_col}_dist"] = _[target_col].div(totals[target_col])
+    _[f"{target_col}_rate"] = _[target_col].div(_["count"])
 
     # exp rates
-    if exposure_col is not None:
-        grps = _.groupby(seg_col, dropna=False, observed=False)
-        for name, group in grps:
-            group[f"{tar_exp}_dist"] = group[tar_exp].div(group[tar_exp].sum())
-            group[f"{tar_exp}_rate"] = group[tar_exp].div(group[exposure_col])
+    if exposure_col is not None and exposure_on_target_too:
+        _[f"{tar_exp}_dist"] = _[tar_exp].div(totals[tar_exp])
+        _[f"{tar_exp}_rate"] = _[tar_exp].div(_[exposure_col])
 
-            _.loc[group.index, [f"{tar_exp}_dist", f"{tar_exp}_rate"]] = group[
-                [f"{tar_exp}_dist", f"{tar_exp}_rate"]
-            ]
+    return _
 
-    if seg_col == "_seg":
-        _.index = _.index.droplevel(0)
 
-    return _
+def _quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _duckdb_source(source, con):
+    """FROM clause for a Parquet/CSV path (or glob), table name or DataFrame."""
+    if isinstance(source, pd.DataFrame):
+        con.register("_sfa_source", source)
+        return "_sfa_source"
+
+    path = str(source)
+    literal = "'" + path.replace("'", "''") + "'"
+    suffixes = "".join(Path(path).suffixes).lower()
+    if ".parquet" in suffixes or suffixes.endswith(".pq"):
+        return f"read_parquet({literal})"
+    if ".csv" in suffixes or ".tsv" in suffixes:
+        return f"read_csv_auto({literal})"
+    return path
+
+
+def _with_unobserved_categories(result, source, keys, filled):
+    """Add the empty groups of categorical keys, like groupby(observed=False)."""
+    categorical = [k for k in keys if isinstance(source[k].dtype, pd.CategoricalDtype)]
+    if not categorical:
+        return result
+
+    levels = []
+    for key in keys:
+        if key in categorical:
+            result[key] = result[key].astype(source[key].dtype)
+            values = list(source[key].cat.categories)
+        else:
+            values = list(result[key].dropna().drop_duplicates())
+        if result[key].isna().any():
+            values.append(np.nan)
+        levels.append(pd.array(values, dtype=result[key].dtype))
+
+    full = pd.MultiIndex.from_product(levels, names=keys).to_frame(index=False)
+    result = full.merge(result, on=keys, how="left")
+    result[filled] = result[filled].fillna(0)
+    result["count"] = result["count"].astype("int64")
+    return result
+
+
+def calculate_signal_duckdb(
+    source,
+    col,
+    target_col,
+    seg_col=None,
+    exposure_col=None,
+    exposure_on_target_too=True,
+    con=None,
+):
+    """
+    Same table as calculate_signal, computed by DuckDB out of core.
+
+    source is a Parquet/CSV path or glob, a table/view name on con, or a
+    DataFrame. Files are scanned by DuckDB and never loaded into pandas;
+    only the aggregated table is returned.
+
+    Categories that never occur are only known for a DataFrame source with
+    categorical columns; they are added as empty rows like calculate_signal
+    (observed=False). Files and tables have no categories, so only observed
+    values are returned for them.
+    """
+    if duckdb is None:
+        raise ImportError("calculate_signal_duckdb requires duckdb")
+    if con is None:
+        con = duckdb.connect()
+
+    keys = [col] if seg_col is None else [seg_col, col]
+    key_sql = ", ".join(_quote(key) for key in keys)
+    partition = f"partition by {_quote(seg_col)}" if seg_col is not None else ""
+    target = _quote(target_col)
+    tar_exp = f"{target_col}_{exposure_col}"
+
+    aggs = ["count(*) as count", f"sum({target}) as {target}"]
+    rates = [
+        f"count / sum(count) over ({partition}) as count_dist",
+        f"{target} / sum({target}) over ({partition}) "
+        f"as {_quote(target_col + '_dist')}",
+        f"{target} / count as {_quote(target_col + '_rate')}",
+    ]
+    if exposure_col is not None:
+        exposure = _quote(exposure_col)
+        aggs.append(f"sum({exposure}) as {exposure}")
+        if exposure_on_target_too:
+            aggs.append(f"sum({target} * {exposure}) as {_quote(tar_exp)}")
+            rates += [
+                f"{_quote(tar_exp)} / sum({_quote(tar_exp)}) over ({partition}) "
+                f"as {_quote(tar_exp + '_dist')}",
+                f"{_quote(tar_exp)} / {exposure} as {_quote(tar_exp + '_rate')}",
+            ]
+
+    query = f"""
+        with agg as (
+            select {key_sql}, {", ".join(aggs)}
+            from {_duckdb_source(source, con)}
+            group by {key_sql}
+        )
+        select *, {", ".join(rates)}
+        from agg
+        order by {", ".join(f"{_quote(key)} nulls last" for key in keys)}
+    """
+    result = con.execute(query).df()
+    if isinstance(source, pd.DataFrame):
+        # sums and shares of empty groups are 0, their rates stay NaN
+        rate_cols = {f"{target_col}_rate", f"{tar_exp}_rate"}
+        filled = [c for c in result.columns if c not in keys and c not in rate_cols]
+        result = _with_unobserved_categories(result, source, keys, filled)
+    return result.set_index(keys)
 
 
 import matplotlib.ticker as mtick
@@ -1,14 +1,27 @@
 """SQLAlchemy database client with sync and threadpool support."""
 
-from typing import Any, Dict, List, Optional
+import logging
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Union
 
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, exc, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.pool import QueuePool
 
 from .config import DatabaseConfig
 from .exceptions import DatabaseConnectionError, QueryExecutionError
+from .threadpool_executor import ExecutionResult, ThreadPoolQueryExecutor
+
+# pyarrow is only needed for Arrow / Parquet output
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None  # type: ignore
+    pq = None  # type: ignore
+
+logger = logging.getLogger(__name__)
 
 
 class SQLAlchemyClient:
@@ -35,6 +48,7 @@ class SQLAlchemyClient:
         self.config = config
         self.pool_size = pool_size
         self.max_overflow = max_overflow
+        self.last_run_stats: Dict[str, Any] = {}
 
         try:
             connection_string = config.get_sqlalchemy_connection_string()
@@ -120,23 +134,328 @@ class SQLAlchemyClient:
         except Exception as e:
             raise QueryExecutionError(f"Dict query execution failed: {e}")
 
-    def execute_many(self, queries: List[str]) -> List[Optional[pd.DataFrame]]:
+    def iter_query(
+        self,
+        query: str,
+        batch_size: int = 50_000,
+        output: str = "pandas",
+        params: Optional[Dict[str, Any]] = None,
+        schema: Optional["pa.Schema"] = None,
+    ) -> Iterator[Union[pd.DataFrame, "pa.RecordBatch"]]:
         """
-        Execute multiple queries sequentially.
+        Execute a SQL query and stream the results in batches.
+
+        Rows are fetched through a server-side (streaming) cursor, so at most
+        one batch is held in memory and the first batch is available as soon
+        as the database returns it.  The connection stays checked out until
+        the iterator is exhausted or closed.
 
         Args:
-            queries: List of SQL query strings
+            query: SQL query string
+            batch_size: Number of rows per batch
+            output: "pandas" for DataFrames or "arrow" for pyarrow RecordBatches
+            params: Optional bind parameters for the query
+            schema: Optional pyarrow schema for "arrow" output (otherwise the
+                column types are inferred from the first non-null values)
+
+        Yields:
+            One DataFrame or RecordBatch per batch of rows.  An empty result
+            yields a single empty batch carrying the column names.
+
+        Raises:
+            ValueError: If batch_size or output is invalid
+            QueryExecutionError: If query execution or fetching fails
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if output not in ("pandas", "arrow"):
+            raise ValueError("output must be 'pandas' or 'arrow'")
+        if output == "arrow" and pa is None:
+            raise QueryExecutionError(
+                "pyarrow not installed. Install with: pip install pyarrow"
+            )
+        return self._iter_batches(query, batch_size, output, params, schema)
+
+    def _iter_batches(
+        self,
+        query: str,
+        batch_size: int,
+        output: str,
+        params: Optional[Dict[str, Any]],
+        schema: Optional["pa.Schema"],
+    ) -> Iterator[Union[pd.DataFrame, "pa.RecordBatch"]]:
+        """Generator behind iter_query (keeps argument checks eager)."""
+        try:
+            with self.engine.connect() as conn:
+                conn = conn.execution_options(
+                    stream_results=True, max_row_buffer=batch_size
+                )
+                result = conn.execute(text(query), params or {})
+                columns = list(result.keys())
+                types = [None] * len(columns)
+                if schema is not None:
+                    types = [schema.field(name).type for name in columns]
+
+                empty = True
+                for rows in result.partitions(batch_size):
+                    empty = False
+                    if output == "pandas":
+                        yield pd.DataFrame.from_records(rows, columns=columns)
+                    else:
+                        yield self._rows_to_record_batch(rows, columns, types)
+                if empty:
+                    if output == "pandas":
+                        yield pd.DataFrame(columns=columns)
+                    else:
+                        yield self._rows_to_record_batch([], columns, types)
+        except QueryExecutionError:
+            raise
+        except Exception as e:
+            raise QueryExecutionError(f"Streaming query execution failed: {e}")
+
+    @staticmethod
+    def _rows_to_record_batch(
+        rows: Sequence[Sequence[Any]], columns: List[str], types: List[Any]
+    ) -> "pa.RecordBatch":
+        """
+        Convert a batch of rows to a RecordBatch, pinning column types.
+
+        The first non-null type seen for a column is reused for every later
+        batch, so all batches of a query share one schema.
+        """
+        arrays = []
+        values_by_column = list(zip(*rows)) or [()] * len(columns)
+        for i, values in enumerate(values_by_column):
+            array = pa.array(values, type=types[i])
+            if types[i] is None and not pa.types.is_null(array.type):
+                types[i] = array.type
+            arrays.append(array)
+        return pa.RecordBatch.from_arrays(arrays, names=columns)
+
+    def write_parquet(
+        self,
+        query: str,
+        path: str,
+        batch_size: int = 50_000,
+        params: Optional[Dict[str, Any]] = None,
+        schema: Optional["pa.Schema"] = None,
+        compression: str = "snappy",
+    ) -> int:
+        """
+        Stream query results straight into a Parquet file.
+
+        Each batch from iter_query is written as it arrives, so memory use is
+        bounded by batch_size regardless of the size of the result.
+
+        Args:
+            query: SQL query string
+            path: Output Parquet file path
+            batch_size: Number of rows per batch (and per row group)
+            params: Optional bind parameters for the query
+            schema: Optional pyarrow schema of the file.  Needed when a
+                column is entirely NULL in the first batch.
+            compression: Parquet compression codec
+
+        Returns:
+            Number of rows written
+
+        Raises:
+            QueryExecutionError: If query execution or writing fails
+        """
+        batches = self.iter_query(
+            query, batch_size=batch_size, output="arrow", params=params, schema=schema
+        )
+        writer = None
+        n_rows = 0
+        try:
+            for batch in batches:
+                if writer is None:
+                    writer = pq.ParquetWriter(
+                        path, schema or batch.schema, compression=compression
+                    )
+                writer.write_batch(batch)
+                n_rows += batch.num_rows
+        except QueryExecutionError:
+            raise
+        except Exception as e:
+            raise QueryExecutionError(f"Parquet export failed: {e}")
+        finally:
+            batches.close()
+            if writer is not None:
+                writer.close()
+        return n_rows
+
+    @staticmethod
+    def is_transient_error(error: Exception) -> bool:
+        """
+        Default retry predicate for execute_many / iter_many.
+
+        Connection-level failures (OperationalError, invalidated connections)
+        and pool checkout timeouts are retried; SQL errors are not.
+
+        Args:
+            error: Exception raised by a query
 
         Returns:
-            List of DataFrames for each query
+            True if the query should be retried
         """
-        results = []
-        for query in queries:
+        if isinstance(error, exc.TimeoutError):
+            return True
+        if isinstance(error, exc.DBAPIError) and error.connection_invalidated:
+            return True
+        return isinstance(error, exc.OperationalError)
+
+    def _execute_tracked(
+        self, query: str, task_index: int, active: Dict[int, Any]
+    ) -> pd.DataFrame:
+        """Run one query, exposing its DBAPI connection for cancellation."""
+        with self.engine.connect() as conn:
+            active[task_index] = conn.connection.dbapi_connection
             try:
-                results.append(self.execute_query(query))
-            except QueryExecutionError as e:
-                print(f"Warning: Query failed: {e}")
-                results.append(None)
+                return pd.read_sql(query, conn)
+            finally:
+                active.pop(task_index, None)
+
+    @staticmethod
+    def _cancel(dbapi_connection: Any) -> None:
+        """Cancel the statement running on a DBAPI connection, if supported."""
+        # teradatasql / psycopg expose cancel(), sqlite3 exposes interrupt()
+        for name in ("cancel", "interrupt"):
+            method = getattr(dbapi_connection, name, None)
+            if callable(method):
+                method()
+                return
+
+    def iter_many(
+        self,
+        queries: List[str],
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        retries: int = 0,
+        backoff: float = 0.5,
+        is_transient: Optional[Callable[[Exception], bool]] = None,
+    ) -> Iterator[ExecutionResult]:
+        """
+        Execute queries concurrently and yield results as they complete.
+
+        Each worker checks a connection out of the pool, so by default the
+        number of workers equals the pool capacity (pool_size + max_overflow).
+        A query running longer than ``timeout`` is cancelled on its connection
+        (DBAPI ``cancel()`` or ``interrupt()``) and reported as failed.
+        Pool utilisation over the run is recorded in ``last_run_stats``.
+
+        Args:
+            queries: List of SQL query strings
+            max_workers: Number of concurrent queries (default: pool capacity)
+            timeout: Per-query timeout in seconds, from the moment it starts
+            retries: Number of extra attempts for transient errors
+            backoff: Delay before the first retry, doubled on every retry
+            is_transient: Retry predicate (default: is_transient_error)
+
+        Yields:
+            ExecutionResult per query (``index`` is its position in queries,
+            ``result`` a DataFrame or None on failure)
+        """
+        if not queries:
+            return
+        capacity = self.pool_size + self.max_overflow
+        max_workers = max_workers or capacity
+        active: Dict[int, Any] = {}
+        samples: List[int] = []
+        stats = {"n_queries": len(queries), "failed": 0, "timed_out": 0, "retries": 0}
+
+        def sample_pool() -> None:
+            checked_out = self.get_pool_status()["checked_out"]
+            if checked_out is not None:
+                samples.append(checked_out)
+
+        def cancel(task_index: int) -> None:
+            stats["timed_out"] += 1
+            dbapi_connection = active.get(task_index)
+            if dbapi_connection is not None:
+                self._cancel(dbapi_connection)
+
+        executor = ThreadPoolQueryExecutor(max_workers=max_workers, timeout=timeout)
+        start = time.perf_counter()
+        try:
+            for result in executor.iter_function_concurrent(
+                self._execute_tracked,
+                [
+                    {"query": query, "task_index": i, "active": active}
+                    for i, query in enumerate(queries)
+                ],
+                retries=retries,
+                backoff=backoff,
+                is_transient=is_transient or self.is_transient_error,
+                on_timeout=cancel,
+                monitor=sample_pool,
+            ):
+                stats["failed"] += not result.is_success
+                stats["retries"] += result.attempts - 1
+                yield result
+        finally:
+            self.last_run_stats = {
+                **stats,
+                "wall_seconds": time.perf_counter() - start,
+                "max_workers": max_workers,
+                "pool_capacity": capacity,
+                "peak_checked_out": max(samples, default=0),
+                "mean_checked_out": sum(samples) / len(samples) if samples else 0.0,
+                "pool_utilisation": (
+                    sum(samples) / len(samples) / capacity if samples else 0.0
+                ),
+            }
+
+    def execute_many(
+        self,
+        queries: List[str],
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        retries: int = 0,
+        backoff: float = 0.5,
+        is_transient: Optional[Callable[[Exception], bool]] = None,
+        raise_on_error: bool = False,
+    ) -> List[Optional[pd.DataFrame]]:
+        """
+        Execute multiple queries concurrently over the connection pool.
+
+        See iter_many for the meaning of the arguments; use iter_many to
+        process results as they complete instead of in input order.
+
+        Args:
+            queries: List of SQL query strings
+            max_workers: Number of concurrent queries (default: pool capacity)
+            timeout: Per-query timeout in seconds
+            retries: Number of extra attempts for transient errors
+            backoff: Delay before the first retry, doubled on every retry
+            is_transient: Retry predicate (default: is_transient_error)
+            raise_on_error: Raise once all queries have finished if any of
+                them failed or timed out, instead of returning None for them
+
+        Returns:
+            List of DataFrames for each query, in input order (None for
+            queries that failed or timed out)
+
+        Raises:
+            QueryExecutionError: If raise_on_error is set and a query failed
+        """
+        results: List[Optional[pd.DataFrame]] = [None] * len(queries)
+        if not queries:
+            return results
+        failures: List[ExecutionResult] = []
+        for result in self.iter_many(
+            queries, max_workers, timeout, retries, backoff, is_transient
+        ):
+            if result.is_success:
+                results[result.index] = result.result
+            else:
+                logger.error("Query %s failed: %s", result.query_id, result.error)
+                failures.append(result)
+        if failures and raise_on_error:
+            errors = "; ".join(f"{r.query_id}: {r.error}" for r in failures)
+            raise QueryExecutionError(
+                f"{len(failures)} of {len(queries)} queries failed: {errors}"
+            )
         return results
 
     def close(self) -> None:
@@ -155,4 +474,5 @@ class SQLAlchemyClient:
             "max_overflow": self.max_overflow,
             "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
             "pool_type": type(pool).__name__,
+            "last_run": self.last_run_stats,
         }
@@ -1,18 +1,28 @@
 """Teradataml database client with sync and threadpool support."""
 
-from typing import Any, Dict, List, Optional
+import logging
+import re
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 from .config import DatabaseConfig
 from .exceptions import DatabaseConnectionError, QueryExecutionError
+from .threadpool_executor import ExecutionResult, ThreadPoolQueryExecutor
 
 # Try to import teradataml at module level
 try:
-    from teradataml import create_context, execute_sql, remove_context
+    from teradataml import create_context, execute_sql, get_connection, remove_context
 except ImportError:
     create_context = None  # type: ignore
     execute_sql = None  # type: ignore
+    get_connection = None  # type: ignore
     remove_context = None  # type: ignore
 
+logger = logging.getLogger(__name__)
+
+# Teradata error codes worth retrying: 2631 = transaction aborted due to deadlock
+TRANSIENT_ERROR_CODES = re.compile(r"\[Error (2631)\]")
+
 
 class TeradataMLClient:
     """Teradataml client for Teradata database operations."""
@@ -29,6 +39,7 @@ class TeradataMLClient:
         """
         self.config = config
         self.context = None
+        self.last_run_stats: Dict[str, Any] = {}
         self._connect()
 
     def _connect(self) -> None:
@@ -123,23 +134,143 @@ class TeradataMLClient:
         except Exception as e:
             raise QueryExecutionError(f"Dict query execution failed: {e}")
 
-    def execute_many(self, queries: List[str]) -> List[Optional[List[tuple]]]:
+    @staticmethod
+    def is_transient_error(error: Exception) -> bool:
+        """
+        Default retry predicate for execute_many / iter_many.
+
+        Driver-level OperationalErrors and deadlock aborts are retried.  The
+        driver error is looked up through the exception chain, since
+        execute_query wraps it in QueryExecutionError.
+
+        Args:
+            error: Exception raised by a query
+
+        Returns:
+            True if the query should be retried
+        """
+        while error is not None:
+            if type(error).__name__ == "OperationalError":
+                return True
+            if TRANSIENT_ERROR_CODES.search(str(error)):
+                return True
+            error = error.__cause__ or error.__context__
+        return False
+
+    @staticmethod
+    def _cancel_running_request() -> None:
+        """Cancel the request running on the teradataml context connection."""
+        if get_connection is None:
+            return
+        dbapi_connection = get_connection().connection.dbapi_connection
+        dbapi_connection.cancel()
+
+    def iter_many(
+        self,
+        queries: List[str],
+        max_workers: int = 1,
+        timeout: Optional[float] = None,
+        retries: int = 0,
+        backoff: float = 0.5,
+        is_transient: Optional[Callable[[Exception], bool]] = None,
+    ) -> Iterator[ExecutionResult]:
         """
-        Execute multiple queries sequentially.
+        Execute queries on worker threads and yield results as they complete.
+
+        The teradataml context holds a single connection, which serialises
+        requests, so the default is one worker.  With one worker a query
+        running longer than ``timeout`` is cancelled on the context
+        connection; with more workers it is only abandoned.
 
         Args:
             queries: List of SQL query strings
+            max_workers: Number of worker threads
+            timeout: Per-query timeout in seconds, from the moment it starts
+            retries: Number of extra attempts for transient errors
+            backoff: Delay before the first retry, doubled on every retry
+            is_transient: Retry predicate (default: is_transient_error)
+
+        Yields:
+            ExecutionResult per query (``index`` is its position in queries,
+            ``result`` a list of tuples or None on failure)
+        """
+        if not queries:
+            return
+        stats = {"n_queries": len(queries), "failed": 0, "timed_out": 0, "retries": 0}
+
+        def cancel(task_index: int) -> None:
+            stats["timed_out"] += 1
+            if max_workers == 1:
+                self._cancel_running_request()
+
+        executor = ThreadPoolQueryExecutor(max_workers=max_workers, timeout=timeout)
+        start = time.perf_counter()
+        try:
+            for result in executor.iter_function_concurrent(
+                self.execute_query,
+                [{"query": query} for query in queries],
+                retries=retries,
+                backoff=backoff,
+                is_transient=is_transient or self.is_transient_error,
+                on_timeout=cancel,
+            ):
+                stats["failed"] += not result.is_success
+                stats["retries"] += result.attempts - 1
+                yield result
+        finally:
+            self.last_run_stats = {
+                **stats,
+                "wall_seconds": time.perf_counter() - start,
+                "max_workers": max_workers,
+            }
+
+    def execute_many(
+        self,
+        queries: List[str],
+        max_workers: int = 1,
+        timeout: Optional[float] = None,
+        retries: int = 0,
+        backoff: float = 0.5,
+        is_transient: Optional[Callable[[Exception], bool]] = None,
+        raise_on_error: bool = False,
+    ) -> List[Optional[List[tuple]]]:
+        """
+        Execute multiple queries, with per-query timeouts and retries.
+
+        See iter_many for the meaning of the arguments.
+
+        Args:
+            queries: List of SQL query strings
+            max_workers: Number of worker threads
+            timeout: Per-query timeout in seconds
+            retries: Number of extra attempts for transient errors
+            backoff: Delay before the first retry, doubled on every retry
+            is_transient: Retry predicate (default: is_transient_error)
+            raise_on_error: Raise once all queries have finished if any of
+                them failed or timed out, instead of returning None for them
 
         Returns:
-            List of results for each query
-        """
-        results = []
-        for query in queries:
-            try:
-                results.append(self.execute_query(query))
-            except QueryExecutionError as e:
-                print(f"Warning: Query failed: {e}")
-                results.append(None)
+            List of results for each query, in input order (None for queries
+            that failed or timed out)
+
+        Raises:
+            QueryExecutionError: If raise_on_error is set and a query failed
+        """
+        results: List[Optional[List[tuple]]] = [None] * len(queries)
+        failures: List[ExecutionResult] = []
+        for result in self.iter_many(
+            queries, max_workers, timeout, retries, backoff, is_transient
+        ):
+            if result.is_success:
+                results[result.index] = result.result
+            else:
+                logger.error("Query %s failed: %s", result.query_id, result.error)
+                failures.append(result)
+        if failures and raise_on_error:
+            errors = "; ".join(f"{r.query_id}: {r.error}" for r in failures)
+            raise QueryExecutionError(
+                f"{len(failures)} of {len(queries)} queries failed: {errors}"
+            )
         return results
 
     def close(self) -> None:
@@ -1,6 +1,7 @@
 """Tests for SQLAlchemyClient."""
 
 import sys
+import time
 from pathlib import Path
 from unittest.mock import MagicMock, Mock, patch
 
@@ -204,3 +205,171 @@ class TestDatabaseConfig:
         assert params["password"] == "test_password"
         assert params["database"] == "TEST_DB"
         assert params["database"] == "TEST_DB"
+
+
+@pytest.fixture
+def sqlite_client(mock_database_config, tmp_path):
+    """SQLAlchemyClient backed by a real SQLite file with 2,500 rows."""
+    from sqlalchemy import create_engine, text
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'stream.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (id INTEGER, name TEXT, value REAL)"))
+        conn.execute(
+            text("INSERT INTO t VALUES (:id, :name, :value)"),
+            [
+                {
+                    "id": i,
+                    "name": None if i < 1000 else f"n{i}",
+                    "value": i / 2,
+                }
+                for i in range(2500)
+            ],
+        )
+
+    with patch(
+        "db_query_lib.sqlalchemy_client.create_engine", return_value=engine
+    ), patch.object(SQLAlchemyClient, "_test_connection"):
+        client = SQLAlchemyClient(mock_database_config)
+    yield client
+    client.close()
+
+
+class TestSQLAlchemyClientStreaming:
+    """Test cases for iter_query and write_parquet."""
+
+    def test_iter_query_pandas_batches(self, sqlite_client):
+        """Batches are bounded by batch_size and concatenate to the full result."""
+        batches = list(
+            sqlite_client.iter_query("SELECT * FROM t ORDER BY id", batch_size=1000)
+        )
+
+        assert [len(b) for b in batches] == [1000, 1000, 500]
+        df = pd.concat(batches, ignore_index=True)
+        assert list(df.columns) == ["id", "name", "value"]
+        assert df["id"].tolist() == list(range(2500))
+
+    def test_iter_query_is_lazy(self, sqlite_client):
+        """The first batch is available without fetching the rest."""
+        batches = sqlite_client.iter_query("SELECT * FROM t", batch_size=10)
+        first = next(batches)
+        assert len(first) == 10
+        assert sqlite_client.engine.pool.checkedout() == 1
+        batches.close()
+        assert sqlite_client.engine.pool.checkedout() == 0
+
+    def test_iter_query_arrow_keeps_one_schema(self, sqlite_client):
+        """Columns that are NULL in the first batch get their type later on."""
+        pa = pytest.importorskip("pyarrow")
+        batches = list(
+            sqlite_client.iter_query(
+                "SELECT * FROM t ORDER BY id", batch_size=1000, output="arrow"
+            )
+        )
+
+        assert all(isinstance(b, pa.RecordBatch) for b in batches)
+        assert batches[1].schema.field("name").type == pa.string()
+        assert batches[1].schema == batches[2].schema
+        assert sum(b.num_rows for b in batches) == 2500
+
+    def test_iter_query_empty_result(self, sqlite_client):
+        """An empty result yields one empty batch with the columns."""
+        (batch,) = sqlite_client.iter_query("SELECT id, name FROM t WHERE id < 0")
+        assert batch.empty
+        assert list(batch.columns) == ["id", "name"]
+
+    def test_iter_query_errors(self, sqlite_client):
+        """Bad arguments and bad SQL raise the library's exceptions."""
+        with pytest.raises(ValueError):
+            sqlite_client.iter_query("SELECT 1", batch_size=0)
+        with pytest.raises(ValueError):
+            sqlite_client.iter_query("SELECT 1", output="csv")
+        with pytest.raises(QueryExecutionError):
+            list(sqlite_client.iter_query("SELECT * FROM missing_table"))
+
+    def test_write_parquet(self, sqlite_client, tmp_path):
+        """Streaming to Parquet round-trips the result."""
+        pa = pytest.importorskip("pyarrow")
+        path = tmp_path / "t.parquet"
+        schema = pa.schema(
+            [("id", pa.int64()), ("name", pa.string()), ("value", pa.float64())]
+        )
+
+        n_rows = sqlite_client.write_parquet(
+            "SELECT * FROM t ORDER BY id",
+            str(path),
+            batch_size=1000,
+            schema=schema,
+        )
+
+        assert n_rows == 2500
+        df = pd.read_parquet(path)
+        expected = sqlite_client.execute_query("SELECT * FROM t ORDER BY id")
+        pd.testing.assert_frame_equal(df, expected)
+
+
+class TestSQLAlchemyClientExecuteMany:
+    """Test cases for the concurrent execute_many / iter_many."""
+
+    def test_execute_many_keeps_input_order(self, sqlite_client):
+        """Results come back in input order and failures become None."""
+        queries = [f"SELECT {i} AS i" for i in range(8)] + ["SELECT * FROM nope"]
+
+        results = sqlite_client.execute_many(queries, max_workers=4)
+
+        assert [r["i"].iloc[0] for r in results[:8]] == list(range(8))
+        assert results[8] is None
+        stats = sqlite_client.get_pool_status()["last_run"]
+        assert stats["n_queries"] == 9
+        assert stats["failed"] == 1
+        assert stats["max_workers"] == 4
+        assert stats["pool_capacity"] == 15
+        assert 0 <= stats["peak_checked_out"] <= 4
+
+    def test_execute_many_raise_on_error(self, sqlite_client):
+        """With raise_on_error a failed query raises once all have finished."""
+        queries = ["SELECT 1 AS x", "SELECT * FROM nope"]
+
+        with pytest.raises(QueryExecutionError, match="1 of 2 queries failed"):
+            sqlite_client.execute_many(queries, raise_on_error=True)
+        assert sqlite_client.last_run_stats["n_queries"] == 2
+
+    def test_iter_many_yields_as_completed(self, sqlite_client):
+        """iter_many yields every query once, tagged with its index."""
+        results = list(sqlite_client.iter_many(["SELECT 1 AS x", "SELECT 2 AS x"]))
+        assert sorted(r.index for r in results) == [0, 1]
+        assert all(r.is_success for r in results)
+
+    def test_timeout_cancels_query(self, sqlite_client):
+        """A query over its timeout is interrupted and its connection returned."""
+        endless = (
+            "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) "
+            "SELECT COUNT(*) FROM c"
+        )
+
+        results = sqlite_client.execute_many(
+            [endless, "SELECT 1 AS x"], max_workers=2, timeout=0.2
+        )
+
+        assert results[0] is None
+        assert results[1]["x"].iloc[0] == 1
+        assert sqlite_client.last_run_stats["timed_out"] == 1
+        deadline = time.time() + 5
+        while sqlite_client.engine.pool.checkedout() and time.time() < deadline:
+            time.sleep(0.01)
+        assert sqlite_client.engine.pool.checkedout() == 0
+
+    def test_transient_errors_are_retried(self, sqlite_client):
+        """OperationalErrors are retried with backoff, SQL errors are not."""
+        from sqlalchemy import exc
+
+        locked = exc.OperationalError("SELECT 1", {}, Exception("database is locked"))
+        ok = pd.DataFrame({"x": [1]})
+        with patch(
+            "db_query_lib.sqlalchemy_client.pd.read_sql", side_effect=[locked, ok]
+        ):
+            results = sqlite_client.execute_many(["SELECT 1"], retries=2, backoff=0.01)
+
+        pd.testing.assert_frame_equal(results[0], ok)
+        assert sqlite_client.last_run_stats["retries"] == 1
+        assert not SQLAlchemyClient.is_transient_error(ValueError("bad column"))
@@ -138,3 +138,29 @@ class TestTeradataMLClient:
 
                     mock_remove.assert_called()
                     mock_remove.assert_called()
+
+    def test_execute_many_retries_deadlocks(self, mock_database_config):
+        """Deadlock aborts are retried and results keep input order."""
+        with patch("db_query_lib.teradataml_client.create_context"):
+            with patch("db_query_lib.teradataml_client.execute_sql") as mock_exec_sql:
+                mock_cursor = MagicMock()
+                mock_cursor.fetchone.return_value = ["TEST_DB"]
+                mock_exec_sql.return_value = mock_cursor
+
+                with patch("db_query_lib.teradataml_client.remove_context"):
+                    client = TeradataMLClient(mock_database_config)
+
+                    ok = MagicMock()
+                    ok.fetchall.return_value = [(1,)]
+                    mock_exec_sql.side_effect = [
+                        Exception("[Error 2631] Transaction ABORTed due to deadlock."),
+                        ok,
+                        Exception("[Error 3807] Object 'nope' does not exist."),
+                    ]
+                    results = client.execute_many(
+                        ["SELECT 1", "SELECT * FROM nope"], retries=1, backoff=0.01
+                    )
+
+                    assert results == [[(1,)], None]
+                    assert client.last_run_stats["retries"] == 1
+                    assert client.last_run_stats["failed"] == 1
@@ -223,3 +223,87 @@ class TestThreadPoolQueryExecutor:
 
         result_ids = {r.query_id for r in results}
         assert result_ids == {"custom_query_1", "custom_query_2"}
+
+    def test_iter_function_concurrent_retries_transient_errors(self):
+        """Transient errors are retried with backoff, others are not."""
+        calls = {"flaky": 0, "broken": 0}
+
+        def sample_function(name):
+            calls[name] += 1
+            if name == "flaky" and calls[name] < 3:
+                raise ConnectionError("connection reset")
+            if name == "broken":
+                raise ValueError("syntax error")
+            return name
+
+        executor = ThreadPoolQueryExecutor(max_workers=2)
+        results = list(
+            executor.iter_function_concurrent(
+                sample_function,
+                [{"name": "flaky"}, {"name": "broken"}],
+                retries=3,
+                backoff=0.01,
+                is_transient=lambda e: isinstance(e, ConnectionError),
+            )
+        )
+
+        by_index = {r.index: r for r in results}
+        assert by_index[0].is_success and by_index[0].attempts == 3
+        assert not by_index[1].is_success and by_index[1].attempts == 1
+        assert calls == {"flaky": 3, "broken": 1}
+
+    def test_iter_function_concurrent_timeout(self):
+        """Overrunning tasks are reported and handed to on_timeout."""
+        import threading
+
+        release = threading.Event()
+        timed_out = []
+
+        def sample_function(seconds):
+            if seconds:
+                release.wait(seconds)
+            return seconds
+
+        def on_timeout(index):
+            timed_out.append(index)
+            release.set()
+
+        executor = ThreadPoolQueryExecutor(max_workers=2, timeout=0.1)
+        results = list(
+            executor.iter_function_concurrent(
+                sample_function,
+                [{"seconds": 0}, {"seconds": 5}],
+                on_timeout=on_timeout,
+                poll_interval=0.01,
+            )
+        )
+
+        assert [r.index for r in results] == [0, 1]
+        assert results[0].is_success
+        assert not results[1].is_success
+        assert "Timed out" in results[1].error
+        assert timed_out == [1]
+
+    def test_backoff_does_not_count_towards_timeout(self):
+        """A retry sleeping longer than the timeout is not reported as timed out."""
+        calls = {"n": 0}
+
+        def sample_function():
+            calls["n"] += 1
+            if calls["n"] == 1:
+                raise ConnectionError("connection reset")
+            return "ok"
+
+        executor = ThreadPoolQueryExecutor(max_workers=1, timeout=0.1)
+        results = list(
+            executor.iter_function_concurrent(
+                sample_function,
+                [{}],
+                retries=1,
+                backoff=0.3,
+                is_transient=lambda e: isinstance(e, ConnectionError),
+                poll_interval=0.01,
+            )
+        )
+
+        assert results[0].is_success and results[0].attempts == 2
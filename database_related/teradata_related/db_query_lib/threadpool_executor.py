@@ -3,10 +3,10 @@
 import logging
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
 
 from .exceptions import ThreadPoolExecutionError
 
@@ -25,6 +25,8 @@ class ExecutionResult:
     result: Any
     error: Optional[str] = None
     is_success: bool = True
+    attempts: int = 1
+    index: Optional[int] = None
 
 
 class ThreadPoolQueryExecutor:
@@ -103,6 +105,171 @@ class ThreadPoolQueryExecutor:
         self.results = results
         return results
 
+    def iter_function_concurrent(
+        self,
+        function: Callable,
+        arguments_list: List[Dict[str, Any]],
+        query_ids: Optional[List[str]] = None,
+        retries: int = 0,
+        backoff: float = 0.5,
+        is_transient: Optional[Callable[[Exception], bool]] = None,
+        on_timeout: Optional[Callable[[int], None]] = None,
+        monitor: Optional[Callable[[], None]] = None,
+        poll_interval: float = 0.05,
+    ) -> Iterator[ExecutionResult]:
+        """
+        Execute a function concurrently and yield results as they complete.
+
+        Unlike execute_function_concurrent, ``timeout`` applies to each task
+        from the moment it starts running (not while it waits for a worker).
+        A task that overruns is reported as failed straight away and
+        ``on_timeout`` is called so the caller can cancel the underlying
+        query; the worker thread itself cannot be interrupted.
+
+        Args:
+            function: Callable that accepts keyword arguments
+            arguments_list: List of dicts containing function arguments
+            query_ids: Optional list of identifiers for each execution
+            retries: Number of extra attempts for transient errors
+            backoff: Delay before the first retry, doubled on every retry
+            is_transient: Predicate deciding whether an error is retried
+                (default: no error is retried)
+            on_timeout: Called with the task index when a task times out
+            monitor: Called every ``poll_interval`` seconds while tasks run
+                (e.g. to sample pool utilisation)
+            poll_interval: Polling interval for timeouts and ``monitor``
+
+        Yields:
+            ExecutionResult objects in completion order, with ``index`` set to
+            the position in ``arguments_list``
+
+        Raises:
+            ThreadPoolExecutionError: If arguments_list is empty
+        """
+        if not arguments_list:
+            raise ThreadPoolExecutionError("arguments_list cannot be empty")
+
+        started: Dict[int, float] = {}
+        abandoned: Set[int] = set()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            pending = {}
+            for i, args in enumerate(arguments_list):
+                query_id = query_ids[i] if query_ids else f"query_{i}"
+                future = executor.submit(
+                    self._run_task_with_retries,
+                    function,
+                    query_id,
+                    args,
+                    i,
+                    retries,
+                    backoff,
+                    is_transient,
+                    started,
+                    abandoned,
+                )
+                pending[future] = (i, query_id)
+
+            polling = self.timeout is not None or monitor is not None
+            while pending:
+                if monitor is not None:
+                    monitor()
+                done, _ = wait(
+                    pending,
+                    timeout=poll_interval if polling else None,
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    pending.pop(future)
+                    yield future.result()
+
+                if self.timeout is None:
+                    continue
+                now = time.perf_counter()
+                for future, (i, query_id) in list(pending.items()):
+                    start = started.get(i)
+                    if start is None or now - start <= self.timeout:
+                        continue
+                    del pending[future]
+                    abandoned.add(i)
+                    future.cancel()
+                    if on_timeout is not None:
+                        try:
+                            on_timeout(i)
+                        except Exception as e:
+                            logger.warning("Cancelling %s failed: %s", query_id, e)
+                    yield ExecutionResult(
+                        query_id=query_id,
+                        thread_id=0,
+                        start_time=datetime.now(),
+                        end_time=datetime.now(),
+                        duration_seconds=now - start,
+                        result=None,
+                        error=f"Timed out after {self.timeout}s",
+                        is_success=False,
+                        index=i,
+                    )
+        finally:
+            abandoned.update(range(len(arguments_list)))
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @classmethod
+    def _run_task_with_retries(
+        cls,
+        function: Callable,
+        query_id: str,
+        kwargs: Dict[str, Any],
+        index: int,
+        retries: int,
+        backoff: float,
+        is_transient: Optional[Callable[[Exception], bool]],
+        started: Dict[int, float],
+        abandoned: Set[int],
+    ) -> ExecutionResult:
+        """
+        Run a single task, retrying transient errors with exponential backoff.
+
+        ``started[index]`` is set at the start of every attempt and cleared
+        during the backoff sleep, so timeouts apply per attempt and never to
+        the delay between attempts.  A task in ``abandoned`` (timed out or no longer awaited) is
+        not retried.
+        """
+        attempt = 0
+        while True:
+            started[index] = time.perf_counter()
+            error: Optional[Exception] = None
+
+            def call(**call_kwargs):
+                nonlocal error
+                try:
+                    return function(**call_kwargs)
+                except Exception as e:
+                    error = e
+                    raise
+
+            result = cls._run_task(call, query_id, kwargs)
+            result.attempts = attempt + 1
+            result.index = index
+            if (
+                result.is_success
+                or attempt >= retries
+                or index in abandoned
+                or is_transient is None
+                or not is_transient(error)
+            ):
+                return result
+
+            delay = backoff * 2**attempt
+            logger.info(
+                "%s failed with a transient error (attempt %d), retrying in %.2fs",
+                query_id,
+                attempt + 1,
+                delay,
+            )
+            started.pop(index, None)
+            time.sleep(delay)
+            attempt += 1
+
     @staticmethod
     def _run_task(
         function: Callable, query_id: str, kwargs: Dict[str, Any]
@@ -1,5 +1,18 @@
 """Teradata GroupBy Execution Framework package."""
 
+from .cost_model import (
+    CostModel,
+    ExecutionPlan,
+    QueryEstimate,
+    RuntimeHistory,
+    engine_explain_backend,
+    fingerprint_sql,
+    normalise_sql,
+    parse_teradata_explain,
+    plan_execution,
+)
+from .query_fusion import FusedGroupByRunner, FusionPlan, fuse_queries
+from .result_cache import ResultCache
 from .runner import (
     BaseGroupByRunner,
     ParallelGroupByRunner,
@@ -13,11 +26,24 @@ from .runner import (
 
 __all__ = [
     "BaseGroupByRunner",
+    "CostModel",
+    "ExecutionPlan",
+    "FusedGroupByRunner",
+    "FusionPlan",
     "ParallelGroupByRunner",
+    "QueryEstimate",
+    "ResultCache",
+    "RuntimeHistory",
     "SequentialGroupByRunner",
     "ServerSideGroupByRunner",
+    "engine_explain_backend",
     "estimate_query_cost",
     "estimate_spool_risk",
+    "fingerprint_sql",
+    "fuse_queries",
     "get_advanced_groupby_runner",
     "get_session_limit",
+    "normalise_sql",
+    "parse_teradata_explain",
+    "plan_execution",
 ]
@@ -0,0 +1,110 @@
+"""Benchmark the client side of ServerSideGroupByRunner on a local SQLite stand-in.
+
+Compares
+- the old driver-table load (one INSERT per query) against the bulk executemany load
+- executing the jobs in 1 vs n sessions with the coordinating client loop
+
+SQLite serialises writers, so the session speedup here is a lower bound of what a
+database with concurrent sessions gives.
+
+Run:
+    python benchmark_server_side.py
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from loguru import logger
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from database_related.teradata_related.groupby_runner import (  # noqa: E402
+    ServerSideGroupByRunner,
+)
+
+
+def make_engine(path: Path, n_rows: int = 20_000):
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False, "timeout": 60}
+    )
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS vt_subset"))
+        conn.execute(text("CREATE TABLE vt_subset (grp INTEGER, x INTEGER)"))
+        conn.execute(
+            text("INSERT INTO vt_subset VALUES (:grp, :x)"),
+            [{"grp": i % 50, "x": i} for i in range(n_rows)],
+        )
+    return engine
+
+
+def make_queries(n: int):
+    return [
+        "INSERT INTO test_agg_out "
+        f"SELECT {i}, grp, 'sum_x', CAST(SUM(x) AS TEXT) "
+        f"FROM vt_subset WHERE x % {i + 2} = 0 GROUP BY grp"
+        for i in range(n)
+    ]
+
+
+def row_by_row_load(runner: ServerSideGroupByRunner, queries):
+    with runner.engine.begin() as conn:
+        conn.execute(text(f"DELETE FROM {runner.agg_jobs_table}"))
+        for job_id, sql in enumerate(queries, start=1):
+            conn.execute(
+                text(
+                    f"INSERT INTO {runner.agg_jobs_table} (job_id, sql_text) VALUES (:id, :sql)"
+                ),
+                {"id": job_id, "sql": sql},
+            )
+
+
+def run_jobs(runner: ServerSideGroupByRunner):
+    with runner.engine.begin() as conn:
+        conn.execute(text(f"DELETE FROM {runner.agg_out_table}"))
+    runner.execute_server_side()
+
+
+def bench(fn, *args, repeat: int = 3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(sizes=(100, 500), n_sessions: int = 4):
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(Path(tmp) / "bench.db")
+        print("Benchmark results (best of 3, seconds):")
+        for n in sizes:
+            queries = make_queries(n)
+            runner = ServerSideGroupByRunner(engine, "big_table", executor="client")
+            runner.ensure_driver_table()
+            runner.ensure_output_table()
+
+            t_rows = bench(row_by_row_load, runner, queries)
+            t_bulk = bench(runner.load_driver_table, queries)
+
+            t_serial = bench(run_jobs, runner)
+            runner.n_sessions = n_sessions
+            t_sessions = bench(run_jobs, runner)
+
+            print(f"  queries={n}")
+            print(f"    load row-by-row:        {t_rows:.4f}")
+            print(f"    load executemany:       {t_bulk:.4f}  ({t_rows / t_bulk:.1f}x)")
+            print(f"    execute 1 session:      {t_serial:.4f}")
+            print(
+                f"    execute {n_sessions} sessions:     {t_sessions:.4f}  "
+                f"({t_serial / t_sessions:.1f}x)"
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
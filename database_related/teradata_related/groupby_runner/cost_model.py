@@ -0,0 +1,499 @@
+"""
+Cost model for the GroupBy runners
+==================================
+
+:func:`~.runner.estimate_query_cost` and :func:`~.runner.estimate_spool_risk`
+score queries by keyword.  The classes here estimate every query in seconds
+and spool bytes instead, from the best source available:
+
+1. **history** – mean runtime and peak spool observed for the same query
+   (:class:`RuntimeHistory`, persisted in a SQLite file and keyed by the
+   normalised SQL fingerprint of :func:`fingerprint_sql`).
+2. **explain** – the database's ``EXPLAIN`` output, obtained through a
+   pluggable *explain backend* (any callable ``sql -> plan text``, see
+   :func:`engine_explain_backend`).
+3. **heuristic** – the keyword scores, converted with
+   ``seconds_per_cost_point`` / ``spool_bytes_per_risk_point``.
+
+:func:`~.runner.get_advanced_groupby_runner` uses a :class:`CostModel` (when
+given) to pick the strategy and the number of workers / sessions, and the
+runners record the runtimes they observe into its history, together with the
+query's spool: the observed peak from a *spool backend* (e.g. a DBQL lookup)
+when one is given, otherwise the ``EXPLAIN`` estimate.
+
+Example
+-------
+>>> history = RuntimeHistory("groupby_history.sqlite")
+>>> cost_model = CostModel(explain_backend=engine_explain_backend(engine),
+...                        history=history)
+>>> with get_advanced_groupby_runner(engine, "big_table", None,
+...                                  "vt_subset", queries,
+...                                  cost_model=cost_model) as runner:
+...     results = runner.run(queries)
+"""
+
+import hashlib
+import math
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+# ---------------------------------------------------------------------------
+#  SQL fingerprint
+# ---------------------------------------------------------------------------
+
+_COMMENT = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalise_sql(sql: str) -> str:
+    """
+    Normalise a SQL string so that formatting differences do not matter.
+
+    Comments are removed, whitespace is collapsed, keywords and identifiers
+    are lower-cased and a trailing ``;`` is dropped.  String literals keep
+    their case.
+
+    Args:
+        sql: SQL query string.
+
+    Returns:
+        Normalised SQL string.
+    """
+    sql = _COMMENT.sub(" ", sql)
+    parts = []
+    last = 0
+    for match in _STRING_LITERAL.finditer(sql):
+        parts.append(sql[last : match.start()].lower())
+        parts.append(match.group())
+        last = match.end()
+    parts.append(sql[last:].lower())
+    return _WHITESPACE.sub(" ", "".join(parts)).strip().rstrip(";").strip()
+
+
+def fingerprint_sql(sql: str) -> str:
+    """
+    Return a fingerprint identifying the *shape* of a query.
+
+    The query is normalised with :func:`normalise_sql` and its string and
+    numeric literals are replaced by ``?``, so queries differing only in
+    formatting or literal values share a fingerprint.
+
+    Args:
+        sql: SQL query string.
+
+    Returns:
+        16-character hexadecimal fingerprint.
+    """
+    shape = _STRING_LITERAL.sub("?", normalise_sql(sql))
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    return hashlib.sha1(shape.encode("utf-8")).hexdigest()[:16]
+
+
+# ---------------------------------------------------------------------------
+#  Estimates
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class QueryEstimate:
+    """
+    Estimated cost of a single query.
+
+    Attributes:
+        seconds: Estimated runtime in seconds.
+        spool_bytes: Estimated peak spool usage in bytes.
+        source: ``"history"``, ``"explain"`` or ``"heuristic"``.
+    """
+
+    seconds: float
+    spool_bytes: float
+    source: str
+
+
+# ---------------------------------------------------------------------------
+#  Runtime history
+# ---------------------------------------------------------------------------
+
+
+class RuntimeHistory:
+    """
+    Persistent history of observed query runtimes and spool usage.
+
+    Observations are aggregated per :func:`fingerprint_sql` into a count, a
+    mean runtime and the peak spool seen, stored in a SQLite database so the
+    history survives between sessions.  The object is safe to share between
+    worker threads.
+
+    Args:
+        path: SQLite database file.  Defaults to ``":memory:"`` (not
+            persisted).
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS query_runtime (
+                    fingerprint TEXT PRIMARY KEY,
+                    n INTEGER NOT NULL,
+                    mean_seconds REAL NOT NULL,
+                    max_spool_bytes REAL,
+                    last_seen REAL NOT NULL
+                )
+                """
+            )
+
+    def record(
+        self, sql: str, seconds: float, spool_bytes: Optional[float] = None
+    ) -> None:
+        """
+        Add one observation for *sql*.
+
+        Args:
+            sql: SQL query string that was executed.
+            seconds: Observed runtime in seconds.
+            spool_bytes: Observed peak spool in bytes, if known.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO query_runtime
+                    (fingerprint, n, mean_seconds, max_spool_bytes, last_seen)
+                VALUES (?, 1, ?, ?, ?)
+                ON CONFLICT (fingerprint) DO UPDATE SET
+                    mean_seconds = mean_seconds + (excluded.mean_seconds - mean_seconds) / (n + 1),
+                    n = n + 1,
+                    max_spool_bytes = MAX(
+                        COALESCE(max_spool_bytes, excluded.max_spool_bytes),
+                        COALESCE(excluded.max_spool_bytes, max_spool_bytes)
+                    ),
+                    last_seen = excluded.last_seen
+                """,
+                (fingerprint_sql(sql), float(seconds), spool_bytes, time.time()),
+            )
+
+    def lookup(self, sql: str) -> Optional[Tuple[int, float, Optional[float]]]:
+        """
+        Return ``(n, mean_seconds, max_spool_bytes)`` for *sql*, or ``None``.
+
+        Args:
+            sql: SQL query string.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT n, mean_seconds, max_spool_bytes FROM query_runtime "
+                "WHERE fingerprint = ?",
+                (fingerprint_sql(sql),),
+            ).fetchone()
+        return row
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM query_runtime").fetchone()
+        return row[0]
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        self._conn.close()
+
+
+# ---------------------------------------------------------------------------
+#  EXPLAIN backends
+# ---------------------------------------------------------------------------
+
+_TOTAL_TIME = re.compile(
+    r"total estimated time is\s+([\d,]+(?:\.\d+)?)\s+seconds", re.IGNORECASE
+)
+_STEP_TIME = re.compile(
+    r"estimated time for this step is\s+([\d,]+(?:\.\d+)?)\s+seconds", re.IGNORECASE
+)
+_SPOOL_BYTES = re.compile(r"\(([\d,]+) bytes\)", re.IGNORECASE)
+
+
+def _to_float(number: str) -> float:
+    return float(number.replace(",", ""))
+
+
+def parse_teradata_explain(plan: str) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Extract the estimated runtime and peak spool from Teradata ``EXPLAIN`` text.
+
+    Args:
+        plan: ``EXPLAIN`` output, one step per line.
+
+    Returns:
+        ``(seconds, spool_bytes)``; either is ``None`` when the plan does
+        not state it.  Without a total estimated time the step estimates are
+        summed.
+    """
+    total = _TOTAL_TIME.search(plan)
+    if total:
+        seconds = _to_float(total.group(1))
+    else:
+        steps = [_to_float(t) for t in _STEP_TIME.findall(plan)]
+        seconds = sum(steps) if steps else None
+
+    spool = [_to_float(b) for b in _SPOOL_BYTES.findall(plan)]
+    return seconds, (max(spool) if spool else None)
+
+
+def engine_explain_backend(engine: Engine) -> Callable[[str], str]:
+    """
+    Build an explain backend that runs ``EXPLAIN <sql>`` on *engine*.
+
+    Args:
+        engine: SQLAlchemy engine.
+
+    Returns:
+        Callable returning the plan text, one output row per line.
+    """
+
+    def explain(sql: str) -> str:
+        with engine.connect() as conn:
+            rows = conn.execute(text(f"EXPLAIN {sql}")).fetchall()
+        return "\n".join(str(row[0]) for row in rows)
+
+    return explain
+
+
+# ---------------------------------------------------------------------------
+#  Cost model
+# ---------------------------------------------------------------------------
+
+
+class CostModel:
+    """
+    Estimate query runtimes and spool from history, ``EXPLAIN`` or keywords.
+
+    Args:
+        explain_backend: Callable returning the ``EXPLAIN`` text of a query,
+            e.g. :func:`engine_explain_backend`.  ``None`` skips EXPLAIN.
+        history: :class:`RuntimeHistory` consulted first and fed by the
+            runners.  ``None`` skips the history.
+        explain_parser: Callable turning plan text into
+            ``(seconds, spool_bytes)``.  Defaults to
+            :func:`parse_teradata_explain`.
+        min_history: Minimum number of observations before the history is
+            trusted.  Defaults to ``1``.
+        seconds_per_cost_point: Seconds per :func:`estimate_query_cost`
+            point for the keyword fallback.  Defaults to ``1.0``.
+        spool_bytes_per_risk_point: Bytes per :func:`estimate_spool_risk`
+            point for the keyword fallback.  Defaults to ``1e9``.
+        spool_backend: Callable returning the observed peak spool in bytes
+            of a finished query, or ``None`` when unknown, e.g. a lookup of
+            ``SpoolUsage`` in ``DBC.QryLogV``.  ``None`` records the
+            ``EXPLAIN`` spool estimate instead.
+    """
+
+    def __init__(
+        self,
+        explain_backend: Optional[Callable[[str], str]] = None,
+        history: Optional[RuntimeHistory] = None,
+        explain_parser: Callable[
+            [str], Tuple[Optional[float], Optional[float]]
+        ] = parse_teradata_explain,
+        min_history: int = 1,
+        seconds_per_cost_point: float = 1.0,
+        spool_bytes_per_risk_point: float = 1e9,
+        spool_backend: Optional[Callable[[str], Optional[float]]] = None,
+    ) -> None:
+        self.explain_backend = explain_backend
+        self.history = history
+        self.explain_parser = explain_parser
+        self.min_history = min_history
+        self.seconds_per_cost_point = seconds_per_cost_point
+        self.spool_bytes_per_risk_point = spool_bytes_per_risk_point
+        self.spool_backend = spool_backend
+        self._explain_cache: Dict[str, Tuple[Optional[float], Optional[float]]] = {}
+
+    def _heuristic(self, sql: str) -> Tuple[float, float]:
+        from .runner import estimate_query_cost, estimate_spool_risk
+
+        return (
+            estimate_query_cost(sql) * self.seconds_per_cost_point,
+            estimate_spool_risk(sql) * self.spool_bytes_per_risk_point,
+        )
+
+    def _explain(self, sql: str) -> Tuple[Optional[float], Optional[float]]:
+        key = fingerprint_sql(sql)
+        if key not in self._explain_cache:
+            try:
+                plan = self.explain_backend(sql)
+                self._explain_cache[key] = self.explain_parser(plan)
+            except Exception as e:
+                logger.warning("EXPLAIN failed, using keyword estimate: {}", e)
+                self._explain_cache[key] = (None, None)
+        return self._explain_cache[key]
+
+    def estimate(self, sql: str) -> QueryEstimate:
+        """
+        Estimate a single query.
+
+        Args:
+            sql: SQL query string.
+
+        Returns:
+            :class:`QueryEstimate` from the best available source.  A field
+            missing from that source is filled from the next one.
+        """
+        seconds = spool = None
+        source = None
+
+        if self.history is not None:
+            observed = self.history.lookup(sql)
+            if observed is not None and observed[0] >= self.min_history:
+                _, seconds, spool = observed
+                source = "history"
+
+        if self.explain_backend is not None and (seconds is None or spool is None):
+            explain_seconds, explain_spool = self._explain(sql)
+            if seconds is None and explain_seconds is not None:
+                seconds, source = explain_seconds, "explain"
+            if spool is None:
+                spool = explain_spool
+
+        if seconds is None or spool is None:
+            heuristic_seconds, heuristic_spool = self._heuristic(sql)
+            if seconds is None:
+                seconds, source = heuristic_seconds, "heuristic"
+            if spool is None:
+                spool = heuristic_spool
+
+        logger.debug(
+            "Estimated {:.3f}s, {:.0f} spool bytes ({})", seconds, spool, source
+        )
+        return QueryEstimate(
+            seconds=float(seconds), spool_bytes=float(spool), source=source
+        )
+
+    def estimate_many(self, queries: List[str]) -> List[QueryEstimate]:
+        """Estimate every query in *queries*."""
+        return [self.estimate(q) for q in queries]
+
+    def _finished_spool(self, sql: str) -> Optional[float]:
+        """Spool of a finished query: observed if possible, else EXPLAIN's."""
+        if self.spool_backend is not None:
+            try:
+                spool = self.spool_backend(sql)
+                if spool is not None:
+                    return float(spool)
+            except Exception as e:
+                logger.warning("Spool lookup failed, using EXPLAIN estimate: {}", e)
+        if self.explain_backend is not None:
+            return self._explain(sql)[1]
+        return None
+
+    def record(
+        self, sql: str, seconds: float, spool_bytes: Optional[float] = None
+    ) -> None:
+        """
+        Record an observed runtime into the history, if there is one.
+
+        Args:
+            sql: SQL string that was executed.
+            seconds: Observed runtime in seconds.
+            spool_bytes: Observed peak spool in bytes.  ``None`` takes it
+                from the spool backend or the ``EXPLAIN`` estimate.
+        """
+        if self.history is not None:
+            if spool_bytes is None:
+                spool_bytes = self._finished_spool(sql)
+            self.history.record(sql, seconds, spool_bytes)
+
+
+# ---------------------------------------------------------------------------
+#  Strategy planning
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """
+    Strategy chosen by :func:`plan_execution`.
+
+    Attributes:
+        strategy: ``"sequential"``, ``"parallel"`` or ``"server_side"``.
+        workers: Number of worker threads / sessions to use.
+        total_seconds: Sum of the estimated runtimes.
+        max_seconds: Longest estimated runtime.
+        max_spool_bytes: Largest estimated spool of a single query.
+    """
+
+    strategy: str
+    workers: int
+    total_seconds: float
+    max_seconds: float
+    max_spool_bytes: float
+
+
+def plan_execution(
+    estimates: List[QueryEstimate],
+    session_limit: int,
+    sequential_seconds: float = 10.0,
+    max_parallel_queries: int = 50,
+    spool_budget_bytes: float = 1e11,
+) -> ExecutionPlan:
+    """
+    Choose the runner strategy and worker count from query estimates.
+
+    Rules:
+
+    1. **Sequential** – the whole workload is estimated to take at most
+       *sequential_seconds*, concurrency would not pay for itself.
+    2. **Parallel** – at most *max_parallel_queries* queries.
+    3. **Server-side** – all other cases.
+
+    The worker count is the number of workers that still shortens the wall
+    time (``total / longest``), capped by the session limit, the number of
+    queries and by how many of the largest-spool queries fit into
+    *spool_budget_bytes* at once.
+
+    Args:
+        estimates: One :class:`QueryEstimate` per query.
+        session_limit: Maximum concurrent sessions.
+        sequential_seconds: Workload size below which queries run
+            sequentially.
+        max_parallel_queries: Largest workload run by the client-side
+            parallel runner.
+        spool_budget_bytes: Spool that concurrently running queries may use.
+
+    Returns:
+        :class:`ExecutionPlan`.
+    """
+    n = len(estimates)
+    total_seconds = sum(e.seconds for e in estimates)
+    max_seconds = max(e.seconds for e in estimates)
+    max_spool = max(e.spool_bytes for e in estimates)
+
+    useful = math.ceil(total_seconds / max_seconds) if max_seconds > 0 else 1
+    spool_fit = int(spool_budget_bytes // max_spool) if max_spool > 0 else n
+    workers = max(1, min(session_limit, n, useful, spool_fit))
+
+    if total_seconds <= sequential_seconds or workers == 1:
+        strategy = "sequential"
+        workers = 1
+    elif n <= max_parallel_queries:
+        strategy = "parallel"
+    else:
+        strategy = "server_side"
+
+    return ExecutionPlan(
+        strategy=strategy,
+        workers=workers,
+        total_seconds=total_seconds,
+        max_seconds=max_seconds,
+        max_spool_bytes=max_spool,
+    )
@@ -0,0 +1,403 @@
+"""
+Grouping-sets query fusion
+==========================
+
+Dashboards typically send dozens of queries such as::
+
+    SELECT colA, COUNT(*) AS cnt FROM vt_subset GROUP BY colA
+    SELECT colB, SUM(x) AS total FROM vt_subset GROUP BY colB
+
+that read the same table with the same ``WHERE`` clause and differ only in
+their grouping columns.  :func:`fuse_queries` rewrites every such family into
+one ``GROUP BY GROUPING SETS (...)`` (or ``CUBE``) query, so N scans become
+one, and :meth:`FusionPlan.split` cuts the combined result back into the
+per-query DataFrames.
+
+A query is fused when it is a single-table aggregation of the form
+``SELECT <group columns and aliased aggregates> FROM <table> [WHERE ...]
+[GROUP BY <columns>]``.  Anything else (joins, ``HAVING``, ``ORDER BY``,
+sub-queries, un-aliased aggregates whose column names are database specific)
+is passed through unchanged.
+
+Integer group columns come back as nullable integers when other grouping
+sets put ``NULL`` in them; :meth:`FusionPlan.split` casts them back to
+``int64``.  Drivers that return such columns as floats (e.g. ``pd.read_sql``
+without ``dtype_backend="numpy_nullable"``) leave them as floats, since a
+float source column holding whole numbers looks the same.
+
+Queries grouping by the same columns in a different order share one grouping
+set, spelled as in the first of them.
+
+:class:`FusedGroupByRunner` wraps a runner returning one DataFrame per query
+(:class:`~.runner.SequentialGroupByRunner`,
+:class:`~.runner.ParallelGroupByRunner`) with this stage.
+"""
+
+import re
+from dataclasses import dataclass, field
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from loguru import logger
+
+from .cost_model import normalise_sql
+from .runner import BaseGroupByRunner
+
+_QUERY = re.compile(
+    r"^\s*select\s+(?P<select>.+?)\s+from\s+(?P<table>[\w.]+)"
+    r"(?:\s+where\s+(?P<where>.+?))?"
+    r"(?:\s+group\s+by\s+(?P<group>[\w\s,.]+?))?\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+_SELECT_ITEM = re.compile(
+    r"^(?P<expr>.+?)(?:\s+as\s+(?P<alias>\w+))?$", re.IGNORECASE | re.DOTALL
+)
+_IDENTIFIER = re.compile(r"^\w+$")
+_UNSUPPORTED = re.compile(
+    r"\b(join|having|order\s+by|union|intersect|except|qualify|limit|top|"
+    r"grouping|cube|rollup|over)\b|\(\s*select\b",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class ParsedAggregation:
+    """
+    A fusable single-table aggregation query.
+
+    Attributes:
+        table: Source table.
+        where: ``WHERE`` clause (without the keyword), or ``None``.
+        group_by: Grouping columns, lower-cased.
+        columns: Output columns in select order, as ``(name, kind, ref)``
+            where *kind* is ``"group"`` (ref = lower-cased column) or
+            ``"agg"`` (ref = normalised aggregate expression).
+        spelling: Lower-cased column -> spelling used in the query.
+        expressions: Normalised aggregate expression -> text in the query.
+    """
+
+    table: str
+    where: Optional[str]
+    group_by: Tuple[str, ...]
+    columns: List[Tuple[str, str, str]]
+    spelling: Dict[str, str] = field(default_factory=dict)
+    expressions: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def source_key(self) -> Tuple[str, str]:
+        """Queries with the same source key scan the same rows."""
+        return self.table.lower(), normalise_sql(self.where) if self.where else ""
+
+
+def _split_top_level(select: str) -> List[str]:
+    items, depth, start = [], 0, 0
+    for i, char in enumerate(select):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            items.append(select[start:i].strip())
+            start = i + 1
+    items.append(select[start:].strip())
+    return items
+
+
+def parse_aggregation(sql: str) -> Optional[ParsedAggregation]:
+    """
+    Parse *sql* as a fusable aggregation query.
+
+    Args:
+        sql: SQL query string.
+
+    Returns:
+        :class:`ParsedAggregation`, or ``None`` when the query cannot be
+        fused.
+    """
+    if _UNSUPPORTED.search(sql):
+        return None
+    match = _QUERY.match(sql)
+    if match is None:
+        return None
+
+    group_by = []
+    spelling = {}
+    if match.group("group"):
+        for column in match.group("group").split(","):
+            column = column.strip()
+            if not _IDENTIFIER.match(column):
+                return None
+            group_by.append(column.lower())
+            spelling.setdefault(column.lower(), column)
+
+    columns = []
+    expressions = {}
+    for item in _split_top_level(match.group("select")):
+        select_item = _SELECT_ITEM.match(item)
+        expr, alias = select_item.group("expr").strip(), select_item.group("alias")
+        if _IDENTIFIER.match(expr):
+            if expr.lower() not in group_by:
+                return None
+            spelling[expr.lower()] = expr
+            columns.append((alias or expr, "group", expr.lower()))
+        elif "(" in expr and alias:
+            columns.append((alias, "agg", normalise_sql(expr)))
+            expressions[normalise_sql(expr)] = expr
+        else:
+            return None
+
+    return ParsedAggregation(
+        table=match.group("table"),
+        where=match.group("where"),
+        group_by=tuple(group_by),
+        columns=columns,
+        spelling=spelling,
+        expressions=expressions,
+    )
+
+
+def _grouping_clause(sets: List[Tuple[str, ...]], union: List[str]) -> str:
+    """``CUBE`` when *sets* are all subsets of *union*, otherwise ``GROUPING SETS``."""
+    all_subsets = {
+        frozenset(c) for r in range(len(union) + 1) for c in combinations(union, r)
+    }
+    if len(union) > 1 and {frozenset(s) for s in sets} == all_subsets:
+        return f"CUBE ({', '.join(union)})"
+    return "GROUPING SETS ({})".format(", ".join(f"({', '.join(s)})" for s in sets))
+
+
+@dataclass
+class FusedStatement:
+    """
+    One statement of a :class:`FusionPlan`.
+
+    Attributes:
+        sql: SQL to execute.
+        query_indices: Positions of the original queries answered by it.
+        parsed: Parsed original queries (empty for a pass-through statement).
+        group_column: Lower-cased group column -> its result column.
+        grouping_alias: Lower-cased group column -> ``GROUPING()`` alias.
+        aggregate_alias: Normalised aggregate expression -> output alias.
+    """
+
+    sql: str
+    query_indices: List[int]
+    parsed: List[ParsedAggregation] = field(default_factory=list)
+    group_column: Dict[str, str] = field(default_factory=dict)
+    grouping_alias: Dict[str, str] = field(default_factory=dict)
+    aggregate_alias: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def fused(self) -> bool:
+        return bool(self.parsed)
+
+    def split(self, result: pd.DataFrame) -> List[pd.DataFrame]:
+        """Cut the combined result into one DataFrame per original query."""
+        if not self.fused:
+            return [result]
+
+        frames = []
+        for query in self.parsed:
+            mask = pd.Series(True, index=result.index)
+            for column, alias in self.grouping_alias.items():
+                mask &= result[alias] == (0 if column in query.group_by else 1)
+            rows = result.loc[mask]
+
+            frame = pd.DataFrame(index=pd.RangeIndex(len(rows)))
+            for name, kind, ref in query.columns:
+                if kind == "group":
+                    values = rows[self.group_column[ref]].reset_index(drop=True)
+                    values = _restore_integer(values)
+                else:
+                    values = rows[self.aggregate_alias[ref]].reset_index(drop=True)
+                frame[name] = values
+            frames.append(frame)
+        return frames
+
+
+def _restore_integer(values: pd.Series) -> pd.Series:
+    """Undo the nullable integer upcast caused by other sets' NULLs.
+
+    Float columns are returned as they are: a float result does not tell an
+    integer source upcast for its NULLs from a float source holding whole
+    numbers.
+    """
+    if not len(values) or values.isna().any():
+        return values
+    if pd.api.types.is_integer_dtype(values):
+        return values.astype("int64")
+    return values
+
+
+@dataclass
+class FusionPlan:
+    """
+    Statements to execute for a list of queries.
+
+    Attributes:
+        n_queries: Number of original queries.
+        statements: Fused and pass-through statements.
+    """
+
+    n_queries: int
+    statements: List[FusedStatement]
+
+    @property
+    def sql(self) -> List[str]:
+        """SQL of every statement, in execution order."""
+        return [statement.sql for statement in self.statements]
+
+    def split(self, results: List[pd.DataFrame]) -> List[pd.DataFrame]:
+        """
+        Map the statement results back to the original queries.
+
+        Args:
+            results: One DataFrame per statement, in :attr:`sql` order.
+
+        Returns:
+            One DataFrame per original query, in input order.
+        """
+        out: List[Optional[pd.DataFrame]] = [None] * self.n_queries
+        for statement, result in zip(self.statements, results):
+            for idx, frame in zip(statement.query_indices, statement.split(result)):
+                out[idx] = frame
+        return out
+
+
+def _fuse_family(parsed: List[ParsedAggregation], indices: List[int]) -> FusedStatement:
+    spelling: Dict[str, str] = {}
+    union: List[str] = []
+    for query in parsed:
+        for column in query.group_by:
+            if column not in spelling:
+                spelling[column] = query.spelling[column]
+                union.append(column)
+
+    # aggregate expressions shared by several queries are computed once
+    aggregates: Dict[str, str] = {}
+    expressions: Dict[str, str] = {}
+    for query in parsed:
+        for _, kind, ref in query.columns:
+            if kind == "agg" and ref not in aggregates:
+                aggregates[ref] = f"fused_a{len(aggregates)}"
+                expressions[ref] = query.expressions[ref]
+
+    grouping_alias = {column: f"fused_g{i}" for i, column in enumerate(union)}
+    select = (
+        [spelling[c] for c in union]
+        + [f"GROUPING({spelling[c]}) AS {grouping_alias[c]}" for c in union]
+        + [f"{expressions[ref]} AS {alias}" for ref, alias in aggregates.items()]
+    )
+
+    # one set per distinct column set, in the first query's order: split
+    # selects rows by GROUPING() flags, so every query with the same columns
+    # reads the rows of that one set
+    sets: Dict[frozenset, Tuple[str, ...]] = {}
+    for query in parsed:
+        sets.setdefault(
+            frozenset(query.group_by), tuple(spelling[c] for c in query.group_by)
+        )
+
+    first = parsed[0]
+    where = f"\nWHERE {first.where}" if first.where else ""
+    sql = (
+        f"SELECT {', '.join(select)}\nFROM {first.table}{where}\n"
+        f"GROUP BY {_grouping_clause(list(sets.values()), [spelling[c] for c in union])}"
+    )
+    return FusedStatement(
+        sql=sql,
+        query_indices=list(indices),
+        parsed=list(parsed),
+        group_column=spelling,
+        grouping_alias=grouping_alias,
+        aggregate_alias=aggregates,
+    )
+
+
+def fuse_queries(queries: List[str], min_family_size: int = 2) -> FusionPlan:
+    """
+    Fuse aggregation queries over the same source into grouping-sets queries.
+
+    Args:
+        queries: SQL strings.
+        min_family_size: Smallest number of queries over the same table and
+            ``WHERE`` clause worth fusing.  Defaults to ``2``.
+
+    Returns:
+        :class:`FusionPlan`; fused statements come first, in the order of
+        their first query, followed by the pass-through queries.
+    """
+    families: Dict[Tuple[str, str], List[int]] = {}
+    parsed: Dict[int, ParsedAggregation] = {}
+    for idx, sql in enumerate(queries):
+        query = parse_aggregation(sql)
+        if query is not None:
+            parsed[idx] = query
+            families.setdefault(query.source_key, []).append(idx)
+
+    statements = []
+    fused = set()
+    for indices in families.values():
+        if len(indices) >= min_family_size:
+            statements.append(_fuse_family([parsed[i] for i in indices], indices))
+            fused.update(indices)
+    statements += [
+        FusedStatement(sql=queries[i], query_indices=[i])
+        for i in range(len(queries))
+        if i not in fused
+    ]
+
+    logger.info(
+        "Query fusion: {} queries -> {} statements ({} fused)",
+        len(queries),
+        len(statements),
+        len(fused),
+    )
+    return FusionPlan(n_queries=len(queries), statements=statements)
+
+
+class FusedGroupByRunner(BaseGroupByRunner):
+    """
+    Run queries through :func:`fuse_queries` on top of another runner.
+
+    Args:
+        runner: Runner returning one DataFrame per query, e.g.
+            :class:`~.runner.SequentialGroupByRunner` or
+            :class:`~.runner.ParallelGroupByRunner`.
+        min_family_size: Smallest family of queries worth fusing.
+    """
+
+    def __init__(self, runner: BaseGroupByRunner, min_family_size: int = 2) -> None:
+        super().__init__(
+            runner.engine,
+            runner.base_table,
+            runner.subset_filter,
+            runner.subset_table,
+        )
+        self.runner = runner
+        self.min_family_size = min_family_size
+        self.last_plan: Optional[FusionPlan] = None
+
+    def close(self) -> None:
+        """Close the wrapped runner."""
+        self.runner.close()
+
+    def run(
+        self, queries: List[str], materialise_subset: bool = True
+    ) -> List[pd.DataFrame]:
+        """
+        Fuse *queries*, run the statements and split the results.
+
+        Args:
+            queries: SQL strings to execute.
+            materialise_subset: Passed on to the wrapped runner.
+
+        Returns:
+            List of :class:`pandas.DataFrame`, one per query, in input order.
+        """
+        self.last_plan = fuse_queries(queries, self.min_family_size)
+        results = self.runner.run(self.last_plan.sql, materialise_subset)
+        if not isinstance(results, list):
+            raise TypeError("the wrapped runner must return one DataFrame per query")
+        return self.last_plan.split(results)
@@ -0,0 +1,279 @@
+"""
+Result cache for the GroupBy runners
+====================================
+
+Dashboards re-issue the same aggregation queries against the subset many
+times an hour.  :class:`ResultCache` keeps query results keyed on
+
+* the normalised SQL (:func:`~.cost_model.normalise_sql`),
+* the subset definition (``base_table`` and ``subset_filter``),
+* a caller-supplied ``data_version`` (e.g. the load date of the base table),
+
+in an in-memory LRU in front of a directory of Parquet files, one
+sub-directory per base table.  Entries older than ``ttl_seconds`` are
+treated as misses.  Pass the cache to :class:`~.runner.SequentialGroupByRunner`
+or :class:`~.runner.ParallelGroupByRunner` and only the missing queries go
+to the warehouse (the subset is not even materialised when every query hits).
+
+Example
+-------
+>>> cache = ResultCache("groupby_cache", ttl_seconds=3600)
+>>> with ParallelGroupByRunner(engine, "big_table", "dt >= DATE - 30",
+...                            result_cache=cache,
+...                            data_version="2024-06-01") as runner:
+...     results = runner.run(queries)
+>>> cache.metrics()["hit_rate"]
+>>> cache.invalidate(base_table="big_table")
+"""
+
+import hashlib
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+from loguru import logger
+
+from .cost_model import normalise_sql
+
+
+class ResultCache:
+    """
+    Two-level (memory LRU + Parquet on disk) cache of query results.
+
+    Args:
+        cache_dir: Directory of the Parquet files.  ``None`` keeps the cache
+            in memory only.
+        max_memory_entries: Number of results kept in the in-memory LRU.
+            Defaults to ``128``.
+        ttl_seconds: Age after which an entry is stale.  ``None`` (default)
+            keeps entries until they are invalidated.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_memory_entries: int = 128,
+        ttl_seconds: Optional[float] = None,
+    ) -> None:
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_memory_entries = max_memory_entries
+        self.ttl_seconds = ttl_seconds
+
+        # key -> (base_table, created, DataFrame)
+        self._memory: "OrderedDict[str, Tuple[str, float, pd.DataFrame]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = dict.fromkeys(
+            [
+                "memory_hits",
+                "disk_hits",
+                "misses",
+                "expired",
+                "puts",
+                "evictions",
+                "invalidations",
+            ],
+            0,
+        )
+
+    # ------------------------------------------------------------------
+    #  Keys and paths
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def make_key(
+        sql: str,
+        base_table: str,
+        subset_filter: Optional[str] = None,
+        data_version: Optional[str] = None,
+    ) -> str:
+        """
+        Build the cache key of a query result.
+
+        Args:
+            sql: SQL query string.
+            base_table: Source table the subset is built from.
+            subset_filter: ``WHERE`` fragment defining the subset.
+            data_version: Caller-supplied version of the underlying data.
+
+        Returns:
+            Hexadecimal key.
+        """
+        parts = [
+            normalise_sql(sql),
+            base_table.lower(),
+            normalise_sql(subset_filter) if subset_filter else "",
+            "" if data_version is None else str(data_version),
+        ]
+        return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _table_dir_name(base_table: str) -> str:
+        return "".join(c if c.isalnum() else "_" for c in base_table.lower())
+
+    def _path(self, base_table: str, key: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / self._table_dir_name(base_table) / f"{key}.parquet"
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl_seconds is not None and time.time() - created > self.ttl_seconds
+
+    def _remember(self, key: str, base_table: str, created: float, df) -> None:
+        self._memory[key] = (base_table, created, df)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    # ------------------------------------------------------------------
+    #  Get / put
+    # ------------------------------------------------------------------
+
+    def get(self, key: str, base_table: str) -> Optional[pd.DataFrame]:
+        """
+        Look up a result.
+
+        Args:
+            key: Key from :meth:`make_key`.
+            base_table: Base table of the entry (selects the disk directory).
+
+        Returns:
+            A copy of the cached :class:`pandas.DataFrame`, or ``None`` on a
+            miss or a stale entry.
+        """
+        with self._lock:
+            stale = False
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[1]):
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return entry[2].copy()
+                del self._memory[key]
+                stale = True
+
+            path = self._path(base_table, key)
+            if path is not None and path.exists():
+                created = path.stat().st_mtime
+                if not self._expired(created):
+                    df = pd.read_parquet(path)
+                    self._remember(key, base_table, created, df)
+                    self._counters["disk_hits"] += 1
+                    return df.copy()
+                path.unlink(missing_ok=True)
+                stale = True
+
+            self._counters["expired"] += stale
+            self._counters["misses"] += 1
+            return None
+
+    def put(self, key: str, base_table: str, df: pd.DataFrame) -> None:
+        """
+        Store a result in memory and, with a ``cache_dir``, as Parquet.
+
+        Args:
+            key: Key from :meth:`make_key`.
+            base_table: Base table of the entry.
+            df: Query result.
+
+        Raises:
+            Exception: Whatever ``DataFrame.to_parquet`` raises (e.g. duplicate
+                or non-string column names, a full disk); nothing is cached.
+        """
+        df = df.copy()
+        path = self._path(base_table, key)
+        tmp_path = None
+        if path is not None:
+            # write outside the lock, lookups of other keys don't wait on disk
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            try:
+                df.to_parquet(tmp_path)
+            except BaseException:
+                tmp_path.unlink(missing_ok=True)
+                raise
+        with self._lock:
+            if tmp_path is not None:
+                tmp_path.replace(path)
+            self._remember(key, base_table, time.time(), df)
+            self._counters["puts"] += 1
+
+    # ------------------------------------------------------------------
+    #  Invalidation and metrics
+    # ------------------------------------------------------------------
+
+    def invalidate(
+        self, key: Optional[str] = None, base_table: Optional[str] = None
+    ) -> int:
+        """
+        Drop cached entries.
+
+        Args:
+            key: Drop a single entry (*base_table* then locates its file).
+            base_table: Without *key*, drop every entry of this base table.
+                With neither argument the whole cache is cleared.
+
+        Returns:
+            Number of in-memory entries dropped.
+        """
+        with self._lock:
+            if key is not None:
+                keys = [key] if key in self._memory else []
+            elif base_table is not None:
+                table = base_table.lower()
+                keys = [k for k, v in self._memory.items() if v[0].lower() == table]
+            else:
+                keys = list(self._memory)
+            for k in keys:
+                del self._memory[k]
+
+            if self.cache_dir is not None:
+                if key is not None:
+                    if base_table is not None:
+                        self._path(base_table, key).unlink(missing_ok=True)
+                    else:
+                        for path in self.cache_dir.glob(f"*/{key}.parquet"):
+                            path.unlink()
+                elif base_table is not None:
+                    shutil.rmtree(
+                        self.cache_dir / self._table_dir_name(base_table),
+                        ignore_errors=True,
+                    )
+                else:
+                    shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+            self._counters["invalidations"] += 1
+        logger.info(
+            "ResultCache: invalidated key={} base_table={} ({} in memory)",
+            key,
+            base_table,
+            len(keys),
+        )
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop every entry, in memory and on disk."""
+        self.invalidate()
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Return hit/miss counters.
+
+        Returns:
+            Dict with ``hits``, ``memory_hits``, ``disk_hits``, ``misses``,
+            ``expired``, ``puts``, ``evictions``, ``invalidations``,
+            ``memory_entries`` and ``hit_rate``.
+        """
+        with self._lock:
+            metrics = dict(self._counters)
+            metrics["memory_entries"] = len(self._memory)
+        metrics["hits"] = metrics["memory_hits"] + metrics["disk_hits"]
+        lookups = metrics["hits"] + metrics["misses"]
+        metrics["hit_rate"] = metrics["hits"] / lookups if lookups else 0.0
+        return metrics
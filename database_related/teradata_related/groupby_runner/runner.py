@@ -7,8 +7,9 @@ queries against a Teradata table via SQLAlchemy.  Three execution strategies are
 offered:
 
 * :class:`SequentialGroupByRunner` – runs queries one-by-one in the calling thread.
-* :class:`ParallelGroupByRunner` – runs queries concurrently using a
-  ``ThreadPoolExecutor`` and SQLAlchemy connection pooling.
+* :class:`ParallelGroupByRunner` – runs queries concurrently on a long-lived
+  ``ThreadPoolExecutor`` sized to the session limit, cheapest queries first and
+  with a cap on concurrent high-spool-risk queries.
 * :class:`ServerSideGroupByRunner` – loads queries into a driver table and
   executes them via a Teradata stored procedure, minimising round-trips.
 
@@ -24,22 +25,31 @@ Example
 ...     "SELECT colA, COUNT(*) AS cnt FROM vt_subset GROUP BY colA",
 ...     "SELECT colB, SUM(x) AS total FROM vt_subset GROUP BY colB",
 ... ]
->>> runner = get_advanced_groupby_runner(
+>>> with get_advanced_groupby_runner(
 ...     engine, base_table="big_table",
 ...     subset_filter="event_date >= DATE - 30",
 ...     subset_table="vt_subset", queries=queries
-... )
->>> results = runner.run(queries)
+... ) as runner:
+...     results = runner.run(queries)
+
+Callers own a runner's lifetime: :class:`ParallelGroupByRunner` keeps its
+worker threads (and pinned sessions) until :meth:`~BaseGroupByRunner.close`,
+so use every runner as a context manager or close it when done.
 """
 
+import queue
+import time
 from abc import ABC, abstractmethod
-from concurrent.futures import ThreadPoolExecutor
-from typing import List, Optional
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import pandas as pd
 from loguru import logger
 from sqlalchemy import text
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Connection, Engine
+
+from .cost_model import CostModel, plan_execution
+from .result_cache import ResultCache
 
 # ---------------------------------------------------------------------------
 #  Cost + Spool Estimation Helpers
@@ -139,6 +149,12 @@ class BaseGroupByRunner(ABC):
             ``WHERE`` keyword) used when materialising the subset.
         subset_table: Name of the volatile table to create for the subset.
             Defaults to ``"vt_subset"``.
+        cost_model: Optional :class:`~.cost_model.CostModel` whose history
+            receives the observed per-query runtimes.
+        result_cache: Optional :class:`~.result_cache.ResultCache` consulted
+            before a query is sent to the database.
+        data_version: Version of the underlying data, part of the cache
+            key.  Change it when :attr:`base_table` is reloaded.
     """
 
     def __init__(
@@ -147,26 +163,69 @@ class BaseGroupByRunner(ABC):
         base_table: str,
         subset_filter: Optional[str] = None,
         subset_table: str = "vt_subset",
+        cost_model: Optional[CostModel] = None,
+        result_cache: Optional[ResultCache] = None,
+        data_version: Optional[str] = None,
     ) -> None:
         self.engine = engine
         self.base_table = base_table
         self.subset_filter = subset_filter
         self.subset_table = subset_table
+        self.cost_model = cost_model
+        self.result_cache = result_cache
+        self.data_version = data_version
+
+    def cache_key(self, sql: str) -> str:
+        """Return the result cache key of *sql* for this runner's subset and data version."""
+        return ResultCache.make_key(
+            sql, self.base_table, self.subset_filter, self.data_version
+        )
+
+    def cached_result(self, sql: str) -> Optional[pd.DataFrame]:
+        """Return the cached result of *sql*, or ``None`` without a cache hit."""
+        if self.result_cache is None:
+            return None
+        return self.result_cache.get(self.cache_key(sql), self.base_table)
 
-    def create_subset(self) -> None:
+    def store_result(self, sql: str, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Materialise a volatile-table subset of :attr:`base_table`.
+        Store the result of *sql* in the result cache, if there is one.
 
-        The table is created with ``ON COMMIT PRESERVE ROWS`` so that it
-        persists for the duration of the session.
+        A result the cache cannot store (e.g. not writable as Parquet) is
+        logged and skipped; the query itself has succeeded.
+
+        Returns:
+            *df*, cached or not.
+        """
+        if self.result_cache is not None:
+            try:
+                self.result_cache.put(self.cache_key(sql), self.base_table, df)
+            except Exception as e:
+                logger.warning("Could not cache the result of '{}': {}", sql, e)
+        return df
+
+    def record_runtime(self, sql: str, seconds: float) -> None:
+        """
+        Feed an observed query runtime to the cost model history; the cost
+        model adds the query's spool (see :meth:`~.cost_model.CostModel.record`).
+
+        Args:
+            sql: SQL string that was executed.
+            seconds: Observed runtime in seconds.
+        """
+        if self.cost_model is not None:
+            self.cost_model.record(sql, seconds)
+
+    def subset_sql(self) -> str:
+        """
+        Return the statement that materialises the subset table.
+
+        Returns:
+            ``CREATE VOLATILE TABLE ... WITH DATA`` statement selecting
+            :attr:`subset_filter` rows of :attr:`base_table`.
         """
-        logger.info(
-            "Creating volatile subset table '{}' from '{}'",
-            self.subset_table,
-            self.base_table,
-        )
         where_clause = f"WHERE {self.subset_filter}" if self.subset_filter else ""
-        sql = f"""
+        return f"""
             CREATE VOLATILE TABLE {self.subset_table} AS (
                 SELECT *
                 FROM {self.base_table}
@@ -175,12 +234,43 @@ class BaseGroupByRunner(ABC):
             PRIMARY INDEX (1)
             ON COMMIT PRESERVE ROWS;
         """
-        with self.engine.begin() as conn:
-            conn.execute(text(sql))
+
+    def create_subset(self, conn: Optional[Connection] = None) -> None:
+        """
+        Materialise a volatile-table subset of :attr:`base_table`.
+
+        The table is created with ``ON COMMIT PRESERVE ROWS`` so that it
+        persists for the duration of the session.  A volatile table is only
+        visible to the session that created it.
+
+        Args:
+            conn: Connection (session) to create the table in.  Defaults to a
+                connection borrowed from the engine pool.
+        """
+        logger.info(
+            "Creating volatile subset table '{}' from '{}'",
+            self.subset_table,
+            self.base_table,
+        )
+        if conn is None:
+            with self.engine.begin() as conn:
+                conn.execute(text(self.subset_sql()))
+        else:
+            conn.execute(text(self.subset_sql()))
+            conn.commit()
         logger.info(
             "Volatile subset table '{}' created successfully", self.subset_table
         )
 
+    def close(self) -> None:
+        """Release resources held between runs (nothing for this runner)."""
+
+    def __enter__(self) -> "BaseGroupByRunner":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
     @abstractmethod
     def run(self, queries: List[str], materialise_subset: bool = True) -> object:
         """
@@ -230,16 +320,32 @@ class SequentialGroupByRunner(BaseGroupByRunner):
             List of :class:`pandas.DataFrame`, one per query, in input order.
         """
         logger.info("SequentialGroupByRunner: running {} queries", len(queries))
+        results: List[Optional[pd.DataFrame]] = [
+            self.cached_result(sql) for sql in queries
+        ]
+        misses = [idx for idx, df in enumerate(results) if df is None]
+        if self.result_cache is not None:
+            logger.info(
+                "SequentialGroupByRunner: {} cache hits", len(queries) - len(misses)
+            )
+        if not misses:
+            return results
+
         if materialise_subset:
             self.create_subset()
 
-        results: List[pd.DataFrame] = []
         with self.engine.begin() as conn:
-            for idx, sql in enumerate(queries, start=1):
-                logger.debug("Executing query {}/{}", idx, len(queries))
+            for idx in misses:
+                sql = queries[idx]
+                logger.debug("Executing query {}/{}", idx + 1, len(queries))
+                started = time.perf_counter()
                 df = pd.read_sql(text(sql), conn)
-                results.append(df)
-                logger.debug("Query {}/{} returned {} rows", idx, len(queries), len(df))
+                self.record_runtime(sql, time.perf_counter() - started)
+                self.store_result(sql, df)
+                results[idx] = df
+                logger.debug(
+                    "Query {}/{} returned {} rows", idx + 1, len(queries), len(df)
+                )
 
         logger.info("SequentialGroupByRunner: all queries completed")
         return results
@@ -257,12 +363,41 @@ class ParallelGroupByRunner(BaseGroupByRunner):
     Each thread borrows a connection from the SQLAlchemy connection pool,
     so the *max_workers* value should not exceed the pool capacity.
 
+    The worker pool is created on first use and reused by every subsequent
+    :meth:`run` / :meth:`iter_results` call until :meth:`close` is called (or
+    the runner is used as a context manager).  Its size is capped at
+    :func:`get_session_limit`.
+
+    Queries are admitted cheapest first (by :func:`estimate_query_cost`) and
+    never more than :attr:`pool_size` at a time.  Queries whose
+    :func:`estimate_spool_risk` is at least *spool_risk_threshold* are
+    "high-spool"; when *max_high_spool* is set, at most that many of them run
+    concurrently and the scheduler fills the remaining slots with low-risk
+    queries meanwhile.
+
+    A volatile subset table is only visible to the session that created it,
+    so with the default pooled connections the workers cannot see the subset.
+    With *session_affinity* the runner instead pre-warms one pinned
+    connection per worker, materialises the subset once on each of them and
+    routes every query to an idle warm connection.  The pinned connections
+    (and their subset tables) are kept until :meth:`close`.
+
     Args:
         engine: SQLAlchemy engine connected to Teradata.
         base_table: Name of the source table.
         subset_filter: Optional ``WHERE`` clause fragment.
         subset_table: Name of the volatile subset table.
         max_workers: Maximum number of worker threads.  Defaults to ``6``.
+        max_high_spool: Maximum number of concurrent high-spool-risk queries.
+            Defaults to ``None`` (no cap beyond *max_workers*).
+        spool_risk_threshold: Spool risk score from which a query counts as
+            high-spool.  Defaults to ``3``.
+        session_affinity: Run queries on pinned, subset-warmed connections
+            instead of pooled ones.  Defaults to ``False``.
+        cost_model: Optional cost model recording the observed runtimes.
+        result_cache: Optional result cache; hits are yielded first and only
+            the misses are scheduled.
+        data_version: Version of the underlying data, part of the cache key.
     """
 
     def __init__(
@@ -272,13 +407,100 @@ class ParallelGroupByRunner(BaseGroupByRunner):
         subset_filter: Optional[str] = None,
         subset_table: str = "vt_subset",
         max_workers: int = 6,
+        max_high_spool: Optional[int] = None,
+        spool_risk_threshold: int = 3,
+        session_affinity: bool = False,
+        cost_model: Optional[CostModel] = None,
+        result_cache: Optional[ResultCache] = None,
+        data_version: Optional[str] = None,
     ) -> None:
-        super().__init__(engine, base_table, subset_filter, subset_table)
+        super().__init__(
+            engine,
+            base_table,
+            subset_filter,
+            subset_table,
+            cost_model,
+            result_cache,
+            data_version,
+        )
+        if max_high_spool is not None and max_high_spool < 1:
+            raise ValueError("max_high_spool must be at least 1")
         self.max_workers = max_workers
+        self.max_high_spool = max_high_spool
+        self.spool_risk_threshold = spool_risk_threshold
+        self.session_affinity = session_affinity
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pinned: List[Connection] = []
+        self._idle_sessions: "queue.Queue[Connection]" = queue.Queue()
+
+    @property
+    def pool_size(self) -> int:
+        """Number of worker threads, ``max_workers`` capped at the session limit."""
+        return max(1, min(self.max_workers, get_session_limit()))
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """Return the long-lived worker pool, creating it on first use."""
+        if self._pool is None:
+            logger.debug("Starting worker pool with {} threads", self.pool_size)
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.pool_size, thread_name_prefix="groupby"
+            )
+        return self._pool
+
+    def close(self) -> None:
+        """Shut down the worker pool and release the pinned connections."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        for conn in self._pinned:
+            conn.close()
+        self._pinned = []
+        self._idle_sessions = queue.Queue()
+
+    def _open_session(self, materialise_subset: bool) -> Connection:
+        conn = self.engine.connect()
+        if materialise_subset:
+            self.create_subset(conn)
+        return conn
+
+    def warm_sessions(self, materialise_subset: bool = True) -> None:
+        """
+        Open :attr:`pool_size` pinned connections, materialising the subset on each.
+
+        The connections are opened concurrently on the worker pool.  Does
+        nothing when the sessions are already warm.
+
+        Args:
+            materialise_subset: Create the volatile subset in every session.
+        """
+        if self._pinned:
+            return
+        logger.info("ParallelGroupByRunner: warming {} pinned sessions", self.pool_size)
+        self._pinned = list(
+            self._get_pool().map(
+                self._open_session, [materialise_subset] * self.pool_size
+            )
+        )
+        for conn in self._pinned:
+            self._idle_sessions.put(conn)
+
+    def _run_pinned(self, sql: str) -> pd.DataFrame:
+        """Execute a single query on an idle pinned connection."""
+        conn = self._idle_sessions.get()
+        try:
+            df = pd.read_sql(text(sql), conn)
+            conn.commit()
+            return df
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._idle_sessions.put(conn)
 
     def _run_single(self, sql: str) -> pd.DataFrame:
         """
-        Execute a single query in its own connection.
+        Execute a single query in its own connection, or on a pinned session
+        when :attr:`session_affinity` is set.
 
         Args:
             sql: SQL string to execute.
@@ -287,33 +509,112 @@ class ParallelGroupByRunner(BaseGroupByRunner):
             :class:`pandas.DataFrame` with query results.
         """
         logger.debug("Thread executing query: {}", sql[:60])
-        with self.engine.begin() as conn:
-            return pd.read_sql(text(sql), conn)
+        started = time.perf_counter()
+        if self.session_affinity:
+            df = self._run_pinned(sql)
+        else:
+            with self.engine.begin() as conn:
+                df = pd.read_sql(text(sql), conn)
+        self.record_runtime(sql, time.perf_counter() - started)
+        return df
 
-    def run(
+    def iter_results(
         self, queries: List[str], materialise_subset: bool = True
-    ) -> List[pd.DataFrame]:
+    ) -> Iterator[Tuple[int, pd.DataFrame]]:
         """
-        Run all *queries* concurrently using a thread pool.
+        Run *queries* on the worker pool and yield each result as it completes.
 
         Args:
             queries: SQL strings to execute.
             materialise_subset: Create the volatile subset before querying.
-
-        Returns:
-            List of :class:`pandas.DataFrame`, one per query, in input order.
+                With session affinity the subset is created in each pinned
+                session when the sessions are warmed (the first run).
+
+        Yields:
+            ``(index, DataFrame)`` tuples in completion order (result cache
+            hits first), *index* being the position of the query in
+            *queries*.  Closing the iterator early cancels the queries that
+            have not started yet.
         """
         logger.info(
-            "ParallelGroupByRunner: running {} queries with {} workers",
+            "ParallelGroupByRunner: scheduling {} queries on {} workers",
             len(queries),
-            self.max_workers,
+            self.pool_size,
         )
-        if materialise_subset:
+        misses = []
+        for idx, sql in enumerate(queries):
+            df = self.cached_result(sql)
+            if df is None:
+                misses.append(idx)
+            else:
+                yield idx, df
+        if not misses:
+            return
+
+        if self.session_affinity:
+            self.warm_sessions(materialise_subset)
+        elif materialise_subset:
             self.create_subset()
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
-            futures = [pool.submit(self._run_single, q) for q in queries]
-            results = [f.result() for f in futures]
+        pending = sorted(misses, key=lambda i: (estimate_query_cost(queries[i]), i))
+        high_spool = {
+            i
+            for i in pending
+            if estimate_spool_risk(queries[i]) >= self.spool_risk_threshold
+        }
+        pool = self._get_pool()
+        in_flight: Dict[Future, int] = {}
+        running_high_spool = 0
+        max_high_spool = (
+            self.pool_size if self.max_high_spool is None else self.max_high_spool
+        )
+
+        try:
+            while pending or in_flight:
+                # admit the cheapest pending queries that fit the spool budget
+                while pending and len(in_flight) < self.pool_size:
+                    admit = next(
+                        (
+                            pos
+                            for pos, i in enumerate(pending)
+                            if i not in high_spool
+                            or running_high_spool < max_high_spool
+                        ),
+                        None,
+                    )
+                    if admit is None:
+                        break
+                    idx = pending.pop(admit)
+                    running_high_spool += idx in high_spool
+                    in_flight[pool.submit(self._run_single, queries[idx])] = idx
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    idx = in_flight.pop(future)
+                    running_high_spool -= idx in high_spool
+                    df = future.result()
+                    self.store_result(queries[idx], df)
+                    yield idx, df
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    def run(
+        self, queries: List[str], materialise_subset: bool = True
+    ) -> List[pd.DataFrame]:
+        """
+        Run all *queries* concurrently using the scheduler of :meth:`iter_results`.
+
+        Args:
+            queries: SQL strings to execute.
+            materialise_subset: Create the volatile subset before querying.
+
+        Returns:
+            List of :class:`pandas.DataFrame`, one per query, in input order.
+        """
+        results: List[Optional[pd.DataFrame]] = [None] * len(queries)
+        for idx, df in self.iter_results(queries, materialise_subset):
+            results[idx] = df
 
         logger.info("ParallelGroupByRunner: all queries completed")
         return results
@@ -328,9 +629,20 @@ class ServerSideGroupByRunner(BaseGroupByRunner):
     """
     Execute aggregation queries server-side via a Teradata stored procedure.
 
-    Queries are loaded into an ``agg_jobs`` driver table and dispatched by
-    calling ``run_dynamic_aggs()``.  Results are collected from the
-    ``agg_out`` output table.
+    Queries are bulk-loaded into an ``agg_jobs`` driver table (one
+    ``executemany`` round-trip) and dispatched by calling
+    ``run_dynamic_aggs(partition_no, n_partitions)``.  Results are collected
+    from the ``agg_out`` output table.
+
+    With *n_sessions* > 1 the jobs are split into ``job_id MOD n_sessions``
+    partitions and every partition runs in its own session concurrently.  With
+    ``executor="client"`` the partitions are run by a coordinating client loop
+    instead of the stored procedure, which also works against databases
+    without stored procedures (e.g. a local SQLite / DuckDB stand-in).
+
+    Per job, the row count and elapsed seconds are recorded in ``agg_out`` as
+    metric rows named :attr:`JOB_ROW_COUNT_METRIC` and
+    :attr:`JOB_ELAPSED_METRIC` (see :meth:`fetch_job_stats`).
 
     This strategy minimises client–server round-trips and is well-suited for
     large query lists or high-latency connections.
@@ -340,8 +652,17 @@ class ServerSideGroupByRunner(BaseGroupByRunner):
         base_table: Name of the source table.
         subset_filter: Optional ``WHERE`` clause fragment.
         subset_table: Name of the volatile subset table.
+        n_sessions: Number of concurrent sessions executing job partitions.
+            Defaults to ``1``.
+        executor: ``"procedure"`` (stored procedure, default) or
+            ``"client"`` (coordinating client loop).
+        cost_model: Optional cost model recording the per-job runtimes of
+            ``agg_out``.
     """
 
+    JOB_ROW_COUNT_METRIC = "job_row_count"
+    JOB_ELAPSED_METRIC = "job_elapsed_seconds"
+
     def __init__(
         self,
         engine: Engine,
@@ -351,11 +672,20 @@ class ServerSideGroupByRunner(BaseGroupByRunner):
         agg_jobs_table: str = "test_agg_jobs",
         agg_out_table: str = "test_agg_out",
         runner_proc: str = "test_run_dynamic_aggs",
+        n_sessions: int = 1,
+        executor: str = "procedure",
+        cost_model: Optional[CostModel] = None,
     ) -> None:
-        super().__init__(engine, base_table, subset_filter, subset_table)
+        super().__init__(engine, base_table, subset_filter, subset_table, cost_model)
+        if n_sessions < 1:
+            raise ValueError("n_sessions must be at least 1")
+        if executor not in ("procedure", "client"):
+            raise ValueError("executor must be either 'procedure' or 'client'")
         self.agg_jobs_table = agg_jobs_table
         self.agg_out_table = agg_out_table
         self.runner_proc = runner_proc
+        self.n_sessions = n_sessions
+        self.executor = executor
 
         self.drop_tables_and_proc()
 
@@ -429,15 +759,42 @@ class ServerSideGroupByRunner(BaseGroupByRunner):
             conn.execute(
                 text(
                     f"""
-                    REPLACE PROCEDURE {self.runner_proc}()
+                    REPLACE PROCEDURE {self.runner_proc}(
+                        IN partition_no INTEGER, IN n_partitions INTEGER
+                    )
                     --SQL SECURITY INVOKER
                     BEGIN
                         DECLARE stmt VARCHAR(32000);
+                        DECLARE started TIMESTAMP(6);
+                        DECLARE row_count BIGINT;
+                        DECLARE elapsed INTERVAL DAY(4) TO SECOND(6);
                         FOR cur AS c1 CURSOR FOR
-                            SELECT sql_text FROM {self.agg_jobs_table} ORDER BY job_id
+                            SELECT job_id, sql_text FROM {self.agg_jobs_table}
+                            WHERE job_id MOD n_partitions = partition_no
+                            ORDER BY job_id
                         DO
                             SET stmt = cur.sql_text;
+                            SET started = CURRENT_TIMESTAMP(6);
                             CALL DBC.SysExecSQL(:stmt);
+                            SET row_count = ACTIVITY_COUNT;
+                            SET elapsed = (CURRENT_TIMESTAMP(6) - started) DAY(4) TO SECOND(6);
+                            INSERT INTO {self.agg_out_table}
+                                (job_id, group_key_json, metric_name, metric_value)
+                            VALUES (
+                                cur.job_id, NULL, '{self.JOB_ROW_COUNT_METRIC}',
+                                CAST(row_count AS VARCHAR(200))
+                            );
+                            INSERT INTO {self.agg_out_table}
+                                (job_id, group_key_json, metric_name, metric_value)
+                            VALUES (
+                                cur.job_id, NULL, '{self.JOB_ELAPSED_METRIC}',
+                                CAST(
+                                    EXTRACT(DAY FROM elapsed) * 86400
+                                    + EXTRACT(HOUR FROM elapsed) * 3600
+                                    + EXTRACT(MINUTE FROM elapsed) * 60
+                                    + EXTRACT(SECOND FROM elapsed)
+                                AS VARCHAR(200))
+                            );
                         END FOR;
                     END;
                     """
@@ -467,9 +824,10 @@ class ServerSideGroupByRunner(BaseGroupByRunner):
 
     def load_driver_table(self, queries: List[str]) -> None:
         """
-        Populate the driver table with *queries*.
+        Populate the driver table with *queries* in one bulk insert.
 
-        Any existing rows are deleted first.
+        Any existing rows are deleted first.  The rows are sent as a single
+        ``executemany`` batch instead of one ``INSERT`` per query.
 
         Args:
             queries: SQL strings to load.
@@ -479,21 +837,108 @@ class ServerSideGroupByRunner(BaseGroupByRunner):
         )
         with self.engine.begin() as conn:
             conn.execute(text(f"DELETE FROM {self.agg_jobs_table}"))
-            for job_id, sql in enumerate(queries, start=1):
+            if queries:
                 conn.execute(
                     text(
                         f"INSERT INTO {self.agg_jobs_table} (job_id, sql_text) VALUES (:id, :sql)"
                     ),
-                    {"id": job_id, "sql": sql},
+                    [
+                        {"id": job_id, "sql": sql}
+                        for job_id, sql in enumerate(queries, start=1)
+                    ],
+                )
+
+    def fetch_jobs(self) -> List[Tuple[int, str]]:
+        """Return the ``(job_id, sql_text)`` rows of the driver table, ordered by ``job_id``."""
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                text(
+                    f"SELECT job_id, sql_text FROM {self.agg_jobs_table} ORDER BY job_id"
                 )
+            )
+            return [(int(job_id), sql) for job_id, sql in rows]
+
+    def _run_job(self, conn: Connection, job_id: int, sql: str) -> None:
+        """Execute one job and record its row count and elapsed time in ``agg_out``."""
+        started = time.perf_counter()
+        row_count = conn.execute(text(sql)).rowcount
+        elapsed = time.perf_counter() - started
+        conn.execute(
+            text(
+                f"INSERT INTO {self.agg_out_table} "
+                "(job_id, group_key_json, metric_name, metric_value) "
+                "VALUES (:id, NULL, :metric, :value)"
+            ),
+            [
+                {
+                    "id": job_id,
+                    "metric": self.JOB_ROW_COUNT_METRIC,
+                    "value": str(row_count),
+                },
+                {
+                    "id": job_id,
+                    "metric": self.JOB_ELAPSED_METRIC,
+                    "value": repr(elapsed),
+                },
+            ],
+        )
+        conn.commit()
+
+    def _run_partition(
+        self,
+        partition_no: int,
+        jobs: Optional[List[Tuple[int, str]]],
+        materialise_subset: bool,
+    ) -> None:
+        """Run one job partition in its own session."""
+        with self.engine.connect() as conn:
+            if materialise_subset:
+                self.create_subset(conn)
+            if jobs is None:
+                conn.execute(
+                    text(f"CALL {self.runner_proc}(:partition_no, :n_partitions)"),
+                    {"partition_no": partition_no, "n_partitions": self.n_sessions},
+                )
+                conn.commit()
+            else:
+                for job_id, sql in jobs:
+                    self._run_job(conn, job_id, sql)
+
+    def execute_server_side(self, materialise_subset: bool = False) -> None:
+        """
+        Execute the jobs of the driver table, one partition per session.
+
+        Args:
+            materialise_subset: Create the volatile subset in every partition
+                session first (volatile tables are session-scoped).
+        """
+        if self.executor == "procedure" and self.n_sessions == 1:
+            logger.info(
+                f"Calling stored procedure '{self.runner_proc}' to execute queries server-side"
+            )
+            with self.engine.begin() as conn:
+                if materialise_subset:
+                    conn.execute(text(self.subset_sql()))
+                conn.execute(text(f"CALL {self.runner_proc}(0, 1)"))
+            return
+
+        # same job_id MOD n_sessions split as the stored procedure
+        partitions: List[Optional[List[Tuple[int, str]]]] = [None] * self.n_sessions
+        if self.executor == "client":
+            partitions = [[] for _ in range(self.n_sessions)]
+            for job_id, sql in self.fetch_jobs():
+                partitions[job_id % self.n_sessions].append((job_id, sql))
 
-    def execute_server_side(self) -> None:
-        """Invoke the stored procedure."""
         logger.info(
-            f"Calling stored procedure '{self.runner_proc}' to execute queries server-side"
+            f"Executing job partitions in {self.n_sessions} sessions ({self.executor})"
         )
-        with self.engine.begin() as conn:
-            conn.execute(text(f"CALL {self.runner_proc}()"))
+        with ThreadPoolExecutor(max_workers=self.n_sessions) as pool:
+            futures = [
+                pool.submit(self._run_partition, partition_no, jobs, materialise_subset)
+                for partition_no, jobs in enumerate(partitions)
+            ]
+            for future in futures:
+                future.result()
 
     def fetch_results(self) -> pd.DataFrame:
         """
@@ -508,6 +953,35 @@ class ServerSideGroupByRunner(BaseGroupByRunner):
             f"SELECT * FROM {self.agg_out_table} ORDER BY job_id", self.engine
         )
 
+    def fetch_job_stats(self) -> pd.DataFrame:
+        """
+        Retrieve the per-job row counts and timings recorded in the output table.
+
+        Returns:
+            :class:`pandas.DataFrame` indexed by ``job_id`` with ``row_count``
+            and ``elapsed_seconds`` columns.
+        """
+        stats = pd.read_sql(
+            text(
+                f"SELECT job_id, metric_name, metric_value FROM {self.agg_out_table} "
+                "WHERE metric_name IN (:row_count, :elapsed)"
+            ),
+            self.engine,
+            params={
+                "row_count": self.JOB_ROW_COUNT_METRIC,
+                "elapsed": self.JOB_ELAPSED_METRIC,
+            },
+        )
+        stats = stats.pivot(
+            index="job_id", columns="metric_name", values="metric_value"
+        )
+        return pd.DataFrame(
+            {
+                "row_count": stats[self.JOB_ROW_COUNT_METRIC].astype(int),
+                "elapsed_seconds": stats[self.JOB_ELAPSED_METRIC].astype(float),
+            }
+        ).sort_index()
+
     # ------------------------------------------------------------------
     #  Main run
     # ------------------------------------------------------------------
@@ -534,14 +1008,20 @@ class ServerSideGroupByRunner(BaseGroupByRunner):
         self.validate_queries(queries)
         self.ensure_driver_table()
         self.ensure_output_table()
-        self.ensure_stored_procedure()
+        if self.executor == "procedure":
+            self.ensure_stored_procedure()
 
-        if materialise_subset:
+        # several sessions each need their own copy of the volatile subset
+        subset_per_session = materialise_subset and self.n_sessions > 1
+        if materialise_subset and not subset_per_session:
             self.create_subset()
 
         self.load_driver_table(queries)
-        self.execute_server_side()
+        self.execute_server_side(materialise_subset=subset_per_session)
         result = self.fetch_results()
+        if self.cost_model is not None:
+            for job_id, seconds in self.fetch_job_stats()["elapsed_seconds"].items():
+                self.record_runtime(queries[job_id - 1], seconds)
         logger.info(
             f"ServerSideGroupByRunner: run completed, {len(result)} rows fetched"
         )
@@ -559,11 +1039,16 @@ def get_advanced_groupby_runner(
     subset_filter: Optional[str],
     subset_table: str,
     queries: List[str],
+    cost_model: Optional[CostModel] = None,
+    session_affinity: bool = False,
 ) -> BaseGroupByRunner:
     """
     Select the optimal runner strategy based on query characteristics.
 
-    Decision rules:
+    With a *cost_model* the strategy and the number of workers / sessions
+    come from :func:`~.cost_model.plan_execution` on the model's runtime and
+    spool estimates, and the returned runner records its observed runtimes
+    into the model's history.  Without one, the keyword heuristics decide:
 
     1. **Sequential** – ``n ≤ 5``, ``max_cost ≤ 2``, ``max_spool ≤ 1``.
     2. **Parallel** – ``6 ≤ n ≤ 20``, ``avg_cost ≤ 3``, ``avg_spool ≤ 2``,
@@ -577,10 +1062,45 @@ def get_advanced_groupby_runner(
         subset_table: Name of the volatile subset table.
         queries: The SQL queries that will be executed; used only for
             heuristic scoring.
+        cost_model: Optional :class:`~.cost_model.CostModel`.
+        session_affinity: Passed to a selected :class:`ParallelGroupByRunner`.
 
     Returns:
-        A concrete :class:`BaseGroupByRunner` instance.
+        A concrete :class:`BaseGroupByRunner` instance.  The caller owns it:
+        a :class:`ParallelGroupByRunner` holds its worker threads (and, with
+        *session_affinity*, its pinned sessions) until it is closed, so use
+        the runner as a context manager or call :meth:`~BaseGroupByRunner.close`.
     """
+    if cost_model is not None:
+        plan = plan_execution(cost_model.estimate_many(queries), get_session_limit())
+        logger.info(
+            f"Factory: n={len(queries)}, total_seconds={plan.total_seconds:.2f}, "
+            f"max_seconds={plan.max_seconds:.2f}, max_spool_bytes={plan.max_spool_bytes:.0f}, "
+            f"strategy={plan.strategy}, workers={plan.workers}"
+        )
+        if plan.strategy == "sequential":
+            return SequentialGroupByRunner(
+                engine, base_table, subset_filter, subset_table, cost_model
+            )
+        if plan.strategy == "parallel":
+            return ParallelGroupByRunner(
+                engine,
+                base_table,
+                subset_filter,
+                subset_table,
+                max_workers=plan.workers,
+                session_affinity=session_affinity,
+                cost_model=cost_model,
+            )
+        return ServerSideGroupByRunner(
+            engine,
+            base_table,
+            subset_filter,
+            subset_table,
+            n_sessions=plan.workers,
+            cost_model=cost_model,
+        )
+
     n = len(queries)
     costs = [estimate_query_cost(q) for q in queries]
     spool_risks = [estimate_spool_risk(q) for q in queries]
@@ -606,7 +1126,12 @@ def get_advanced_groupby_runner(
     if 6 <= n <= 20 and avg_cost <= 3 and avg_spool <= 2 and session_limit >= 6:
         logger.info("Factory: selected ParallelGroupByRunner")
         return ParallelGroupByRunner(
-            engine, base_table, subset_filter, subset_table, max_workers=6
+            engine,
+            base_table,
+            subset_filter,
+            subset_table,
+            max_workers=6,
+            session_affinity=session_affinity,
         )
 
     # Strategy 3: Server-side
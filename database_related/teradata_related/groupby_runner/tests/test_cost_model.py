@@ -0,0 +1,215 @@
+"""Tests for the groupby_runner cost model (stub EXPLAIN backend, SQLite history)."""
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent.parent))
+
+from database_related.teradata_related.groupby_runner import (
+    CostModel,
+    ParallelGroupByRunner,
+    QueryEstimate,
+    RuntimeHistory,
+    SequentialGroupByRunner,
+    ServerSideGroupByRunner,
+    fingerprint_sql,
+    get_advanced_groupby_runner,
+    normalise_sql,
+    parse_teradata_explain,
+    plan_execution,
+)
+
+EXPLAIN_TEXT = """
+  1) First, we lock big_table for read.
+  2) Next, we do an all-AMPs RETRIEVE step from big_table by way of an
+     all-rows scan into Spool 1 (all_amps), which is built locally.
+     The size of Spool 1 is estimated with high confidence to be 1,200 rows
+     (48,000 bytes).  The estimated time for this step is 1.50 seconds.
+  3) We do an all-AMPs SUM step to aggregate from Spool 1 into Spool 2.
+     The size of Spool 2 is estimated with low confidence to be 12 rows
+     (2,500,000 bytes).  The estimated time for this step is 0.75 seconds.
+  -> The total estimated time is 2.25 seconds.
+"""
+
+QUERY = "SELECT colA, COUNT(*) FROM vt_subset WHERE x > 5 GROUP BY colA"
+
+
+def _make_engine():
+    engine = MagicMock()
+    ctx = MagicMock()
+    ctx.__enter__ = MagicMock(return_value=MagicMock())
+    ctx.__exit__ = MagicMock(return_value=False)
+    engine.begin.return_value = ctx
+    return engine
+
+
+class TestFingerprint:
+    def test_formatting_and_literals_do_not_matter(self):
+        a = "SELECT colA, COUNT(*) FROM vt_subset WHERE x > 5 GROUP BY colA;"
+        b = "select cola,  count(*)\n from VT_SUBSET -- comment\n where x > 10 group by cola"
+        assert fingerprint_sql(a) == fingerprint_sql(b)
+
+    def test_different_queries_differ(self):
+        assert fingerprint_sql("SELECT a FROM t") != fingerprint_sql("SELECT b FROM t")
+
+    def test_normalise_keeps_string_literals(self):
+        assert normalise_sql("SELECT A FROM T WHERE c = 'Abc' ;") == (
+            "select a from t where c = 'Abc'"
+        )
+
+
+class TestRuntimeHistory:
+    def test_running_mean_and_peak_spool(self):
+        history = RuntimeHistory()
+        history.record(QUERY, 1.0, spool_bytes=100.0)
+        history.record(QUERY.replace("5", "7"), 3.0)
+        assert history.lookup(QUERY) == (2, 2.0, 100.0)
+        assert history.lookup("SELECT 1") is None
+
+    def test_persists_between_instances(self, tmp_path):
+        path = tmp_path / "history.sqlite"
+        history = RuntimeHistory(path)
+        history.record(QUERY, 4.0)
+        history.close()
+
+        assert RuntimeHistory(path).lookup(QUERY) == (1, 4.0, None)
+
+
+class TestExplain:
+    def test_parse_teradata_explain(self):
+        assert parse_teradata_explain(EXPLAIN_TEXT) == (2.25, 2_500_000.0)
+
+    def test_parse_sums_steps_without_total(self):
+        plan = EXPLAIN_TEXT.replace("The total estimated time is 2.25 seconds.", "")
+        assert parse_teradata_explain(plan) == (2.25, 2_500_000.0)
+
+    def test_parse_plan_without_estimates(self):
+        assert parse_teradata_explain("PROJECTION\n  SEQ_SCAN") == (None, None)
+
+
+class TestCostModel:
+    def test_heuristic_fallback(self):
+        estimate = CostModel().estimate(QUERY)
+        assert estimate == QueryEstimate(
+            seconds=3.0, spool_bytes=1e9, source="heuristic"
+        )
+
+    def test_explain_backend_is_used_and_cached(self):
+        backend = MagicMock(return_value=EXPLAIN_TEXT)
+        model = CostModel(explain_backend=backend)
+        assert model.estimate(QUERY) == QueryEstimate(2.25, 2_500_000.0, "explain")
+        model.estimate(QUERY.replace("5", "6"))
+        backend.assert_called_once()
+
+    def test_failing_explain_falls_back_to_heuristic(self):
+        model = CostModel(explain_backend=MagicMock(side_effect=RuntimeError("no")))
+        assert model.estimate(QUERY).source == "heuristic"
+
+    def test_history_takes_precedence(self):
+        history = RuntimeHistory()
+        history.record(QUERY, 0.5)
+        model = CostModel(explain_backend=lambda sql: EXPLAIN_TEXT, history=history)
+        # runtime from history, spool (not observed) from EXPLAIN
+        assert model.estimate(QUERY) == QueryEstimate(0.5, 2_500_000.0, "history")
+
+    def test_record_takes_spool_from_explain(self):
+        history = RuntimeHistory()
+        model = CostModel(explain_backend=lambda sql: EXPLAIN_TEXT, history=history)
+        model.record(QUERY, 1.0)
+        assert history.lookup(QUERY) == (1, 1.0, 2_500_000.0)
+
+    def test_record_prefers_observed_spool(self):
+        history = RuntimeHistory()
+        model = CostModel(
+            explain_backend=lambda sql: EXPLAIN_TEXT,
+            history=history,
+            spool_backend=lambda sql: 7e6,
+        )
+        model.record(QUERY, 1.0)
+        assert history.lookup(QUERY)[2] == 7e6
+        # observed spool is used for admission afterwards
+        assert model.estimate(QUERY) == QueryEstimate(1.0, 7e6, "history")
+
+    def test_failing_spool_lookup_falls_back_to_explain(self):
+        history = RuntimeHistory()
+        model = CostModel(
+            explain_backend=lambda sql: EXPLAIN_TEXT,
+            history=history,
+            spool_backend=MagicMock(side_effect=RuntimeError("no DBQL")),
+        )
+        model.record(QUERY, 1.0)
+        assert history.lookup(QUERY)[2] == 2_500_000.0
+
+
+class TestPlanExecution:
+    def test_small_workload_runs_sequentially(self):
+        plan = plan_execution([QueryEstimate(1.0, 1e6, "explain")] * 4, 10)
+        assert (plan.strategy, plan.workers) == ("sequential", 1)
+
+    def test_workers_bounded_by_longest_query(self):
+        estimates = [QueryEstimate(30.0, 1e6, "explain")] + [
+            QueryEstimate(1.0, 1e6, "explain")
+        ] * 30
+        plan = plan_execution(estimates, 10)
+        assert plan.strategy == "parallel"
+        assert plan.workers == 2  # 60s of work, 30s longest query
+
+    def test_workers_bounded_by_spool_budget(self):
+        estimates = [QueryEstimate(20.0, 4e10, "explain")] * 10
+        plan = plan_execution(estimates, 10, spool_budget_bytes=1e11)
+        assert plan.workers == 2
+
+    def test_many_queries_go_server_side(self):
+        plan = plan_execution([QueryEstimate(5.0, 1e6, "explain")] * 200, 10)
+        assert (plan.strategy, plan.workers) == ("server_side", 10)
+
+
+class TestFactoryWithCostModel:
+    def test_strategy_and_workers_from_cost_model(self):
+        engine = _make_engine()
+        history = RuntimeHistory()
+        queries = [
+            f"SELECT c{i}, COUNT(*) FROM vt_subset GROUP BY c{i}" for i in range(8)
+        ]
+        for q in queries:
+            history.record(q, 0.1)
+        model = CostModel(history=history)
+
+        runner = get_advanced_groupby_runner(
+            engine, "big_table", None, "vt_subset", queries, cost_model=model
+        )
+        # cheap according to history although the keyword heuristic says parallel
+        assert isinstance(runner, SequentialGroupByRunner)
+
+        for q in queries:
+            history.record(q, 60.0)
+            history.record(q, 60.0)
+        runner = get_advanced_groupby_runner(
+            engine, "big_table", None, "vt_subset", queries, cost_model=model
+        )
+        assert isinstance(runner, ParallelGroupByRunner)
+        assert runner.max_workers == 8
+        assert runner.cost_model is model
+
+        runner = get_advanced_groupby_runner(
+            engine, "big_table", None, "vt_subset", queries * 10, cost_model=model
+        )
+        assert isinstance(runner, ServerSideGroupByRunner)
+        assert runner.n_sessions == 10
+
+    def test_runners_record_observed_runtimes(self):
+        history = RuntimeHistory()
+        model = CostModel(history=history, spool_backend=lambda sql: 5e6)
+        runner = SequentialGroupByRunner(_make_engine(), "big_table", cost_model=model)
+        with patch(
+            "database_related.teradata_related.groupby_runner.runner.pd.read_sql",
+            return_value=pd.DataFrame({"x": [1]}),
+        ):
+            runner.run([QUERY, "SELECT 1"], materialise_subset=False)
+
+        assert len(history) == 2
+        assert history.lookup(QUERY)[0] == 1
+        assert history.lookup(QUERY)[2] == 5e6
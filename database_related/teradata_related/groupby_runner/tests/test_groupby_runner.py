@@ -1,11 +1,15 @@
 """Tests for groupby_runner module (mocked DB calls)."""
 
 import sys
+import threading
+import time
 from pathlib import Path
 from unittest.mock import MagicMock, call, patch
 
 import pandas as pd
 import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
 
 # ---------------------------------------------------------------------------
 # Ensure the teradata_related package is importable from this test file
@@ -248,6 +252,181 @@ class TestParallelGroupByRunner:
                 mock_cs.assert_not_called()
 
 
+class TestParallelScheduler:
+    """Admission control, ordering and streaming of ParallelGroupByRunner."""
+
+    CHEAP = "SELECT a FROM vt_subset WHERE a=1"
+    MEDIUM = "SELECT a, COUNT(*) FROM vt_subset WHERE a>0 GROUP BY a"
+    HIGH_SPOOL = "SELECT a, COUNT(*) FROM vt_subset JOIN s ON 1=1 GROUP BY a"
+
+    def test_pool_is_reused_and_capped_at_session_limit(self, mock_engine, sample_df):
+        with patch(
+            "database_related.teradata_related.groupby_runner.runner.pd.read_sql",
+            return_value=sample_df,
+        ):
+            runner = ParallelGroupByRunner(mock_engine, "big_table", max_workers=50)
+            assert runner.pool_size == get_session_limit()
+            runner.run([SIMPLE_QUERY], materialise_subset=False)
+            pool = runner._pool
+            runner.run([SIMPLE_QUERY], materialise_subset=False)
+            assert runner._pool is pool
+            runner.close()
+            assert runner._pool is None
+
+    def test_cheapest_queries_run_first(self, mock_engine):
+        executed = []
+
+        def fake_read_sql(sql, conn):
+            executed.append(str(sql))
+            return pd.DataFrame({"sql": [str(sql)]})
+
+        queries = [self.HIGH_SPOOL, self.MEDIUM, self.CHEAP]
+        with patch(
+            "database_related.teradata_related.groupby_runner.runner.pd.read_sql",
+            side_effect=fake_read_sql,
+        ), ParallelGroupByRunner(mock_engine, "big_table", max_workers=1) as runner:
+            results = runner.run(queries, materialise_subset=False)
+
+        assert executed == [self.CHEAP, self.MEDIUM, self.HIGH_SPOOL]
+        # results are still returned in input order
+        assert [df["sql"][0] for df in results] == queries
+
+    def test_high_spool_concurrency_is_limited(self, mock_engine):
+        lock = threading.Lock()
+        running = {"high": 0, "peak": 0}
+
+        def fake_read_sql(sql, conn):
+            high = "join" in str(sql).lower()
+            with lock:
+                running["high"] += high
+                running["peak"] = max(running["peak"], running["high"])
+            time.sleep(0.02)
+            with lock:
+                running["high"] -= high
+            return pd.DataFrame({"x": [1]})
+
+        queries = [self.HIGH_SPOOL] * 4 + [self.CHEAP] * 4
+        with patch(
+            "database_related.teradata_related.groupby_runner.runner.pd.read_sql",
+            side_effect=fake_read_sql,
+        ), ParallelGroupByRunner(
+            mock_engine, "big_table", max_workers=4, max_high_spool=1
+        ) as runner:
+            results = runner.run(queries, materialise_subset=False)
+
+        assert len(results) == 8
+        assert running["peak"] == 1
+
+    def test_no_spool_cap_by_default(self, mock_engine):
+        # GROUP BY without WHERE scores 3, the default threshold; it must
+        # not be throttled unless max_high_spool is set
+        query = "SELECT colA, COUNT(*) AS cnt FROM vt_subset GROUP BY colA"
+        assert estimate_spool_risk(query) >= 3
+        lock = threading.Lock()
+        running = {"now": 0, "peak": 0}
+
+        def fake_read_sql(sql, conn):
+            with lock:
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+            time.sleep(0.05)
+            with lock:
+                running["now"] -= 1
+            return pd.DataFrame({"x": [1]})
+
+        with patch(
+            "database_related.teradata_related.groupby_runner.runner.pd.read_sql",
+            side_effect=fake_read_sql,
+        ), ParallelGroupByRunner(mock_engine, "big_table", max_workers=6) as runner:
+            results = runner.run([query] * 12, materialise_subset=False)
+
+        assert len(results) == 12
+        assert running["peak"] == 6
+
+    def test_iter_results_yields_in_completion_order(self, mock_engine):
+        def fake_read_sql(sql, conn):
+            if "join" in str(sql).lower():
+                time.sleep(0.1)
+            return pd.DataFrame({"sql": [str(sql)]})
+
+        queries = [self.HIGH_SPOOL, self.CHEAP]
+        with patch(
+            "database_related.teradata_related.groupby_runner.runner.pd.read_sql",
+            side_effect=fake_read_sql,
+        ), ParallelGroupByRunner(mock_engine, "big_table", max_workers=2) as runner:
+            indices = [idx for idx, _ in runner.iter_results(queries, False)]
+
+        assert indices == [1, 0]
+
+    def test_max_high_spool_must_be_positive(self, mock_engine):
+        with pytest.raises(ValueError):
+            ParallelGroupByRunner(mock_engine, "big_table", max_high_spool=0)
+
+
+class _SQLiteParallelRunner(ParallelGroupByRunner):
+    """SQLite TEMP tables are per connection, like Teradata volatile tables."""
+
+    def subset_sql(self):
+        return (
+            f"CREATE TEMP TABLE {self.subset_table} AS "
+            f"SELECT * FROM {self.base_table} WHERE {self.subset_filter}"
+        )
+
+
+class TestParallelSessionAffinity:
+    QUERY = "SELECT grp, COUNT(*) AS cnt FROM vt_subset GROUP BY grp ORDER BY grp"
+
+    @pytest.fixture
+    def sqlite_engine(self, tmp_path):
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'big.db'}",
+            connect_args={"check_same_thread": False},
+            poolclass=QueuePool,
+        )
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE big_table (grp TEXT, x INTEGER)"))
+            conn.execute(
+                text("INSERT INTO big_table VALUES (:grp, :x)"),
+                [{"grp": g, "x": x} for x in range(20) for g in "ab"],
+            )
+        yield engine
+        engine.dispose()
+
+    def test_pinned_sessions_see_subset(self, sqlite_engine):
+        with _SQLiteParallelRunner(
+            sqlite_engine,
+            "big_table",
+            subset_filter="x < 5",
+            max_workers=3,
+            session_affinity=True,
+        ) as runner:
+            with patch.object(
+                runner, "create_subset", wraps=runner.create_subset
+            ) as mock_cs:
+                results = runner.run([self.QUERY] * 6)
+                runner.run([self.QUERY] * 6)
+
+            assert mock_cs.call_count == runner.pool_size == 3
+            assert len(runner._pinned) == 3
+
+        assert all(df["cnt"].tolist() == [5, 5] for df in results)
+        assert runner._pinned == []
+
+    def test_factory_session_affinity_is_opt_in(self, mock_engine):
+        base = "SELECT col{i}, COUNT(*) FROM t WHERE col{i}>0 GROUP BY col{i}"
+        queries = [base.format(i=i) for i in range(8)]
+        runner = get_advanced_groupby_runner(
+            mock_engine, "big_table", None, "vt_subset", queries
+        )
+        assert isinstance(runner, ParallelGroupByRunner)
+        assert not runner.session_affinity
+
+        with get_advanced_groupby_runner(
+            mock_engine, "big_table", None, "vt_subset", queries, session_affinity=True
+        ) as runner:
+            assert runner.session_affinity
+
+
 # ---------------------------------------------------------------------------
 #  ServerSideGroupByRunner
 # ---------------------------------------------------------------------------
@@ -362,6 +541,77 @@ class TestServerSideGroupByRunner:
         mock_cs.assert_not_called()
 
 
+class TestServerSideBulkAndPartitions:
+    """Bulk driver-table load and partitioned execution, SQLite as the database."""
+
+    @pytest.fixture
+    def sqlite_engine(self, tmp_path):
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'server_side.db'}",
+            connect_args={"check_same_thread": False, "timeout": 30},
+        )
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE vt_subset (grp TEXT, x INTEGER)"))
+            conn.execute(
+                text("INSERT INTO vt_subset VALUES (:grp, :x)"),
+                [{"grp": g, "x": x} for x in range(10) for g in "abc"],
+            )
+        yield engine
+        engine.dispose()
+
+    @staticmethod
+    def _job(metric, where=""):
+        return (
+            "INSERT INTO test_agg_out "
+            f"SELECT 0, grp, '{metric}', CAST(COUNT(*) AS TEXT) "
+            f"FROM vt_subset {where} GROUP BY grp"
+        )
+
+    def test_load_driver_table_is_one_bulk_insert(self):
+        engine, conn = _make_engine()
+        runner = ServerSideGroupByRunner(engine, "big_table")
+        conn.execute.reset_mock()
+        queries = [f"SELECT {i} FROM vt_subset" for i in range(5)]
+        runner.load_driver_table(queries)
+
+        assert conn.execute.call_count == 2  # DELETE + one executemany
+        params = conn.execute.call_args_list[1].args[1]
+        assert [p["id"] for p in params] == [1, 2, 3, 4, 5]
+        assert [p["sql"] for p in params] == queries
+
+    def test_procedure_partitions_run_in_separate_sessions(self, mock_engine):
+        runner = ServerSideGroupByRunner(mock_engine, "big_table", n_sessions=3)
+        runner.execute_server_side()
+        conn = mock_engine.connect.return_value.__enter__.return_value
+        partitions = sorted(
+            c.args[1]["partition_no"] for c in conn.execute.call_args_list
+        )
+        assert partitions == [0, 1, 2]
+        assert mock_engine.connect.call_count == 3
+
+    def test_invalid_arguments(self, mock_engine):
+        with pytest.raises(ValueError):
+            ServerSideGroupByRunner(mock_engine, "big_table", n_sessions=0)
+        with pytest.raises(ValueError):
+            ServerSideGroupByRunner(mock_engine, "big_table", executor="other")
+
+    @pytest.mark.parametrize("n_sessions", [1, 3])
+    def test_client_executor_records_job_stats(self, sqlite_engine, n_sessions):
+        runner = ServerSideGroupByRunner(
+            sqlite_engine, "big_table", n_sessions=n_sessions, executor="client"
+        )
+        queries = [self._job(f"cnt_{i}", "WHERE x < %d" % (i + 1)) for i in range(7)]
+        result = runner.run(queries, materialise_subset=False)
+
+        counts = result[result["metric_name"] == "cnt_3"]
+        assert sorted(counts["metric_value"]) == ["4", "4", "4"]
+
+        stats = runner.fetch_job_stats()
+        assert stats.index.tolist() == list(range(1, 8))
+        assert (stats["row_count"] == 3).all()
+        assert (stats["elapsed_seconds"] >= 0).all()
+
+
 # ---------------------------------------------------------------------------
 #  get_advanced_groupby_runner (factory)
 # ---------------------------------------------------------------------------
@@ -424,3 +674,26 @@ class TestGetAdvancedGroupByRunner:
         assert runner.base_table == "my_table"
         assert runner.subset_filter == "dt >= DATE - 7"
         assert runner.subset_table == "my_subset"
+
+    def test_every_runner_closes_as_context_manager(self, mock_engine, sample_df):
+        parallel = [
+            f"SELECT col{i}, COUNT(*) FROM t WHERE col{i}>0 GROUP BY col{i}"
+            for i in range(8)
+        ]
+        for queries in (["SELECT a FROM t WHERE a=1"], parallel, parallel * 4):
+            with get_advanced_groupby_runner(
+                mock_engine, "big_table", None, "vt_subset", queries
+            ) as runner:
+                pass
+        assert isinstance(runner, ServerSideGroupByRunner)
+
+        with patch(
+            "database_related.teradata_related.groupby_runner.runner.pd.read_sql",
+            return_value=sample_df,
+        ):
+            with get_advanced_groupby_runner(
+                mock_engine, "big_table", None, "vt_subset", parallel
+            ) as runner:
+                runner.run(parallel, materialise_subset=False)
+                assert runner._pool is not None
+        assert runner._pool is None
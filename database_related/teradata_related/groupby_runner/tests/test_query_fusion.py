@@ -0,0 +1,145 @@
+"""Tests for grouping-sets query fusion, verified against DuckDB."""
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent.parent))
+
+from database_related.teradata_related.groupby_runner import (
+    FusedGroupByRunner,
+    SequentialGroupByRunner,
+    fuse_queries,
+)
+from database_related.teradata_related.groupby_runner.query_fusion import (
+    parse_aggregation,
+)
+
+duckdb = pytest.importorskip("duckdb")
+
+QUERIES = [
+    "SELECT colA, COUNT(*) AS cnt FROM vt_subset GROUP BY colA",
+    "SELECT colB, SUM(x) AS total, COUNT(*) AS cnt FROM vt_subset GROUP BY colB",
+    "SELECT colA, colB, AVG(x) AS avg_x FROM vt_subset GROUP BY colA, colB",
+    "SELECT COUNT(DISTINCT colB) AS n_b FROM vt_subset",
+    "SELECT colA, MAX(x) AS max_x FROM vt_subset WHERE x > 10 GROUP BY colA",
+    "SELECT colB, MIN(x) AS min_x FROM vt_subset WHERE x > 10 GROUP BY colB",
+    "SELECT colA, COUNT(*) FROM vt_subset GROUP BY colA",
+    "SELECT v.colA, COUNT(*) AS cnt FROM vt_subset v JOIN other o ON v.colA = o.colA GROUP BY v.colA",
+]
+
+
+@pytest.fixture
+def con():
+    rng = np.random.default_rng(0)
+    n = 500
+    frame = pd.DataFrame(
+        {
+            "colA": rng.choice(["a", "b", "c", None], n),
+            "colB": rng.integers(0, 5, n),
+            "x": rng.integers(0, 20, n),
+            "y": rng.integers(0, 3, n).astype(float),
+        }
+    )
+    con = duckdb.connect()
+    con.register("frame", frame)
+    con.execute("CREATE TABLE vt_subset AS SELECT * FROM frame")
+    con.execute("CREATE TABLE other AS SELECT DISTINCT colA FROM frame")
+    yield con
+    con.close()
+
+
+def _sorted(df):
+    return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+
+def test_parse_rejects_unfusable_queries():
+    assert parse_aggregation(QUERIES[0]) is not None
+    assert parse_aggregation(QUERIES[6]) is None  # un-aliased aggregate
+    assert parse_aggregation(QUERIES[7]) is None  # join
+    assert parse_aggregation("SELECT colA FROM t GROUP BY colA HAVING 1=1") is None
+    assert parse_aggregation("SELECT colC FROM t GROUP BY colA") is None
+
+
+def test_families_are_fused_into_grouping_sets():
+    plan = fuse_queries(QUERIES)
+    # one statement per (table, WHERE) family, the rest passes through
+    assert len(plan.sql) == 4
+    assert "GROUP BY CUBE (colA, colB)" in plan.sql[0]
+    assert "WHERE x > 10" in plan.sql[1]
+    assert "GROUPING SETS ((colA), (colB))" in plan.sql[1]
+    assert plan.sql[2:] == [QUERIES[6], QUERIES[7]]
+
+
+def test_shared_aggregates_are_computed_once():
+    queries = [
+        "SELECT colA, COUNT(*) AS n FROM vt_subset GROUP BY colA",
+        "SELECT colB, count(*)  AS rows_b FROM vt_subset GROUP BY colB",
+        "SELECT COUNT(*) AS n FROM vt_subset",
+    ]
+    sql = fuse_queries(queries).sql[0]
+    assert sql.count("AS fused_a") == 1
+    assert "GROUPING SETS ((colA), (colB), ())" in sql
+
+
+def test_split_results_match_unfused_queries(con):
+    plan = fuse_queries(QUERIES)
+    fused = plan.split([con.execute(sql).df() for sql in plan.sql])
+
+    for sql, result in zip(QUERIES, fused):
+        expected = con.execute(sql).df()
+        assert list(result.columns) == list(expected.columns)
+        pd.testing.assert_frame_equal(_sorted(result), _sorted(expected))
+
+
+def test_fused_runner_wraps_a_runner(con):
+    inner = SequentialGroupByRunner(MagicMock(), "big_table")
+    inner.run = MagicMock(
+        side_effect=lambda queries, materialise_subset: [
+            con.execute(q).df() for q in queries
+        ]
+    )
+    runner = FusedGroupByRunner(inner)
+    results = runner.run(QUERIES[:4])
+
+    assert inner.run.call_count == 1
+    assert len(inner.run.call_args.args[0]) == 1  # four queries, one scan
+    assert len(results) == 4
+    pd.testing.assert_frame_equal(
+        _sorted(results[1]), _sorted(con.execute(QUERIES[1]).df())
+    )
+
+
+def test_same_columns_in_another_order_share_one_grouping_set(con):
+    queries = [
+        "SELECT colA, colB, COUNT(*) AS cnt FROM vt_subset GROUP BY colA, colB",
+        "SELECT colB, colA, SUM(x) AS total FROM vt_subset GROUP BY colB, colA",
+        "SELECT colA, COUNT(*) AS cnt FROM vt_subset GROUP BY colA",
+    ]
+    plan = fuse_queries(queries)
+    assert len(plan.sql) == 1
+    assert "GROUPING SETS ((colA, colB), (colA))" in plan.sql[0]
+
+    fused = plan.split([con.execute(sql).df() for sql in plan.sql])
+    for sql, result in zip(queries, fused):
+        expected = con.execute(sql).df()
+        assert len(result) == len(expected)
+        pd.testing.assert_frame_equal(_sorted(result), _sorted(expected))
+
+
+def test_whole_number_float_group_columns_stay_float(con):
+    queries = [
+        "SELECT y, COUNT(*) AS cnt FROM vt_subset GROUP BY y",
+        "SELECT colA, COUNT(*) AS cnt FROM vt_subset GROUP BY colA",
+    ]
+    plan = fuse_queries(queries)
+    result = plan.split([con.execute(sql).df() for sql in plan.sql])[0]
+
+    assert result["y"].dtype == "float64"
+    pd.testing.assert_frame_equal(
+        _sorted(result), _sorted(con.execute(queries[0]).df())
+    )
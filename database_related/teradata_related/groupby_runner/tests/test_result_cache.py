@@ -0,0 +1,199 @@
+"""Tests for the groupby_runner result cache (Parquet on tmp_path, mocked DB calls)."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent.parent))
+
+from database_related.teradata_related.groupby_runner import (
+    ParallelGroupByRunner,
+    ResultCache,
+    SequentialGroupByRunner,
+)
+
+READ_SQL = "database_related.teradata_related.groupby_runner.runner.pd.read_sql"
+QUERY_A = "SELECT colA, COUNT(*) AS cnt FROM vt_subset GROUP BY colA"
+QUERY_B = "SELECT colB, SUM(x) AS total FROM vt_subset GROUP BY colB"
+
+
+@pytest.fixture
+def mock_engine():
+    engine = MagicMock()
+    ctx = MagicMock()
+    ctx.__enter__ = MagicMock(return_value=MagicMock())
+    ctx.__exit__ = MagicMock(return_value=False)
+    engine.begin.return_value = ctx
+    return engine
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({"colA": ["x", "y"], "cnt": [3, 4]})
+
+
+class TestResultCache:
+    def test_key_ignores_formatting_but_not_subset_or_version(self):
+        key = ResultCache.make_key(QUERY_A, "big_table", "dt > 1", "v1")
+        assert key == ResultCache.make_key(
+            QUERY_A.lower().replace(" ", "  ") + ";", "BIG_TABLE", "dt > 1", "v1"
+        )
+        assert key != ResultCache.make_key(QUERY_A, "big_table", "dt > 2", "v1")
+        assert key != ResultCache.make_key(QUERY_A, "big_table", "dt > 1", "v2")
+        assert key != ResultCache.make_key(QUERY_A, "other_table", "dt > 1", "v1")
+
+    def test_memory_then_disk_hits(self, tmp_path, df):
+        cache = ResultCache(tmp_path)
+        key = ResultCache.make_key(QUERY_A, "big_table")
+        assert cache.get(key, "big_table") is None
+        cache.put(key, "big_table", df)
+
+        pd.testing.assert_frame_equal(cache.get(key, "big_table"), df)
+        # a new cache object on the same directory reads the Parquet file
+        fresh = ResultCache(tmp_path)
+        pd.testing.assert_frame_equal(fresh.get(key, "big_table"), df)
+
+        assert cache.metrics()["memory_hits"] == 1
+        assert cache.metrics()["misses"] == 1
+        assert fresh.metrics()["disk_hits"] == 1
+
+    def test_returned_frames_are_copies(self, df):
+        cache = ResultCache()
+        cache.put("k", "big_table", df)
+        first = cache.get("k", "big_table")
+        first["cnt"] = 0
+        assert cache.get("k", "big_table")["cnt"].tolist() == [3, 4]
+
+    def test_lru_eviction(self, df):
+        cache = ResultCache(max_memory_entries=2)
+        for key in "abc":
+            cache.put(key, "big_table", df)
+        assert cache.get("a", "big_table") is None
+        assert cache.metrics()["evictions"] == 1
+
+    def test_ttl_expiry(self, tmp_path, df):
+        cache = ResultCache(tmp_path, ttl_seconds=0.05)
+        cache.put("k", "big_table", df)
+        time.sleep(0.1)
+        assert cache.get("k", "big_table") is None
+        assert cache.metrics()["expired"] == 1
+        assert not list(tmp_path.rglob("*.parquet"))
+
+    def test_invalidation(self, tmp_path, df):
+        cache = ResultCache(tmp_path)
+        cache.put("a", "big_table", df)
+        cache.put("b", "big_table", df)
+        cache.put("c", "other_table", df)
+
+        assert cache.invalidate(key="a", base_table="big_table") == 1
+        assert cache.invalidate(base_table="big_table") == 1
+        assert cache.get("b", "big_table") is None
+        assert cache.get("c", "other_table") is not None
+
+        cache.clear()
+        assert cache.get("c", "other_table") is None
+        assert not tmp_path.exists()
+
+    def test_invalidation_ignores_table_case(self, tmp_path, df):
+        cache = ResultCache(tmp_path)
+        cache.put("a", "big_table", df)
+
+        # files live in a lower-cased directory; memory must follow suit
+        assert cache.invalidate(base_table="BIG_TABLE") == 1
+        assert cache.get("a", "big_table") is None
+
+    def test_failed_write_caches_nothing(self, tmp_path):
+        cache = ResultCache(tmp_path)
+        duplicate_columns = pd.DataFrame([[1, 2]], columns=["a", "a"])
+        with pytest.raises(ValueError):
+            cache.put("k", "big_table", duplicate_columns)
+        assert cache.get("k", "big_table") is None
+        assert cache.metrics()["puts"] == 0
+        assert not list(tmp_path.rglob("*.tmp"))
+
+    def test_lookups_do_not_wait_for_parquet_writes(self, tmp_path, df):
+        cache = ResultCache(tmp_path)
+        cache.put("a", "big_table", df)
+        writing, release = threading.Event(), threading.Event()
+        to_parquet = pd.DataFrame.to_parquet
+
+        def slow_to_parquet(frame, *args, **kwargs):
+            writing.set()
+            release.wait(5)
+            return to_parquet(frame, *args, **kwargs)
+
+        with patch.object(pd.DataFrame, "to_parquet", slow_to_parquet):
+            writer = threading.Thread(target=cache.put, args=("b", "big_table", df))
+            writer.start()
+            assert writing.wait(5)
+            started = time.perf_counter()
+            assert cache.get("a", "big_table") is not None
+            assert time.perf_counter() - started < 1
+            release.set()
+            writer.join()
+        assert cache.get("b", "big_table") is not None
+
+
+class TestRunnersWithCache:
+    @pytest.mark.parametrize(
+        "runner_cls", [SequentialGroupByRunner, ParallelGroupByRunner]
+    )
+    def test_warm_run_skips_database_and_subset(
+        self, runner_cls, tmp_path, mock_engine, df
+    ):
+        cache = ResultCache(tmp_path)
+        runner = runner_cls(
+            mock_engine, "big_table", "dt > 1", result_cache=cache, data_version="v1"
+        )
+        with patch(READ_SQL, return_value=df) as mock_read, patch.object(
+            runner, "create_subset"
+        ) as mock_cs:
+            runner.run([QUERY_A, QUERY_B])
+            assert mock_read.call_count == 2
+            mock_cs.assert_called_once()
+
+            started = time.perf_counter()
+            results = runner.run([QUERY_B, QUERY_A])
+            assert time.perf_counter() - started < 0.5
+            assert mock_read.call_count == 2
+            mock_cs.assert_called_once()
+
+        assert len(results) == 2
+        assert cache.metrics()["hits"] == 2
+
+    def test_only_misses_are_executed(self, mock_engine, df):
+        cache = ResultCache()
+        runner = SequentialGroupByRunner(mock_engine, "big_table", result_cache=cache)
+        with patch(READ_SQL, return_value=df) as mock_read:
+            runner.run([QUERY_A], materialise_subset=False)
+            runner.run([QUERY_A, QUERY_B], materialise_subset=False)
+        assert mock_read.call_count == 2
+
+    def test_new_data_version_misses(self, mock_engine, df):
+        cache = ResultCache()
+        with patch(READ_SQL, return_value=df) as mock_read:
+            for version in ("v1", "v1", "v2"):
+                SequentialGroupByRunner(
+                    mock_engine, "big_table", result_cache=cache, data_version=version
+                ).run([QUERY_A], materialise_subset=False)
+        assert mock_read.call_count == 2
+
+    @pytest.mark.parametrize(
+        "runner_cls", [SequentialGroupByRunner, ParallelGroupByRunner]
+    )
+    def test_uncacheable_result_is_still_returned(
+        self, runner_cls, tmp_path, mock_engine
+    ):
+        duplicate_columns = pd.DataFrame([[1, 2]], columns=["a", "a"])
+        runner = runner_cls(
+            mock_engine, "big_table", result_cache=ResultCache(tmp_path)
+        )
+        with patch(READ_SQL, return_value=duplicate_columns):
+            results = runner.run([QUERY_A], materialise_subset=False)
+        pd.testing.assert_frame_equal(results[0], duplicate_columns)
+        assert runner.result_cache.metrics()["puts"] == 0
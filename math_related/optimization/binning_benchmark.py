@@ -0,0 +1,119 @@
+"""Benchmark optimal_monotone_bins against the forest_minimize search of binning_1.
+
+Synthetic data: x ~ N(0, 1) and a 0/1 target with bad rate rising in x.
+Both methods look for 10 bins of at least 5% with non-decreasing bad rate,
+maximising the same Gini.  The forest_minimize baseline (penalised
+objective over 9 continuous cut variables, as binning_1.py used to do) is
+slow at full size, so it runs on the first --baseline-rows rows only.
+
+Usage (from math_related/optimization):
+    python binning_benchmark.py                       # 1M and 10M rows
+    python binning_benchmark.py --rows 100000 --baseline-calls 50
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parents[2] / "data_related" / "analysis"))
+
+from binning.optimal_bin import optimal_monotone_bins
+
+N_BINS = 10
+MIN_BIN_FRAC = 0.05
+
+
+def make_data(n_rows: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=n_rows)
+    y = (rng.random(n_rows) < 1 / (1 + np.exp(2 - x))).astype(np.int8)
+    return x, y
+
+
+def bins_summary(y: np.ndarray, bounds: np.ndarray) -> tuple[float, int, bool]:
+    """Gini, smallest bin and monotonicity of sorted-row bins [bounds[k], bounds[k+1])."""
+    cum_bad = np.concatenate([[0], np.cumsum(y)])
+    n = np.diff(bounds)
+    bad = np.diff(cum_bad[bounds])
+    good = n - bad
+    gini = np.abs(np.cumsum(bad) / bad.sum() - np.cumsum(good) / good.sum()).sum()
+    rates = bad / np.maximum(n, 1)
+    return float(gini), int(n.min()), bool(np.all(np.diff(rates) >= 0))
+
+
+def forest_search(
+    x: np.ndarray, y: np.ndarray, n_calls: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """The former binning_1 search; returns y sorted by x and the bin bounds."""
+    from skopt import forest_minimize
+
+    order = np.argsort(x, kind="stable")
+    y = y[order]
+    n = len(y)
+    min_bin = int(MIN_BIN_FRAC * n)
+
+    def to_bounds(cut_vars):
+        cuts = np.clip(np.sort((np.array(cut_vars) * (n - 1)).astype(int)), 1, n - 1)
+        return np.concatenate([[0], cuts, [n]])
+
+    def objective(cut_vars):
+        bounds = to_bounds(cut_vars)
+        bins = [np.arange(a, b) for a, b in zip(bounds[:-1], bounds[1:])]
+        penalty = sum(1000 * (min_bin - len(b)) for b in bins if len(b) < min_bin)
+        rates = np.array([y[b].mean() if len(b) > 0 else 0 for b in bins])
+        penalty += 1000 * np.sum(np.clip(-np.diff(rates), 0, None))
+        bad = np.array([y[b].sum() for b in bins])
+        good = np.array([len(b) - y[b].sum() for b in bins])
+        gini = np.sum(np.abs(np.cumsum(bad) / bad.sum() - np.cumsum(good) / good.sum()))
+        return -gini + penalty
+
+    res = forest_minimize(
+        objective,
+        dimensions=[(0.0, 1.0)] * (N_BINS - 1),
+        n_calls=n_calls,
+        random_state=0,
+    )
+    return y, to_bounds(res.x)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--baseline-rows", type=int, default=100_000)
+    parser.add_argument("--baseline-calls", type=int, default=200)
+    args = parser.parse_args()
+
+    for n_rows in args.rows:
+        x, y = make_data(n_rows)
+        start = time.perf_counter()
+        res = optimal_monotone_bins(x, y, n_bins=N_BINS, min_bin_frac=MIN_BIN_FRAC)
+        seconds = time.perf_counter() - start
+        print(
+            f"optimal_monotone_bins {n_rows:>11,d} rows: {seconds:7.2f}s  "
+            f"Gini {res.gini:.4f}  smallest bin {res.counts.min() / n_rows:.3f}  "
+            f"monotone {bool(np.all(np.diff(res.bad_rates) >= 0))}"
+        )
+
+    x, y = make_data(args.baseline_rows)
+    try:
+        start = time.perf_counter()
+        y_sorted, bounds = forest_search(x, y, args.baseline_calls)
+    except ImportError as e:
+        print(f"forest_minimize baseline skipped: {e}")
+        return
+    seconds = time.perf_counter() - start
+    gini, smallest, monotone = bins_summary(y_sorted, bounds)
+    print(
+        f"forest_minimize       {args.baseline_rows:>11,d} rows: {seconds:7.2f}s  "
+        f"Gini {gini:.4f}  smallest bin {smallest / args.baseline_rows:.3f}  "
+        f"monotone {monotone}"
+    )
+    res = optimal_monotone_bins(x, y, n_bins=N_BINS, min_bin_frac=MIN_BIN_FRAC)
+    print(f"optimal_monotone_bins on the same rows: Gini {res.gini:.4f}")
+
+
+if __name__ == "__main__":
+    main()
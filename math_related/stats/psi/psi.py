@@ -1,5 +1,8 @@
 import numpy as np
 
+# Percentage used in place of an empty bucket
+EMPTY_PERCENT = 0.0001
+
 
 def calculate_psi(expected, actual, buckettype="bins", buckets=10, axis=0):
     """Calculate the PSI (population stability index) across all variables
@@ -33,10 +36,9 @@ def calculate_psi(expected, actual, buckettype="bins", buckets=10, axis=0):
         """
 
         def scale_range(input, min, max):
-            input += -(np.min(input))
-            input /= np.max(input) / (max - min)
-            input += min
-            return input
+            input = input - np.min(input)
+            input = input / (np.max(input) / (max - min))
+            return input + min
 
         breakpoints = np.arange(0, buckets + 1) / (buckets) * 100
 
@@ -54,24 +56,7 @@ def calculate_psi(expected, actual, buckettype="bins", buckets=10, axis=0):
         )
         actual_percents = np.histogram(actual_array, breakpoints)[0] / len(actual_array)
 
-        def sub_psi(e_perc, a_perc):
-            """Calculate the actual PSI value from comparing the values.
-            Update the actual value to a very small number if equal to zero
-            """
-            if a_perc == 0:
-                a_perc = 0.0001
-            if e_perc == 0:
-                e_perc = 0.0001
-
-            value = (e_perc - a_perc) * np.log(e_perc / a_perc)
-            return value
-
-        psi_value = np.sum(
-            sub_psi(expected_percents[i], actual_percents[i])
-            for i in range(0, len(expected_percents))
-        )
-
-        return psi_value
+        return _psi_from_percents(expected_percents, actual_percents)
 
     if len(expected.shape) == 1:
         psi_values = np.empty(len(expected.shape))
@@ -87,3 +72,152 @@ def calculate_psi(expected, actual, buckettype="bins", buckets=10, axis=0):
             psi_values[i] = psi(expected[i, :], actual[i, :], buckets)
 
     return psi_values
+
+
+def _as_2d(values):
+    """View 1-D input as a single variable (column) of a 2-D array."""
+    values = np.asarray(values, dtype=float)
+    return values[:, None] if values.ndim == 1 else values
+
+
+def compute_breakpoints(expected, buckettype="bins", buckets=10):
+    """Bucket edges of every variable in one call
+
+    Args:
+       expected: array of original values, variables in columns (1-D for one)
+       buckettype: "bins" for even splits of each variable's range,
+          "quantiles" for quantile buckets
+       buckets: number of buckets per variable
+
+    Returns:
+       edges: ndarray of shape (n_variables, buckets + 1), one row of
+          non-decreasing edges per variable
+    """
+    expected = _as_2d(expected)
+    percents = np.arange(0, buckets + 1) / buckets * 100
+
+    if buckettype == "bins":
+        lows = np.nanmin(expected, axis=0)[:, None]
+        highs = np.nanmax(expected, axis=0)[:, None]
+        # same arithmetic as scale_range in calculate_psi
+        return percents / (100 / (highs - lows)) + lows
+    elif buckettype == "quantiles":
+        return np.nanpercentile(expected, percents, axis=0).T
+    raise ValueError(f"buckettype must be 'bins' or 'quantiles', got {buckettype!r}")
+
+
+def bucket_counts(values, edges):
+    """Count the values of every variable per bucket
+
+    Buckets are [edge_i, edge_i+1) with the last one closed, like
+    np.histogram, except that the outer buckets are open-ended so values
+    outside the expected range are counted in the first / last bucket.
+    Missing values are counted in an extra last column.
+
+    Args:
+       values: array of values, variables in columns (1-D for one)
+       edges: breakpoints from compute_breakpoints
+
+    Returns:
+       counts: int64 ndarray of shape (n_variables, buckets + 1)
+    """
+    values = _as_2d(values)
+    n_variables, n_edges = edges.shape
+    width = n_edges  # buckets + the missing bucket
+    if values.shape[1] != n_variables:
+        raise ValueError(
+            f"values have {values.shape[1]} variables, edges have {n_variables}"
+        )
+
+    # bucket index = number of inner edges <= value, for all variables at
+    # once (same result as searchsorted(..., side="right") per variable)
+    index = np.zeros(values.shape, dtype=np.uint8 if width < 256 else np.intp)
+    for inner_edge in edges[:, 1:-1].T:
+        index += values >= inner_edge
+    index[np.isnan(values)] = width - 1
+
+    counts = np.empty((n_variables, width), dtype=np.int64)
+    for i in range(n_variables):
+        counts[i] = np.bincount(index[:, i], minlength=width)
+    return counts
+
+
+def _psi_from_percents(expected_percents, actual_percents):
+    """Sum of (e - a) * ln(e / a) over the last axis, empty buckets as 0.0001"""
+    expected_percents = np.where(
+        expected_percents == 0, EMPTY_PERCENT, expected_percents
+    )
+    actual_percents = np.where(actual_percents == 0, EMPTY_PERCENT, actual_percents)
+    return np.sum(
+        (expected_percents - actual_percents)
+        * np.log(expected_percents / actual_percents),
+        axis=-1,
+    )
+
+
+def psi_from_counts(expected_counts, actual_counts):
+    """PSI of every variable from bucket counts, as array expressions
+
+    Args:
+       expected_counts: bucket counts of the original population
+       actual_counts: bucket counts of the new population, same shape
+
+    Returns:
+       psi_values: ndarray with one PSI per variable
+    """
+    expected_percents = expected_counts / expected_counts.sum(axis=-1, keepdims=True)
+    actual_percents = actual_counts / actual_counts.sum(axis=-1, keepdims=True)
+    return _psi_from_percents(expected_percents, actual_percents)
+
+
+class PSIAccumulator:
+    """Incremental PSI against fixed breakpoints
+
+    The expected population fixes the breakpoints and its bucket counts;
+    the actual population is fed in chunks, so only its bucket counts are
+    kept in memory. Accumulators over disjoint chunks can be merged.
+
+    Args:
+       expected: array of original values, variables in columns (1-D for one)
+       buckettype: "bins" or "quantiles", see compute_breakpoints
+       buckets: number of buckets per variable
+    """
+
+    def __init__(self, expected, buckettype="bins", buckets=10):
+        self.edges = compute_breakpoints(expected, buckettype, buckets)
+        self.expected_counts = bucket_counts(expected, self.edges)
+        self.actual_counts = np.zeros_like(self.expected_counts)
+
+    def update(self, chunk):
+        """Add a chunk of the actual population (rows of all variables)"""
+        self.actual_counts += bucket_counts(chunk, self.edges)
+        return self
+
+    def merge(self, other):
+        """Add the actual counts of an accumulator with the same breakpoints"""
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("accumulators have different breakpoints")
+        self.actual_counts += other.actual_counts
+        return self
+
+    def psi(self):
+        """PSI of every variable over the chunks seen so far"""
+        return psi_from_counts(self.expected_counts, self.actual_counts)
+
+
+def calculate_psi_chunked(expected, actual_chunks, buckettype="bins", buckets=10):
+    """Vectorized PSI of all variables with the actual data read in chunks
+
+    Args:
+       expected: array of original values, variables in columns (1-D for one)
+       actual_chunks: iterable of arrays of new values, same variables
+       buckettype: "bins" or "quantiles", see compute_breakpoints
+       buckets: number of buckets per variable
+
+    Returns:
+       psi_values: ndarray with one PSI per variable
+    """
+    accumulator = PSIAccumulator(expected, buckettype, buckets)
+    for chunk in actual_chunks:
+        accumulator.update(chunk)
+    return accumulator.psi()
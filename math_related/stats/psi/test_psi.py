@@ -0,0 +1,86 @@
+# %%
+import numpy as np
+from psi import (
+    EMPTY_PERCENT,
+    PSIAccumulator,
+    bucket_counts,
+    calculate_psi,
+    calculate_psi_chunked,
+    compute_breakpoints,
+)
+
+rng = np.random.default_rng(0)
+# range pinned to [-4, 4] where scale_range in calculate_psi gives exact edges,
+# otherwise np.histogram can drop values at the rounded-down top edge
+expected = np.clip(rng.normal(size=(20_000, 4)), -4, 4)
+expected[:2] = [[-4], [4]]
+# shifted and rescaled, clipped into the expected range so np.histogram drops nothing
+actual = np.clip(rng.normal(0.2, 1.3, size=(15_000, 4)), -4, 4)
+
+# %%
+# one variable: same PSI as calculate_psi on in-range data
+for buckettype in ("bins", "quantiles"):
+    for buckets in (5, 10, 20):
+        reference = calculate_psi(expected[:, 0], actual[:, 0], buckettype, buckets)
+        chunked = calculate_psi_chunked(
+            expected[:, 0], np.array_split(actual[:, 0], 7), buckettype, buckets
+        )
+        assert chunked.shape == (1,)
+        assert np.isclose(chunked[0], reference), (buckettype, buckets)
+
+# %%
+# all variables at once: same PSI as calculate_psi column by column
+for buckettype in ("bins", "quantiles"):
+    reference = [
+        calculate_psi(expected[:, i], actual[:, i], buckettype, 10) for i in range(4)
+    ]
+    chunked = calculate_psi_chunked(expected, [actual], buckettype, 10)
+    assert np.allclose(chunked, reference), buckettype
+
+# %%
+# chunking, and merging accumulators, does not change the counts
+whole = PSIAccumulator(expected).update(actual)
+chunks = PSIAccumulator(expected)
+for chunk in np.array_split(actual, 13):
+    chunks.update(chunk)
+left = PSIAccumulator(expected).update(actual[:4_000])
+right = PSIAccumulator(expected).update(actual[4_000:])
+merged = left.merge(right)
+for acc in (chunks, merged):
+    assert np.array_equal(acc.actual_counts, whole.actual_counts)
+    assert np.array_equal(acc.psi(), whole.psi())
+assert whole.actual_counts.sum(axis=1).tolist() == [len(actual)] * 4
+
+try:
+    left.merge(PSIAccumulator(expected, "quantiles"))
+except ValueError:
+    pass
+else:
+    raise AssertionError("merge must reject different breakpoints")
+
+# %%
+# out-of-range values fall into the first / last bucket, NaN into the extra one
+edges = compute_breakpoints(np.array([0.0, 10.0]), "bins", 5)
+assert np.allclose(edges, [[0, 2, 4, 6, 8, 10]])
+values = np.array([-5.0, 0.0, 1.9, 2.0, 10.0, 50.0, np.nan, np.nan])
+counts = bucket_counts(values, edges)
+assert counts.tolist() == [[3, 1, 0, 0, 2, 2]]
+
+# %%
+# NaN-free expected data puts nothing in the missing bucket, so missing
+# actual values add (EMPTY_PERCENT - share) * ln(EMPTY_PERCENT / share)
+x = expected[:, 0]
+with_nan = actual[:, 0].copy()
+with_nan[::10] = np.nan
+acc = PSIAccumulator(x).update(with_nan)
+assert acc.expected_counts[0, -1] == 0
+assert acc.actual_counts[0, -1] == np.isnan(with_nan).sum()
+share = np.isnan(with_nan).mean()
+assert acc.psi()[0] > (EMPTY_PERCENT - share) * np.log(EMPTY_PERCENT / share) > 0
+
+# NaN in expected data is ignored by the breakpoints and counted as missing
+x_nan = x.copy()
+x_nan[::20] = np.nan
+acc = PSIAccumulator(x_nan)
+assert np.all(np.isfinite(acc.edges))
+assert acc.expected_counts[0, -1] == np.isnan(x_nan).sum()
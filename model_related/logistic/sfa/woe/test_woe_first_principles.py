@@ -0,0 +1,99 @@
+# %%
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from woe_first_principles import (
+    WoETransformer,
+    apply_woe,
+    compute_woe_iv,
+    fit_woe_column,
+    quantile_bins,
+)
+
+
+def groupby_woe_iv(binned, target, event=1):
+    """The groupby implementation compute_woe_iv replaced."""
+    df = pd.DataFrame({"bin": binned, "target": target})
+    agg = df.groupby("bin", observed=True)["target"].agg(
+        [
+            ("event", lambda x: (x == event).sum()),
+            ("non_event", lambda x: (x != event).sum()),
+        ]
+    )
+    event_rate = agg["event"] / agg["event"].sum()
+    non_event_rate = agg["non_event"] / agg["non_event"].sum()
+    woe = np.log((event_rate + 1e-9) / (non_event_rate + 1e-9))
+    iv = float(((event_rate - non_event_rate) * woe).sum())
+    return agg.index.tolist(), woe.tolist(), iv
+
+
+rng = np.random.default_rng(0)
+n = 5_000
+age = rng.normal(40, 10, size=n)
+y = rng.binomial(1, 1 / (1 + np.exp(-(-2 + 0.05 * (40 - age)))))
+df = pd.DataFrame(
+    {
+        "age": age,
+        "grade": rng.choice(["A", "B", "C", None], size=n),
+        "opened": pd.Timestamp("2020-01-01")
+        + pd.to_timedelta(rng.integers(0, 1_000, size=n), unit="D"),
+    }
+)
+df["opened_tz"] = df["opened"].dt.tz_localize("Europe/Berlin")
+df.loc[::50, ["age", "opened", "opened_tz"]] = np.nan
+
+# %%
+# compute_woe_iv agrees with the groupby implementation
+for binned in (quantile_bins(df["age"], n_bins=5), df["grade"]):
+    res = compute_woe_iv(binned, y)
+    bins, woe, iv = groupby_woe_iv(binned, y)
+    assert res.bins == bins
+    assert np.allclose(res.woe, woe)
+    assert np.isclose(res.iv, iv)
+
+# apply_woe leaves bins the fit never saw as NaN
+age_bins = quantile_bins(df["age"], n_bins=5)
+res = compute_woe_iv(age_bins, y)
+mapped = apply_woe(age_bins, res)
+assert mapped.isna().equals(age_bins.isna())
+assert np.isnan(apply_woe(pd.Series(["no such bin"]), res)).all()
+
+# %%
+# unseen categories get WoE 0, missing values the missing bin's WoE
+grade = fit_woe_column(df["grade"], y)
+assert sorted(grade.categories) == ["A", "B", "C"]
+out = grade.transform(pd.Series(["A", "Z", None]))
+assert out[0] == grade.woe[grade.categories.index("A")]
+assert out[1] == 0.0
+assert out[2] == grade.woe[-1]
+
+age_column = fit_woe_column(df["age"], y, n_bins=5)
+assert age_column.transform(np.array([np.nan]))[0] == age_column.woe[-1]
+# values beyond the fitted range fall in the outer bins
+outer = age_column.transform(np.array([-1e9, 1e9]))
+assert np.allclose(outer, age_column.woe[[0, -2]])
+
+# %%
+# datetime columns, naive and tz-aware, fit and transform numerically
+transformer = WoETransformer(n_bins=5).fit(df, y)
+scored = transformer.transform(df)
+for column in ("opened", "opened_tz"):
+    fitted = transformer.columns_[column]
+    assert fitted.edges is not None and fitted.categories is None
+    assert len(fitted.woe) == len(fitted.edges) + 2
+    missing = df[column].isna().to_numpy()
+    assert (scored.loc[missing, column] == fitted.woe[-1]).all()
+    assert scored[column].notna().all()
+# the same instants give the same WoE whatever the time zone
+shifted = df.assign(opened_tz=df["opened_tz"].dt.tz_convert("Asia/Tokyo"))
+assert np.array_equal(transformer.transform(shifted)["opened_tz"], scored["opened_tz"])
+
+# %%
+# save / load round-trips the fitted state
+with tempfile.TemporaryDirectory() as tmp:
+    path = transformer.save(Path(tmp) / "woe.json")
+    loaded = WoETransformer.load(path)
+pd.testing.assert_frame_equal(loaded.transform(df), scored)
+pd.testing.assert_series_equal(loaded.iv_, transformer.iv_)
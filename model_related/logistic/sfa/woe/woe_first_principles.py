@@ -2,18 +2,25 @@
 
 - Provides simple quantile-based binning for numeric variables.
 - Computes WoE/IV per bin and applies the transformation.
+- WoETransformer fits many columns at once into compact edges + WoE arrays
+  and scores with searchsorted; its fitted state serialises to JSON.
 - Designed for credit-risk style binary targets (1 = event/bad).
 """
 
 from __future__ import annotations
 
+import json
 import math
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
+EPS = 1e-9
+
 
 @dataclass
 class WoEBinResult:
@@ -25,7 +32,7 @@ class WoEBinResult:
 def quantile_bins(series: pd.Series, n_bins: int = 10) -> pd.Series:
     """Discretize numeric series into quantile bins with duplicates handled."""
     quantiles = np.linspace(0, 1, n_bins + 1)
-    edges = series.dropna().quantile(quantiles).to_numpy()
+    edges = series.dropna().quantile(quantiles).to_numpy(copy=True)
     edges[0], edges[-1] = -np.inf, np.inf
     # Ensure strictly increasing edges
     edges = np.unique(edges)
@@ -35,30 +42,223 @@ def quantile_bins(series: pd.Series, n_bins: int = 10) -> pd.Series:
     return binned
 
 
+def _woe_from_counts(
+    events: np.ndarray, totals: np.ndarray
+) -> Tuple[np.ndarray, float]:
+    """WoE per bin and IV from event and row counts per bin."""
+    non_events = totals - events
+    event_rate = events / max(events.sum(), 1)
+    non_event_rate = non_events / max(non_events.sum(), 1)
+    woe = np.log((event_rate + EPS) / (non_event_rate + EPS))
+    iv = float(((event_rate - non_event_rate) * woe).sum())
+    return woe, iv
+
+
 def compute_woe_iv(
     binned: pd.Series, target: pd.Series, event: int = 1
 ) -> WoEBinResult:
-    df = pd.DataFrame({"bin": binned, "target": target})
-    grouped = df.groupby("bin")
-    agg = grouped["target"].agg(
-        [
-            ("event", lambda x: (x == event).sum()),
-            ("non_event", lambda x: (x != event).sum()),
-        ]
-    )
-    agg["event_rate"] = agg["event"] / agg["event"].sum()
-    agg["non_event_rate"] = agg["non_event"] / agg["non_event"].sum()
-
-    eps = 1e-9
-    agg["woe"] = np.log((agg["event_rate"] + eps) / (agg["non_event_rate"] + eps))
-    agg["iv_component"] = (agg["event_rate"] - agg["non_event_rate"]) * agg["woe"]
-    iv = float(agg["iv_component"].sum())
-    return WoEBinResult(bins=agg.index.tolist(), woe=agg["woe"].tolist(), iv=iv)
+    binned = binned.astype("category")
+    codes = binned.cat.codes.to_numpy()
+    is_event = np.asarray(target) == event
+
+    # rows with a bin, counted per bin code
+    keep = codes >= 0
+    n_bins = len(binned.cat.categories)
+    totals = np.bincount(codes[keep], minlength=n_bins)
+    events = np.bincount(codes[keep], weights=is_event[keep], minlength=n_bins)
+
+    observed = totals > 0
+    woe, iv = _woe_from_counts(events[observed], totals[observed])
+    bins = binned.cat.categories[observed].tolist()
+    return WoEBinResult(bins=bins, woe=woe.tolist(), iv=iv)
 
 
 def apply_woe(series: pd.Series, woe_bins: WoEBinResult) -> pd.Series:
-    mapping = dict(zip(woe_bins.bins, woe_bins.woe))
-    return series.map(mapping)
+    """Map bins to WoE; bins not seen in fitting map to NaN.
+
+    Unlike WoEColumn.transform, which gives unseen categories the neutral
+    WoE 0.0, so that missing WoE values flag bins the fit never saw.
+    """
+    positions = pd.Index(woe_bins.bins).get_indexer(series)
+    woe = np.append(np.asarray(woe_bins.woe, dtype=float), np.nan)
+    return pd.Series(woe[positions], index=series.index, name=series.name)
+
+
+def _as_float(values) -> np.ndarray:
+    """Numeric or datetime values as floats (datetimes in ns since epoch)."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        stamps = pd.Series(values)
+        if stamps.dt.tz is not None:
+            stamps = stamps.dt.tz_convert(None)
+        numeric = stamps.to_numpy("datetime64[ns]").view("int64").astype(float)
+        numeric[stamps.isna().to_numpy()] = np.nan
+        return numeric
+    return np.asarray(values, dtype=float)
+
+
+@dataclass
+class WoEColumn:
+    """Fitted WoE of one column.
+
+    Numeric columns keep their inner bin edges: bin k holds values in
+    (edges[k-1], edges[k]], with open-ended outer bins. Datetime columns are
+    binned the same way on nanoseconds since the epoch. Categorical columns
+    keep their categories instead. woe has one entry per bin plus a last
+    one for missing values; unseen categories get WoE 0.
+    """
+
+    woe: np.ndarray
+    iv: float
+    edges: Optional[np.ndarray] = None
+    categories: Optional[list] = None
+
+    def codes(self, values) -> np.ndarray:
+        """Bin index of every value; missing is the last bin, unseen -1."""
+        if self.edges is not None:
+            values = _as_float(values)
+            codes = np.searchsorted(self.edges, values, side="left")
+            codes[np.isnan(values)] = len(self.woe) - 1
+            return codes
+        codes = pd.Index(self.categories).get_indexer(values)
+        codes[pd.isna(values)] = len(self.woe) - 1
+        return codes
+
+    def transform(self, values) -> np.ndarray:
+        """WoE of every value; unseen categories get 0.0 (apply_woe gives NaN)."""
+        codes = self.codes(values)
+        # unseen categories (-1) pick the appended neutral WoE
+        return np.append(self.woe, 0.0)[codes]
+
+    def to_dict(self) -> dict:
+        state = {"woe": self.woe.tolist(), "iv": self.iv}
+        if self.edges is not None:
+            state["edges"] = self.edges.tolist()
+        else:
+            state["categories"] = list(self.categories)
+        return state
+
+    @classmethod
+    def from_dict(cls, state: dict) -> WoEColumn:
+        edges = state.get("edges")
+        return cls(
+            woe=np.asarray(state["woe"], dtype=float),
+            iv=state["iv"],
+            edges=np.asarray(edges, dtype=float) if edges is not None else None,
+            categories=state.get("categories"),
+        )
+
+
+def fit_woe_column(values, target, n_bins: int = 10, event: int = 1) -> WoEColumn:
+    """Fit WoE for one column: quantile bins if numeric or datetime, else categories.
+
+    Categories must be strings, numbers or booleans so the fitted state can
+    be saved as JSON; convert other values (e.g. periods) first.
+    """
+    is_event = np.asarray(target) == event
+    is_datetime = pd.api.types.is_datetime64_any_dtype(values)
+    if is_datetime or (
+        pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values)
+    ):
+        numeric = _as_float(values)
+        quantiles = np.linspace(0, 1, n_bins + 1)[1:-1]
+        edges = np.unique(np.nanquantile(numeric, quantiles))
+        column = WoEColumn(woe=np.empty(0), iv=0.0, edges=edges[~np.isnan(edges)])
+        n_codes = len(column.edges) + 2
+    else:
+        categories = pd.Index(pd.unique(pd.Series(values).dropna()))
+        unsupported = {
+            type(c).__name__
+            for c in categories.tolist()
+            if not isinstance(c, (str, int, float, bool))
+        }
+        if unsupported:
+            name = getattr(values, "name", None)
+            raise TypeError(
+                f"column {name!r} has values of type {', '.join(sorted(unsupported))}; "
+                "only numeric, datetime, string and boolean columns are supported"
+            )
+        column = WoEColumn(woe=np.empty(0), iv=0.0, categories=categories.tolist())
+        n_codes = len(categories) + 1
+    # woe must be sized before codes() can place missing values
+    column.woe = np.empty(n_codes)
+
+    codes = column.codes(values)
+    totals = np.bincount(codes, minlength=n_codes)
+    events = np.bincount(codes, weights=is_event, minlength=n_codes)
+    column.woe, column.iv = _woe_from_counts(events, totals)
+    return column
+
+
+class WoETransformer:
+    """WoE encoding of many columns with a compact, serialisable state.
+
+    Fitting bins every column (quantile edges for numeric, categories
+    otherwise) and counts events per bin with bincount; transforming is a
+    searchsorted / index lookup per column. Columns can be processed on a
+    thread pool: the NumPy sorting and searching steps release the GIL.
+    """
+
+    def __init__(self, n_bins: int = 10, event: int = 1, n_jobs: int = 1):
+        self.n_bins = n_bins
+        self.event = event
+        self.n_jobs = n_jobs
+        self.columns_: Dict[str, WoEColumn] = {}
+
+    def _map_columns(self, function, columns: List[str]) -> list:
+        if self.n_jobs == 1:
+            return [function(column) for column in columns]
+        with ThreadPoolExecutor(max_workers=self.n_jobs) as pool:
+            return list(pool.map(function, columns))
+
+    def fit(
+        self, X: pd.DataFrame, y, columns: Optional[List[str]] = None
+    ) -> WoETransformer:
+        columns = list(X.columns) if columns is None else list(columns)
+        target = np.asarray(y)
+        fitted = self._map_columns(
+            lambda c: fit_woe_column(X[c], target, self.n_bins, self.event), columns
+        )
+        self.columns_ = dict(zip(columns, fitted))
+        return self
+
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        """WoE values of the fitted columns, same index as X."""
+        columns = list(self.columns_)
+        values = self._map_columns(lambda c: self.columns_[c].transform(X[c]), columns)
+        return pd.DataFrame(dict(zip(columns, values)), index=X.index)
+
+    def fit_transform(self, X: pd.DataFrame, y, **kwargs) -> pd.DataFrame:
+        return self.fit(X, y, **kwargs).transform(X)
+
+    @property
+    def iv_(self) -> pd.Series:
+        """IV per fitted column, highest first."""
+        iv = pd.Series({c: col.iv for c, col in self.columns_.items()}, name="iv")
+        return iv.sort_values(ascending=False)
+
+    def to_dict(self) -> dict:
+        return {
+            "n_bins": self.n_bins,
+            "event": self.event,
+            "columns": {c: col.to_dict() for c, col in self.columns_.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> WoETransformer:
+        transformer = cls(n_bins=state["n_bins"], event=state["event"])
+        transformer.columns_ = {
+            c: WoEColumn.from_dict(col) for c, col in state["columns"].items()
+        }
+        return transformer
+
+    def save(self, path: Path) -> Path:
+        path = Path(path)
+        path.write_text(json.dumps(self.to_dict()))
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> WoETransformer:
+        return cls.from_dict(json.loads(Path(path).read_text()))
 
 
 def demo():
@@ -82,6 +282,10 @@ def demo():
     df["income_woe"] = apply_woe(income_bins, income_res)
     print(df[["age_woe", "income_woe"]].head())
 
+    transformer = WoETransformer(n_bins=5).fit(df[["age", "income"]], df["bad"])
+    print(transformer.iv_)
+    print(transformer.transform(df).head())
+
 
 if __name__ == "__main__":
     demo()
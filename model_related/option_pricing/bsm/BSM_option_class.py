@@ -6,8 +6,8 @@
 #######################################################################
 import numpy as np
 from numpy import log, exp, sqrt
-from scipy import stats
-from typing import Tuple
+from scipy import special, stats
+from typing import Dict, Tuple
 
 import warnings
 
@@ -138,7 +138,7 @@ class BSMOptionValuation:
             * exp(-self.div_yield * self.T)
             * stats.norm.cdf(self._d1)
         )
-        part2 = self.r * self.K * stats.norm.cdf(self._d2)
+        part2 = self.r * self.K * exp(-self.r * self.T) * stats.norm.cdf(self._d2)
         part3 = (
             self.K * exp(-self.r * self.T) * stats.norm.pdf(self._d2) * self.sigma
         ) / (2 * sqrt(self.T))
@@ -668,6 +668,325 @@ class BSMOptionValuation:
             return exp(self.r * self.T) * self.deferred_up_rebate(H=barrier_price)
 
 
+class BSMOptionValuationBatch:
+    """
+    Vectorized Black-Scholes-Merton valuation for a whole option chain.
+
+    Every input may be a scalar or an array; the inputs are broadcast against each other,
+    so e.g. a (n_expiries, 1) T column and a (n_strikes,) K row price the full grid.
+    d1/d2, the discount factors and the normal cdf/pdf terms are computed once in the
+    constructor and shared by the price and greek methods, which return arrays with the
+    broadcast shape and follow the same conventions as BSMOptionValuation.
+    Attributes
+    ==========
+    S0: array_like
+        initial stock/index level
+    K: array_like
+        strike price
+    T: array_like
+        time to maturity (in year fractions)
+    r: array_like
+        constant risk-free short rate
+    sigma: array_like
+        volatility factor in diffusion term
+    div_yield: array_like
+        dividend_yield, default = 0.0
+    """
+
+    def __init__(self, S0, K, T, r, sigma, div_yield=0.0):
+        S0, K, T, r, sigma, div_yield = np.broadcast_arrays(
+            *(np.asarray(x, dtype=np.float64) for x in (S0, K, T, r, sigma, div_yield))
+        )
+        assert np.all(sigma >= 0), "volatility cannot be less than zero"
+        assert np.all(S0 >= 0), "initial stock price cannot be less than zero"
+        assert np.all(T >= 0), "time to maturity cannot be less than zero"
+        assert np.all(div_yield >= 0), "dividend yield cannot be less than zero"
+
+        self.S0 = S0
+        self.K = K
+        self.T = T
+        self.r = r
+        self.sigma = sigma
+        self.div_yield = div_yield
+        self.shape = S0.shape
+
+        self._sqrt_T = sqrt(T)
+        self._sigma_sqrt_T = sigma * self._sqrt_T
+        self._d1 = (log(S0 / K) + (r - div_yield + 0.5 * sigma**2) * T) / (
+            self._sigma_sqrt_T
+        )
+        self._d2 = self._d1 - self._sigma_sqrt_T
+
+        # shared terms, every price and greek below is a cheap combination of these
+        self._disc_q = exp(-div_yield * T)
+        self._disc_r = exp(-r * T)
+        self._cdf_d1 = special.ndtr(self._d1)
+        self._cdf_d2 = special.ndtr(self._d2)
+        self._cdf_neg_d1 = special.ndtr(-self._d1)
+        self._cdf_neg_d2 = special.ndtr(-self._d2)
+        self._pdf_d1 = np.exp(-0.5 * self._d1**2) / sqrt(2 * np.pi)
+        self._pdf_d2 = np.exp(-0.5 * self._d2**2) / sqrt(2 * np.pi)
+
+    @classmethod
+    def from_frame(
+        cls,
+        df,
+        S0: str = "S0",
+        K: str = "K",
+        T: str = "T",
+        r: str = "r",
+        sigma: str = "sigma",
+        div_yield: str = "div_yield",
+    ) -> "BSMOptionValuationBatch":
+        """
+        Build a batch from a DataFrame with one contract per row.
+        The keyword arguments name the columns; a missing div_yield column means zero dividend.
+        """
+        return cls(
+            S0=df[S0].to_numpy(),
+            K=df[K].to_numpy(),
+            T=df[T].to_numpy(),
+            r=df[r].to_numpy(),
+            sigma=df[sigma].to_numpy(),
+            div_yield=df[div_yield].to_numpy() if div_yield in df else 0.0,
+        )
+
+    def call_value(self) -> np.ndarray:
+        """
+        :return: call option values
+        """
+        return (
+            self.S0 * self._disc_q * self._cdf_d1 - self.K * self._disc_r * self._cdf_d2
+        )
+
+    def put_value(self) -> np.ndarray:
+        """
+        :return: put option values
+        """
+        return (
+            self.K * self._disc_r * self._cdf_neg_d2
+            - self.S0 * self._disc_q * self._cdf_neg_d1
+        )
+
+    def delta(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :return: delta_call, delta_put
+        """
+        return self._disc_q * self._cdf_d1, -self._disc_q * self._cdf_neg_d1
+
+    def gamma(self) -> np.ndarray:
+        """
+        :return: gamma of the options (same for call and put)
+        """
+        return self._disc_q * self._pdf_d1 / (self.S0 * self._sigma_sqrt_T)
+
+    def theta(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Annualized theta, same formula as BSMOptionValuation.theta
+        :return: theta_call, theta_put
+        """
+        part1 = self.div_yield * self.S0 * self._disc_q * self._cdf_d1
+        part2 = self.r * self.K * self._disc_r * self._cdf_d2
+        part3 = (self.K * self._disc_r * self._pdf_d2 * self.sigma) / (2 * self._sqrt_T)
+
+        theta_call = part1 - part2 - part3
+        theta_put = (
+            theta_call
+            + self.r * self.K * self._disc_r
+            - self.div_yield * self.S0 * self._disc_q
+        )
+        return theta_call, theta_put
+
+    def vega(self) -> np.ndarray:
+        """
+        :return: vega of the options, per unit (not percentage point) change in volatility
+        """
+        return self.S0 * self._disc_q * self._pdf_d1 * self._sqrt_T
+
+    def rho(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :return: call_rho, put_rho
+        """
+        t_k_disc = self.T * self.K * self._disc_r
+        return t_k_disc * self._cdf_d2, -t_k_disc * self._cdf_neg_d2
+
+    def psi(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :return: call_psi, put_psi
+        """
+        t_s_disc = self.T * self.S0 * self._disc_q
+        return -t_s_disc * self._cdf_d1, t_s_disc * self._cdf_neg_d1
+
+    def greeks(self) -> Dict[str, np.ndarray]:
+        """
+        All prices and greeks in one dict, e.g. to build a DataFrame with pd.DataFrame(batch.greeks())
+        :return: dict of arrays keyed by call_value, put_value, delta_call, delta_put, gamma, ...
+        """
+        delta_call, delta_put = self.delta()
+        theta_call, theta_put = self.theta()
+        rho_call, rho_put = self.rho()
+        psi_call, psi_put = self.psi()
+        return {
+            "call_value": self.call_value(),
+            "put_value": self.put_value(),
+            "delta_call": delta_call,
+            "delta_put": delta_put,
+            "gamma": self.gamma(),
+            "theta_call": theta_call,
+            "theta_put": theta_put,
+            "vega": self.vega(),
+            "rho_call": rho_call,
+            "rho_put": rho_put,
+            "psi_call": psi_call,
+            "psi_put": psi_put,
+        }
+
+    def implied_vol(
+        self,
+        observed_price,
+        option_type="call",
+        num_iterations: int = 100,
+        tolerance: float = 1e-8,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Implied volatility of every contract in the batch, using self.sigma as the starting point.
+        See implied_vol_batch for the solver and the return values.
+        """
+        return implied_vol_batch(
+            observed_price,
+            self.S0,
+            self.K,
+            self.T,
+            self.r,
+            self.div_yield,
+            option_type=option_type,
+            sigma_init=self.sigma,
+            num_iterations=num_iterations,
+            tolerance=tolerance,
+        )
+
+
+def _bsm_price_vega(S0, K, T, r, div_yield, sigma, is_call):
+    sigma_sqrt_T = sigma * sqrt(T)
+    d1 = (log(S0 / K) + (r - div_yield + 0.5 * sigma**2) * T) / sigma_sqrt_T
+    d2 = d1 - sigma_sqrt_T
+    fwd = S0 * exp(-div_yield * T)
+    pv_k = K * exp(-r * T)
+    sign = np.where(is_call, 1.0, -1.0)
+    price = sign * (fwd * special.ndtr(sign * d1) - pv_k * special.ndtr(sign * d2))
+    vega = fwd * np.exp(-0.5 * d1**2) / sqrt(2 * np.pi) * sqrt(T)
+    return price, vega
+
+
+def implied_vol_batch(
+    observed_price,
+    S0,
+    K,
+    T,
+    r,
+    div_yield=0.0,
+    option_type="call",
+    sigma_init=0.2,
+    num_iterations: int = 100,
+    tolerance: float = 1e-8,
+    sigma_max: float = 5.0,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized implied volatility for a whole chain.
+
+    All contracts are iterated in lockstep with a safeguarded Newton-Raphson step: each contract keeps a
+    [lo, hi] volatility bracket around the root, and whenever the Newton step leaves the bracket or vega is
+    too small to trust (deep ITM/OTM quotes) a bisection step is taken instead. Contracts drop out of the
+    working set as soon as they converge, so later iterations only touch the slow ones.
+
+    Quotes outside the no-arbitrage bounds have no implied volatility and are returned as nan, as are quotes
+    above the price at sigma_max, whose implied volatility lies outside the bracket.
+
+    :param observed_price: option prices from the market, array_like
+    :param S0, K, T, r, div_yield: contract inputs, array_like and broadcast against observed_price
+    :param option_type: "call", "put" or an array of them
+    :param sigma_init: starting volatility, scalar or array_like
+    :param num_iterations: maximum no. of iterations
+    :param tolerance: stop once the volatility step is below this level
+    :param sigma_max: upper end of the initial bracket
+    :return: implied_vol, iterations, converged (arrays with the broadcast shape)
+    """
+    is_call = np.asarray(option_type) == "call"
+    assert np.all(
+        is_call | (np.asarray(option_type) == "put")
+    ), "option type must be either call or put"
+
+    arrays = np.broadcast_arrays(
+        *(
+            np.asarray(x, dtype=np.float64)
+            for x in (observed_price, S0, K, T, r, div_yield, sigma_init)
+        ),
+        is_call,
+    )
+    shape = arrays[0].shape
+    price, S0, K, T, r, div_yield, sigma, is_call = (a.ravel() for a in arrays)
+    sigma = sigma.copy()
+
+    # no-arbitrage bounds, prices at sigma -> 0 and sigma -> inf
+    fwd = S0 * exp(-div_yield * T)
+    pv_k = K * exp(-r * T)
+    lower = np.where(is_call, np.maximum(fwd - pv_k, 0.0), np.maximum(pv_k - fwd, 0.0))
+    upper = np.where(is_call, fwd, pv_k)
+
+    lo = np.zeros_like(sigma)
+    hi = np.full_like(sigma, sigma_max)
+    iterations = np.zeros(sigma.shape, dtype=np.int64)
+    converged = np.zeros(sigma.shape, dtype=bool)
+
+    valid = (price > lower) & (price < upper)
+    price_max, _ = _bsm_price_vega(
+        S0[valid],
+        K[valid],
+        T[valid],
+        r[valid],
+        div_yield[valid],
+        hi[valid],
+        is_call[valid],
+    )
+    valid[valid] = price[valid] <= price_max
+    sigma[~valid] = np.nan
+    sigma = np.where(valid & ((sigma <= lo) | (sigma >= hi)), 0.5 * (lo + hi), sigma)
+    active = np.flatnonzero(valid)
+
+    for _ in range(num_iterations):
+        if active.size == 0:
+            break
+
+        s = sigma[active]
+        model_price, vega = _bsm_price_vega(
+            S0[active],
+            K[active],
+            T[active],
+            r[active],
+            div_yield[active],
+            s,
+            is_call[active],
+        )
+        diff = model_price - price[active]
+
+        # price is increasing in sigma, so the sign of diff tells which side of the root we are on
+        hi[active] = np.where(diff > 0, s, hi[active])
+        lo[active] = np.where(diff < 0, s, lo[active])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            s_new = s - diff / vega
+        use_bisection = ~((s_new > lo[active]) & (s_new < hi[active])) | (vega < 1e-12)
+        s_new = np.where(use_bisection, 0.5 * (lo[active] + hi[active]), s_new)
+
+        done = (np.abs(s_new - s) <= tolerance) | (diff == 0)
+        sigma[active] = np.where(diff == 0, s, s_new)
+        iterations[active] += 1
+        converged[active] = done
+        active = active[~done]
+
+    return sigma.reshape(shape), iterations.reshape(shape), converged.reshape(shape)
+
+
 class GarmanKohlhagenForex(BSMOptionValuation):
     """
     Valuation of European call options in Black-Scholes-Merton Model (for forex)
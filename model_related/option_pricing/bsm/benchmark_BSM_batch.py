@@ -0,0 +1,79 @@
+"""Benchmark BSMOptionValuationBatch against one BSMOptionValuation per contract.
+
+The scalar path builds one object per contract and calls every price/greek method on it,
+which is what a per-contract revaluation loop does today. For the large sizes the scalar
+path is timed on the first ``scalar_cap`` contracts and extrapolated linearly.
+
+Run:
+    python benchmark_BSM_batch.py
+"""
+
+import time
+
+import numpy as np
+
+from BSM_option_class import BSMOptionValuation, BSMOptionValuationBatch
+
+
+def make_chain(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    S0 = np.full(n, 100.0)
+    K = rng.uniform(50.0, 150.0, n)
+    T = rng.uniform(0.05, 2.0, n)
+    r = np.full(n, 0.03)
+    sigma = rng.uniform(0.1, 0.6, n)
+    div_yield = np.full(n, 0.01)
+    return S0, K, T, r, sigma, div_yield
+
+
+def scalar_path(S0, K, T, r, sigma, div_yield):
+    out = []
+    for args in zip(S0, K, T, r, sigma, div_yield):
+        bsm = BSMOptionValuation(*args)
+        out.append(
+            (
+                bsm.call_value(),
+                bsm.put_value(),
+                bsm.delta(),
+                bsm.gamma(),
+                bsm.theta(),
+                bsm.vega(),
+                bsm.rho(),
+                bsm.psi(),
+            )
+        )
+    return out
+
+
+def batch_path(S0, K, T, r, sigma, div_yield):
+    return BSMOptionValuationBatch(S0, K, T, r, sigma, div_yield).greeks()
+
+
+def bench(fn, *args, repeat: int = 3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(sizes=(1_000, 100_000, 1_000_000), scalar_cap: int = 2_000):
+    print("Benchmark results (best of 3, seconds):")
+    for n in sizes:
+        chain = make_chain(n)
+
+        n_scalar = min(n, scalar_cap)
+        t_scalar = bench(scalar_path, *(x[:n_scalar] for x in chain), repeat=1)
+        t_scalar *= n / n_scalar
+        t_batch = bench(batch_path, *chain)
+
+        note = " (extrapolated)" if n_scalar < n else ""
+        print(
+            f"n={n:>9,d} scalar: {t_scalar:9.4f}s{note:15s} batch: {t_batch:.4f}s"
+            f"  speedup: {t_scalar / t_batch:,.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+# -*- coding:utf-8 -*-
+"""
+Portfolio risk engine on top of BSMOptionValuationBatch.
+
+Instead of one BSMOptionValuation per position and one call per greek, PortfolioRiskEngine
+- evaluates the price and all greeks of every position in one vectorized pass,
+- caches the results keyed on the market state (spot and volatility per underlying),
+- on a spot or vol bump only revalues the positions whose inputs changed,
+- builds spot x vol scenario ladders as a single broadcast (positions, spots, vols) computation.
+
+positions is a DataFrame with one row per position and the columns
+    underlying, option_type (call/put), K, T, quantity
+and optionally r, div_yield and sigma (position-level volatility, e.g. from a surface).
+
+Without a vol per underlying the engine prices off the sigma column, and vol inputs to revalue and bump
+are shifts per underlying added to it, so surface and per-position vols get the same vol bumps and
+cached vol scenarios.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from BSM_option_class import BSMOptionValuationBatch
+
+GREEKS = ("value", "delta", "gamma", "theta", "vega", "rho", "psi")
+
+
+def position_greeks(
+    S0, K, T, r, sigma, div_yield, is_call: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """Per unit price and greeks, picking the call or put side of every contract."""
+    greeks = BSMOptionValuationBatch(S0, K, T, r, sigma, div_yield).greeks()
+    out = {
+        "value": np.where(is_call, greeks["call_value"], greeks["put_value"]),
+        "gamma": greeks["gamma"],
+        "vega": greeks["vega"],
+    }
+    for name in ("delta", "theta", "rho", "psi"):
+        out[name] = np.where(is_call, greeks[f"{name}_call"], greeks[f"{name}_put"])
+    return out
+
+
+class PortfolioRiskEngine:
+    def __init__(
+        self,
+        positions: pd.DataFrame,
+        spot: Union[float, Dict[str, float]],
+        vol: Union[float, Dict[str, float], None] = None,
+        cache_size: int = 64,
+    ):
+        """
+        :param positions: one row per position, see module docstring
+        :param spot: spot price, scalar or dict keyed by underlying
+        :param vol: volatility, scalar or dict keyed by underlying; None uses the positions' sigma column,
+            and self.vol then holds the vol shift per underlying (initially 0)
+        :param cache_size: no. of market states kept in the greeks cache
+        """
+        assert set(positions["option_type"]) <= {
+            "call",
+            "put",
+        }, "option type must be either call or put"
+        assert vol is not None or "sigma" in positions, "need vol or a sigma column"
+
+        self.positions = positions.reset_index(drop=True)
+        self.underlying = self.positions["underlying"].to_numpy()
+        self.K = self.positions["K"].to_numpy(dtype=np.float64)
+        self.T = self.positions["T"].to_numpy(dtype=np.float64)
+        self.quantity = self.positions["quantity"].to_numpy(dtype=np.float64)
+        self.r = self._column("r", 0.0)
+        self.div_yield = self._column("div_yield", 0.0)
+        self.is_call = (self.positions["option_type"] == "call").to_numpy()
+        self.position_sigma = self._column("sigma", np.nan)
+
+        self.spot = self._by_underlying(spot)
+        self.sigma_column = vol is None
+        self.vol = self._by_underlying(0.0 if vol is None else vol)
+
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.last_recomputed = 0
+
+        self._S0, self._sigma = self._market_inputs(self.spot, self.vol)
+        self._greeks = position_greeks(
+            self._S0, self.K, self.T, self.r, self._sigma, self.div_yield, self.is_call
+        )
+        self.last_recomputed = len(self.positions)
+        self._store(self._state_key(self.spot, self.vol), self._greeks)
+
+    def _column(self, name: str, default: float) -> np.ndarray:
+        if name in self.positions:
+            return self.positions[name].to_numpy(dtype=np.float64)
+        return np.full(len(self.positions), default)
+
+    def _by_underlying(self, value) -> Dict[str, float]:
+        if isinstance(value, dict):
+            missing = set(self.underlying) - set(value)
+            assert not missing, f"no market data for {sorted(missing)}"
+            return {k: float(v) for k, v in value.items()}
+        return {k: float(value) for k in pd.unique(self.underlying)}
+
+    def _market_inputs(self, spot: Dict[str, float], vol: Dict[str, float]):
+        S0 = pd.Series(self.underlying).map(spot).to_numpy(dtype=np.float64)
+        sigma = pd.Series(self.underlying).map(vol).to_numpy(dtype=np.float64)
+        if self.sigma_column:
+            # vol holds shifts on top of the positions' own sigma
+            sigma = self.position_sigma + sigma
+        return S0, sigma
+
+    @staticmethod
+    def _state_key(spot: Dict[str, float], vol: Dict[str, float]) -> tuple:
+        return tuple(sorted(spot.items())), tuple(sorted(vol.items()))
+
+    def _store(self, key: tuple, greeks: Dict[str, np.ndarray]) -> None:
+        self._cache[key] = greeks
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def revalue(
+        self,
+        spot: Union[float, Dict[str, float], None] = None,
+        vol: Union[float, Dict[str, float], None] = None,
+    ) -> pd.DataFrame:
+        """
+        Move to a new market state and return the position greeks.
+        Only the given underlyings change; positions whose spot and vol are unchanged are not recomputed.
+
+        :param spot: new spot, scalar (all underlyings) or dict for some underlyings
+        :param vol: new vol, scalar (all underlyings) or dict for some underlyings; with a sigma column
+            the vol shift added to the positions' sigma
+        """
+        new_spot = dict(self.spot)
+        if spot is not None:
+            new_spot.update(
+                spot if isinstance(spot, dict) else self._by_underlying(spot)
+            )
+        new_vol = dict(self.vol)
+        if vol is not None:
+            new_vol.update(vol if isinstance(vol, dict) else self._by_underlying(vol))
+
+        key = self._state_key(new_spot, new_vol)
+        S0, sigma = self._market_inputs(new_spot, new_vol)
+
+        if key in self._cache:
+            self.cache_hits += 1
+            self._cache.move_to_end(key)
+            self._greeks = self._cache[key]
+            self.last_recomputed = 0
+        else:
+            self.cache_misses += 1
+            changed = np.flatnonzero((S0 != self._S0) | (sigma != self._sigma))
+            greeks = {name: values.copy() for name, values in self._greeks.items()}
+            if changed.size:
+                updated = position_greeks(
+                    S0[changed],
+                    self.K[changed],
+                    self.T[changed],
+                    self.r[changed],
+                    sigma[changed],
+                    self.div_yield[changed],
+                    self.is_call[changed],
+                )
+                for name in GREEKS:
+                    greeks[name][changed] = updated[name]
+            self._greeks = greeks
+            self.last_recomputed = changed.size
+            self._store(key, greeks)
+
+        self.spot, self.vol = new_spot, new_vol
+        self._S0, self._sigma = S0, sigma
+        return self.position_greeks()
+
+    def bump(
+        self,
+        spot_shift: float = 0.0,
+        vol_shift: float = 0.0,
+        underlying: Optional[str] = None,
+        relative_spot: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Bump spot (relative, e.g. 0.01 = +1%, or absolute) and vol (absolute) of one or all underlyings.
+        With a sigma column the vol bump shifts the sigma of every position on the bumped underlyings.
+        """
+        names = list(self.spot) if underlying is None else [underlying]
+        spot = {
+            k: (
+                self.spot[k] * (1 + spot_shift)
+                if relative_spot
+                else self.spot[k] + spot_shift
+            )
+            for k in names
+        }
+        vol = {k: self.vol[k] + vol_shift for k in names} if vol_shift else None
+        return self.revalue(spot=spot, vol=vol)
+
+    def position_greeks(self) -> pd.DataFrame:
+        """Per unit price and greeks of every position, plus quantity-weighted value and greeks."""
+        out = self.positions.copy()
+        out["S0"] = self._S0
+        out["sigma"] = self._sigma
+        for name in GREEKS:
+            out[name] = self._greeks[name]
+            out[f"position_{name}"] = self._greeks[name] * self.quantity
+        return out
+
+    def portfolio_greeks(self) -> pd.DataFrame:
+        """Quantity-weighted value and greeks aggregated by underlying."""
+        columns = [f"position_{name}" for name in GREEKS]
+        return self.position_greeks().groupby("underlying")[columns].sum()
+
+    def scenario_ladder(
+        self,
+        spot_shocks,
+        vol_shocks,
+        relative_spot: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Portfolio P&L on a spot x vol grid, every underlying shocked together, computed as one
+        (positions, spot_shocks, vol_shocks) broadcast.
+
+        :param spot_shocks: relative (e.g. -0.1 = -10%) or absolute spot shocks
+        :param vol_shocks: absolute vol shocks, e.g. 0.05 = +5 vol points
+        :return: P&L DataFrame, index spot shocks, columns vol shocks
+        """
+        spot_shocks = np.asarray(spot_shocks, dtype=np.float64)
+        vol_shocks = np.asarray(vol_shocks, dtype=np.float64)
+
+        S0 = self._S0[:, None, None]
+        if relative_spot:
+            S0 = S0 * (1 + spot_shocks[None, :, None])
+        else:
+            S0 = S0 + spot_shocks[None, :, None]
+        sigma = np.maximum(self._sigma[:, None, None] + vol_shocks[None, None, :], 0.0)
+
+        expand = (slice(None), None, None)
+        values = position_greeks(
+            S0,
+            self.K[expand],
+            self.T[expand],
+            self.r[expand],
+            sigma,
+            self.div_yield[expand],
+            self.is_call[expand],
+        )["value"]
+        pnl = np.einsum(
+            "i,ijk->jk", self.quantity, values - self._greeks["value"][expand]
+        )
+        return pd.DataFrame(
+            pnl,
+            index=pd.Index(spot_shocks, name="spot_shock"),
+            columns=pd.Index(vol_shocks, name="vol_shock"),
+        )
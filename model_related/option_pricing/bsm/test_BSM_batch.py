@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+from BSM_option_class import (
+    BSMOptionValuation,
+    BSMOptionValuationBatch,
+    implied_vol_batch,
+)
+
+
+def _chain():
+    K = np.array([30.0, 40.0, 50.0])
+    T = np.array([[0.25], [1.0]])
+    return 40.0, K, T, 0.05, 0.3, 0.01
+
+
+def test_batch_matches_scalar_prices_and_greeks():
+    S0, K, T, r, sigma, q = _chain()
+    batch = BSMOptionValuationBatch(S0, K, T, r, sigma, q)
+    assert batch.shape == (2, 3)
+
+    for i in range(2):
+        for j in range(3):
+            bsm = BSMOptionValuation(S0, K[j], T[i, 0], r, sigma, q)
+            assert np.isclose(batch.call_value()[i, j], bsm.call_value())
+            assert np.isclose(batch.put_value()[i, j], bsm.put_value())
+            assert np.allclose([g[i, j] for g in batch.delta()], bsm.delta())
+            assert np.isclose(batch.gamma()[i, j], bsm.gamma())
+            assert np.allclose([g[i, j] for g in batch.theta()], bsm.theta())
+            assert np.isclose(batch.vega()[i, j], bsm.vega())
+            assert np.allclose([g[i, j] for g in batch.rho()], bsm.rho())
+            assert np.allclose([g[i, j] for g in batch.psi()], bsm.psi())
+
+
+def test_theta_matches_finite_difference():
+    S0, K, T, r, sigma, q = _chain()
+    h = 1e-5
+    batch = BSMOptionValuationBatch(S0, K, T, r, sigma, q)
+    shorter = BSMOptionValuationBatch(S0, K, T - h, r, sigma, q)
+    longer = BSMOptionValuationBatch(S0, K, T + h, r, sigma, q)
+    # theta is the change with calendar time, i.e. minus d/dT
+    fd_call = -(longer.call_value() - shorter.call_value()) / (2 * h)
+    fd_put = -(longer.put_value() - shorter.put_value()) / (2 * h)
+    theta_call, theta_put = batch.theta()
+    assert np.allclose(theta_call, fd_call, atol=1e-6)
+    assert np.allclose(theta_put, fd_put, atol=1e-6)
+
+    call, put = BSMOptionValuation(100.0, 100.0, 1.0, 0.05, 0.2).theta()
+    assert np.isclose(call, -6.414, atol=1e-3)
+    assert np.isclose(put, -1.658, atol=1e-3)
+
+
+def test_from_frame_and_greeks_dict():
+    df = pd.DataFrame(
+        {
+            "S0": [40.0, 40.0],
+            "K": [35.0, 45.0],
+            "T": [0.5, 0.5],
+            "r": 0.05,
+            "sigma": 0.2,
+        }
+    )
+    greeks = pd.DataFrame(BSMOptionValuationBatch.from_frame(df).greeks())
+
+    assert len(greeks) == 2
+    expected = BSMOptionValuation(40.0, 45.0, 0.5, 0.05, 0.2).call_value()
+    assert np.isclose(greeks.loc[1, "call_value"], expected)
+
+
+def test_implied_vol_batch_recovers_sigma_across_the_surface():
+    K = np.array([10.0, 30.0, 40.0, 55.0, 120.0])
+    T = np.array([[0.05], [0.5], [3.0]])
+    sigma = np.array([[0.15], [0.35], [0.8]])
+    batch = BSMOptionValuationBatch(40.0, K, T, 0.05, sigma, 0.01)
+    option_type = np.where(K < 40.0, "put", "call")
+    prices = np.where(option_type == "call", batch.call_value(), batch.put_value())
+    quoted = prices > 1e-6
+
+    iv, iterations, converged = implied_vol_batch(
+        prices, 40.0, K, T, 0.05, 0.01, option_type=option_type
+    )
+
+    assert iv.shape == iterations.shape == converged.shape == (3, 5)
+    assert converged[quoted].all()
+    assert np.allclose(iv[quoted], np.broadcast_to(sigma, iv.shape)[quoted], atol=1e-6)
+    assert iterations.max() <= 100
+
+
+def test_implied_vol_batch_flags_arbitrage_violating_quotes():
+    # call below intrinsic value and call above the spot price
+    iv, iterations, converged = implied_vol_batch(
+        [5.0, 45.0, 3.0], 40.0, [30.0, 40.0, 40.0], 1.0, 0.0
+    )
+
+    assert np.isnan(iv[:2]).all() and not converged[:2].any()
+    assert (iterations[:2] == 0).all()
+    assert converged[2]
+    assert np.isclose(BSMOptionValuation(40.0, 40.0, 1.0, 0.0, iv[2]).call_value(), 3.0)
+
+
+def test_implied_vol_batch_flags_quotes_above_the_bracket():
+    # true vol of 7 is above sigma_max=5; a vol of 4 is still inside
+    prices = [
+        BSMOptionValuation(100.0, 100.0, 1.0, 0.05, sigma).call_value()
+        for sigma in (7.0, 4.0)
+    ]
+    iv, iterations, converged = implied_vol_batch(prices, 100.0, 100.0, 1.0, 0.05)
+
+    assert np.isnan(iv[0]) and not converged[0] and iterations[0] == 0
+    assert converged[1] and np.isclose(iv[1], 4.0, atol=1e-6)
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+from BSM_option_class import BSMOptionValuation
+from risk_engine import PortfolioRiskEngine
+
+
+def _positions():
+    return pd.DataFrame(
+        {
+            "underlying": ["AAA", "AAA", "BBB", "BBB"],
+            "option_type": ["call", "put", "call", "put"],
+            "K": [95.0, 100.0, 48.0, 55.0],
+            "T": [0.5, 1.0, 0.25, 0.75],
+            "quantity": [10.0, -5.0, 20.0, 7.0],
+            "r": 0.03,
+            "div_yield": 0.01,
+        }
+    )
+
+
+def test_position_greeks_match_scalar_bsm():
+    engine = PortfolioRiskEngine(
+        _positions(), spot={"AAA": 100.0, "BBB": 50.0}, vol={"AAA": 0.2, "BBB": 0.3}
+    )
+    greeks = engine.position_greeks()
+    for _, row in greeks.iterrows():
+        bsm = BSMOptionValuation(
+            row.S0, row.K, row["T"], row.r, row.sigma, row.div_yield
+        )
+        side = 0 if row.option_type == "call" else 1
+        value = bsm.call_value() if side == 0 else bsm.put_value()
+        assert np.isclose(row.value, value)
+        assert np.isclose(row.delta, bsm.delta()[side])
+        assert np.isclose(row.gamma, bsm.gamma())
+        assert np.isclose(row.theta, bsm.theta()[side])
+        assert np.isclose(row.vega, bsm.vega())
+        assert np.isclose(row.position_value, value * row.quantity)
+
+    portfolio = engine.portfolio_greeks()
+    assert np.isclose(portfolio["position_delta"].sum(), greeks["position_delta"].sum())
+
+
+def test_bump_recomputes_changed_positions_and_caches_states():
+    engine = PortfolioRiskEngine(
+        _positions(), spot={"AAA": 100.0, "BBB": 50.0}, vol={"AAA": 0.2, "BBB": 0.3}
+    )
+    base = engine.position_greeks()
+
+    bumped = engine.bump(spot_shift=0.01, underlying="AAA")
+    assert engine.last_recomputed == 2
+    assert np.allclose(bumped["value"][2:], base["value"][2:])
+    fresh = PortfolioRiskEngine(
+        _positions(), spot={"AAA": 101.0, "BBB": 50.0}, vol={"AAA": 0.2, "BBB": 0.3}
+    )
+    assert np.allclose(bumped["value"], fresh.position_greeks()["value"])
+
+    engine.bump(vol_shift=0.05, underlying="BBB")
+    assert engine.last_recomputed == 2
+
+    back = engine.revalue(spot={"AAA": 100.0}, vol={"BBB": 0.3})
+    assert engine.last_recomputed == 0
+    assert engine.cache_hits == 1
+    assert np.allclose(back["value"], base["value"])
+
+
+def test_scenario_ladder_matches_full_revaluation():
+    positions = _positions()
+    positions["sigma"] = [0.2, 0.22, 0.3, 0.28]
+    engine = PortfolioRiskEngine(positions, spot={"AAA": 100.0, "BBB": 50.0})
+    spot_shocks = [-0.1, 0.0, 0.1]
+    vol_shocks = [-0.05, 0.0, 0.05]
+    ladder = engine.scenario_ladder(spot_shocks, vol_shocks)
+    assert ladder.shape == (3, 3)
+    assert np.isclose(ladder.loc[0.0, 0.0], 0.0)
+
+    base_value = engine.position_greeks()["position_value"].sum()
+    shocked = positions.copy()
+    shocked["sigma"] = shocked["sigma"] + 0.05
+    revalued = PortfolioRiskEngine(shocked, spot={"AAA": 90.0, "BBB": 45.0})
+    expected = revalued.position_greeks()["position_value"].sum() - base_value
+    assert np.isclose(ladder.loc[-0.1, 0.05], expected)
+
+
+def _sigma_positions():
+    positions = _positions()
+    positions["sigma"] = [0.2, 0.22, 0.3, 0.28]
+    return positions
+
+
+def test_partial_vol_revalue_with_sigma_column():
+    engine = PortfolioRiskEngine(_sigma_positions(), spot={"AAA": 100.0, "BBB": 50.0})
+    base = engine.position_greeks()
+
+    moved = engine.revalue(vol={"AAA": 0.05})
+    assert engine.last_recomputed == 2
+    assert np.allclose(moved["sigma"], [0.25, 0.27, 0.3, 0.28])
+    assert np.allclose(moved["value"][2:], base["value"][2:])
+
+    shifted = _sigma_positions()
+    shifted.loc[:1, "sigma"] += 0.05
+    fresh = PortfolioRiskEngine(shifted, spot={"AAA": 100.0, "BBB": 50.0})
+    assert np.allclose(moved["value"], fresh.position_greeks()["value"])
+
+
+def test_vol_bump_with_sigma_column_caches_states():
+    engine = PortfolioRiskEngine(_sigma_positions(), spot={"AAA": 100.0, "BBB": 50.0})
+    base = engine.position_greeks()
+
+    bumped = engine.bump(vol_shift=0.01, underlying="BBB")
+    assert engine.last_recomputed == 2
+    assert np.allclose(bumped["sigma"], [0.2, 0.22, 0.31, 0.29])
+    assert np.all(bumped["value"][2:] > base["value"][2:])
+
+    engine.bump(vol_shift=-0.01, underlying="BBB")
+    assert engine.last_recomputed == 0
+    assert engine.cache_hits == 1
+    assert np.allclose(engine.position_greeks()["value"], base["value"])
@@ -0,0 +1,120 @@
+# -*- coding:utf-8 -*-
+"""
+Longstaff-Schwartz least-squares Monte Carlo for American options.
+
+Compared with a np.polyfit/np.polyval call per time step and dense (rounds, slices) stopping and intrinsic
+value matrices, the engine here
+- builds the regression basis (power or weighted Laguerre polynomials) once per time step and solves the
+  least-squares problem through the normal equations (or a QR decomposition),
+- tracks one exercise-time index and one discounted cash flow per path instead of a stopping matrix,
+- prices several strikes against the same simulated paths, reusing the basis of every time step.
+"""
+
+from typing import Tuple
+
+import numpy as np
+from scipy.linalg import solve_triangular
+
+
+def regression_basis(x: np.ndarray, poly_degree: int, basis: str) -> np.ndarray:
+    """
+    :param x: normalised state, e.g. price / S0
+    :param basis: power (1, x, x^2, ...) or laguerre (exp(-x/2) L_n(x), as in Longstaff and Schwartz 2001)
+    :return: design matrix with shape (len(x), poly_degree + 1)
+    """
+    assert (
+        basis == "power" or basis == "laguerre"
+    ), "basis must be either power or laguerre"
+    if basis == "power":
+        return np.vander(x, poly_degree + 1, increasing=True)
+    return np.exp(-0.5 * x)[:, None] * np.polynomial.laguerre.lagvander(x, poly_degree)
+
+
+def least_squares(X: np.ndarray, y: np.ndarray, solver: str = "normal") -> np.ndarray:
+    """
+    :param solver: normal (solve X'X b = X'y, fastest) or qr (better conditioned)
+    :return: regression coefficients
+    """
+    assert solver == "normal" or solver == "qr", "solver must be either normal or qr"
+    if solver == "normal":
+        try:
+            return np.linalg.solve(X.T @ X, X.T @ y)
+        except np.linalg.LinAlgError:
+            return np.linalg.lstsq(X, y, rcond=None)[0]
+
+    q, r = np.linalg.qr(X)
+    return solve_triangular(r, q.T @ y)
+
+
+def longstaff_schwartz(
+    price_array: np.ndarray,
+    strikes,
+    discount_table: np.ndarray,
+    option_type: str = "put",
+    poly_degree: int = 2,
+    basis: str = "laguerre",
+    solver: str = "normal",
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Price American options on simulated paths, exercise is allowed on slices 1 .. no_of_slices - 1.
+
+    :param price_array: simulated prices, shape (simulation_rounds, no_of_slices), slice 0 is today
+    :param strikes: one strike or an array of strikes priced on the same paths
+    :param discount_table: discount factor from each slice to today, shape (no_of_slices,) for a deterministic
+        rate or (simulation_rounds, no_of_slices) for stochastic rates
+    :param option_type: call or put
+    :param poly_degree: highest degree of the regression basis
+    :param basis: power or laguerre
+    :param solver: normal or qr
+    :return: option value per strike, exercise slice per strike and path (-1 if never exercised)
+    """
+    assert (
+        option_type == "call" or option_type == "put"
+    ), "option_type must be either call or put"
+    sign = 1.0 if option_type == "call" else -1.0
+    strikes = np.atleast_1d(np.asarray(strikes, dtype=np.float64))
+    n_paths, n_slices = price_array.shape
+    discount_table = np.broadcast_to(discount_table, price_array.shape)
+    min_itm_paths = max(5, poly_degree + 1)
+
+    # per strike and path: cash flow at the exercise slice and the discount factor of that slice
+    cash_flow = np.maximum(sign * (price_array[:, -1] - strikes[:, None]), 0.0)
+    cash_flow_discount = np.tile(discount_table[:, -1], (len(strikes), 1))
+    exercise_index = np.where(cash_flow > 0, n_slices - 1, -1)
+
+    scale = price_array[:, 0].mean()
+    # in-the-money sets are nested across strikes, so the basis is only built on the paths that are
+    # in the money for the deepest strike and shared by all the others
+    deepest_strike = strikes.min() if option_type == "call" else strikes.max()
+    for t in range(n_slices - 2, 0, -1):
+        s_t = price_array[:, t]
+        candidates = np.flatnonzero(sign * (s_t - deepest_strike) > 0)
+        s_candidates = s_t[candidates]
+        design = regression_basis(s_candidates / scale, poly_degree, basis)
+
+        for j, strike in enumerate(strikes):
+            intrinsic_val = np.maximum(sign * (s_candidates - strike), 0.0)
+            # only in-the-money paths are relevant for the exercise decision
+            in_the_money = intrinsic_val > 0
+            itm_path = candidates[in_the_money]
+            if len(itm_path) <= min_itm_paths:
+                continue
+            intrinsic_val = intrinsic_val[in_the_money]
+            itm_design = design[in_the_money]
+
+            # realised cash flow from following the current policy, discounted back to slice t
+            y = (
+                cash_flow[j, itm_path]
+                * cash_flow_discount[j, itm_path]
+                / discount_table[itm_path, t]
+            )
+            hold_val = itm_design @ least_squares(itm_design, y, solver=solver)
+
+            exercise = intrinsic_val > hold_val
+            cash_flow[j, itm_path[exercise]] = intrinsic_val[exercise]
+            exercise = itm_path[exercise]
+            cash_flow_discount[j, exercise] = discount_table[exercise, t]
+            exercise_index[j, exercise] = t
+
+    values = np.mean(cash_flow * cash_flow_discount, axis=1)
+    return values, exercise_index
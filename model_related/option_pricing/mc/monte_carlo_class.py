@@ -9,6 +9,8 @@ import numpy as np
 import scipy.stats as sts
 from typing import Tuple
 
+from longstaff_schwartz import longstaff_schwartz
+
 
 class MonteCarloOptionPricing:
     def __init__(
@@ -385,74 +387,52 @@ class MonteCarloOptionPricing:
         return self.expectation
 
     def american_option_longstaff_schwartz(
-        self, poly_degree: int = 2, option_type: str = "call"
-    ) -> float:
+        self,
+        poly_degree: int = 2,
+        option_type: str = "call",
+        basis: str = "power",
+        solver: str = "normal",
+        strikes=None,
+    ) -> float or np.ndarray:
         """
         American option, Longstaff and Schwartz method
 
         :param poly_degree: x^n, default = 2
         :param option_type: call or put
+        :param basis: regression basis, power or laguerre
+        :param solver: least-squares solver, normal or qr
+        :param strikes: optional array of strikes priced on the same simulated paths, default self.K
+        :return: option value, or an array of values when strikes is given
         """
         assert (
             option_type == "call" or option_type == "put"
         ), "option_type must be either call or put"
         assert len(self.terminal_prices) != 0, "Please simulate the stock price first"
 
-        if option_type == "call":
-            self.intrinsic_val = np.maximum((self.price_array - self.K), 0.0)
-        elif option_type == "put":
-            self.intrinsic_val = np.maximum((self.K - self.price_array), 0.0)
-
-        # last day cashflow == last day intrinsic value
-        cf = self.intrinsic_val[:, -1]
-
-        stopping_rule = np.zeros_like(self.price_array)
-        stopping_rule[:, -1] = np.where(self.intrinsic_val[:, -1] > 0, 1, 0)
-
-        # Longstaff and Schwartz iteration
-        for t in range(
-            self.no_of_slices - 2, 0, -1
-        ):  # fill out the value table from backwards
-            # find out in-the-money path to better estimate the conditional expectation function
-            # where exercise is relevant and significantly improves the efficiency of the algorithm
-            itm_path = np.where(
-                self.intrinsic_val[:, t] > 0
-            )  # <==> self.price_array[:, t] vs. self.K
-
-            cf = cf * np.exp(-self.r[:, t + 1])
-            Y = cf[itm_path]
-            X = self.price_array[itm_path, t]
-
-            # initialize continuation value
-            hold_val = np.zeros(shape=self.simulation_rounds)
-            # if there is only 5 in-the-money paths (most likely appear in out-of-the-money options
-            # then simply assume that value of holding = 0.
-            # otherwise, run regression and compute conditional expectation E[Y|X].
-            if len(itm_path) > 5:
-                rg = np.polyfit(x=X[0], y=Y, deg=poly_degree)  # regression fitting
-                hold_val[itm_path] = np.polyval(
-                    p=rg, x=X[0]
-                )  # conditional expectation E[Y|X]
-
-            # 1 <==> exercise, 0 <==> hold
-            stopping_rule[:, t] = np.where(self.intrinsic_val[:, t] > hold_val, 1, 0)
-            # if exercise @ t, all future stopping rules = 0 as the option contract is exercised.
-            stopping_rule[np.where(self.intrinsic_val[:, t] > hold_val), (t + 1) :] = 0
-
-            # cashflow @ t, if hold, cf = 0, if exercise, cf = intrinsic value @ t.
-            cf = np.where(self.intrinsic_val[:, t] > 0, self.intrinsic_val[:, t], 0)
-
-        simulation_vals = (
-            self.intrinsic_val * stopping_rule * self.discount_table
-        ).sum(axis=1)
-        self.expectation = np.average(simulation_vals)
+        values, self.exercise_index = longstaff_schwartz(
+            self.price_array,
+            self.K if strikes is None else strikes,
+            self.discount_table,
+            option_type=option_type,
+            poly_degree=poly_degree,
+            basis=basis,
+            solver=solver,
+        )
+        self.expectation = values[0] if strikes is None else values
 
         print("-" * 64)
         print(
-            " American %s Longstaff-Schwartz method (assume polynomial fit)"
-            " \n polynomial degree = %i \n S0 %4.1f \n K %2.1f \n"
-            " Option Value %4.3f "
-            % (option_type, poly_degree, self.S0, self.K, self.expectation)
+            " American %s Longstaff-Schwartz method (%s basis)"
+            " \n polynomial degree = %i \n S0 %4.1f \n K %s \n"
+            " Option Value %s "
+            % (
+                option_type,
+                basis,
+                poly_degree,
+                self.S0,
+                self.K if strikes is None else strikes,
+                np.round(self.expectation, 3),
+            )
         )
         print("-" * 64)
 
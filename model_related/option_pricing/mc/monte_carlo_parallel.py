@@ -0,0 +1,180 @@
+# -*- coding:utf-8 -*-
+"""
+Multi-core Monte Carlo option pricing with reproducible per-worker random streams.
+
+MonteCarloOptionPricing draws from the global np.random state, which cannot be shared safely between
+processes. ParallelMonteCarloPricing instead spawns one independent numpy.random.SeedSequence per worker,
+splits simulation_rounds into one path block per worker and lets every worker return the payoff
+statistics of its block. The partial statistics are merged in worker order, so for a given seed and
+n_workers the result is bit-identical between runs, and identical to running the same blocks serially.
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+import numpy as np
+
+from monte_carlo_streaming import (
+    PayoffStatistics,
+    StreamingMonteCarloPricing,
+    path_payoff,
+    simulate_gbm_chunk,
+)
+
+
+def _simulate_block(
+    seed_sequence: np.random.SeedSequence,
+    n_paths: int,
+    chunk_size: int,
+    model_params: Dict,
+    K: float,
+    payoff: str,
+    payoff_kwargs: Dict,
+) -> PayoffStatistics:
+    """Worker: simulate one path block with its own Generator, return its undiscounted payoff statistics."""
+    rng = np.random.default_rng(seed_sequence)
+    statistics = PayoffStatistics()
+    for start in range(0, n_paths, chunk_size):
+        price_chunk = simulate_gbm_chunk(
+            rng, min(chunk_size, n_paths - start), **model_params
+        )
+        statistics.update(path_payoff(price_chunk, K, payoff, **payoff_kwargs))
+    return statistics
+
+
+class ParallelMonteCarloPricing(StreamingMonteCarloPricing):
+    def __init__(
+        self,
+        r: float,
+        S0: float,
+        K: float,
+        T: float,
+        sigma: float,
+        div_yield: float = 0.0,
+        simulation_rounds: int = 10000,
+        no_of_slices: int = 4,
+        fix_random_seed: bool or int = False,
+        chunk_size: int = 10000,
+        n_workers: int = 4,
+    ):
+        """
+        Process-pool counterpart of StreamingMonteCarloPricing, same pricing methods.
+
+        :param fix_random_seed: boolean or integer, root seed of the per-worker SeedSequence streams.
+            False draws fresh entropy once, so every payoff is still priced on the same paths.
+        :param n_workers: no. of worker processes, also the no. of path blocks
+        """
+        super().__init__(
+            r=r,
+            S0=S0,
+            K=K,
+            T=T,
+            sigma=sigma,
+            div_yield=div_yield,
+            simulation_rounds=simulation_rounds,
+            no_of_slices=no_of_slices,
+            fix_random_seed=fix_random_seed,
+            chunk_size=chunk_size,
+        )
+        assert n_workers > 0, "no of workers must be positive"
+        self.n_workers = int(n_workers)
+
+        if type(fix_random_seed) is bool:
+            entropy = 15000 if fix_random_seed else None
+        elif type(fix_random_seed) is int:
+            entropy = fix_random_seed
+        self.seed_sequence = np.random.SeedSequence(entropy)
+        # spawn once, every pricing call then reuses the same per-worker streams
+        self.worker_seeds = self.seed_sequence.spawn(self.n_workers)
+
+        self.elapsed = None
+
+    def _blocks(self, payoff: str, payoff_kwargs: Dict) -> List[tuple]:
+        block_sizes = [
+            len(block)
+            for block in np.array_split(
+                np.arange(self.simulation_rounds), self.n_workers
+            )
+        ]
+        model_params = dict(
+            S0=self.S0,
+            mue=self.mue,
+            div_yield=self.div_yield,
+            sigma=self.sigma,
+            dt=self._dt,
+            no_of_slices=self.no_of_slices,
+        )
+        return [
+            (
+                seed_sequence,
+                n_paths,
+                self.chunk_size,
+                model_params,
+                self.K,
+                payoff,
+                payoff_kwargs,
+            )
+            for seed_sequence, n_paths in zip(self.worker_seeds, block_sizes)
+        ]
+
+    def _run_blocks(
+        self, payoff: str, payoff_kwargs: Dict, parallel: bool = True
+    ) -> PayoffStatistics:
+        blocks = self._blocks(payoff, payoff_kwargs)
+
+        start = time.perf_counter()
+        if parallel and self.n_workers > 1:
+            with ProcessPoolExecutor(max_workers=self.n_workers) as executor:
+                partials = list(executor.map(_simulate_block, *zip(*blocks)))
+        else:
+            partials = [_simulate_block(*block) for block in blocks]
+        self.elapsed = time.perf_counter() - start
+
+        # merge in worker order, floating point sums are then reproducible
+        statistics = PayoffStatistics()
+        for partial in partials:
+            statistics = statistics.merge(partial)
+        return statistics
+
+    def _price(self, payoff: str, **payoff_kwargs) -> float:
+        self.statistics = self._run_blocks(payoff, payoff_kwargs)
+        self.expectation = self.statistics.mean * self.discount_factor
+        self.standard_error = self.statistics.standard_error * self.discount_factor
+        return self.expectation
+
+    def speedup_report(self, payoff: str = "european", **payoff_kwargs) -> Dict:
+        """
+        Time the same path blocks serially (in-process) and on the process pool.
+
+        :return: dict with serial/parallel seconds, speedup and whether both runs gave identical prices
+        """
+        serial = self._run_blocks(payoff, payoff_kwargs, parallel=False)
+        serial_seconds = self.elapsed
+        parallel = self._run_blocks(payoff, payoff_kwargs, parallel=True)
+        parallel_seconds = self.elapsed
+
+        report = {
+            "n_workers": self.n_workers,
+            "simulation_rounds": self.simulation_rounds,
+            "serial_seconds": serial_seconds,
+            "parallel_seconds": parallel_seconds,
+            "speedup": serial_seconds / parallel_seconds,
+            "identical": serial == parallel,
+        }
+
+        print("-" * 64)
+        print(
+            " Parallel monte carlo (%s) \n Workers %i \n Serial %4.3fs \n Parallel %4.3fs \n"
+            " Speedup %4.2fx "
+            % (
+                payoff,
+                self.n_workers,
+                serial_seconds,
+                parallel_seconds,
+                report["speedup"],
+            )
+        )
+        print("-" * 64)
+
+        return report
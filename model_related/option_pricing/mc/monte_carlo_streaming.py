@@ -0,0 +1,376 @@
+# -*- coding:utf-8 -*-
+"""
+Memory-bounded Monte Carlo option pricing.
+
+MonteCarloOptionPricing keeps every (simulation_rounds, no_of_slices) array in memory, which is tens of GB
+at 1e6 paths x 252 steps. StreamingMonteCarloPricing simulates the same geometric Brownian motion paths in
+fixed-size chunks and only keeps a running payoff count, mean and sum of squared deviations, so peak memory
+depends on chunk_size and no_of_slices but not on simulation_rounds.
+
+The normal draws are taken row by row from the same random stream, so for the same random state the
+chunked paths are the in-memory paths and the price and standard error agree with the all-in-memory mode.
+"""
+
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+import numpy as np
+
+
+@dataclass
+class PayoffStatistics:
+    """
+    Running count, mean and sum of squared deviations (M2) of discounted payoffs.
+
+    Every chunk contributes its own mean and M2, combined with Chan's parallel update, so the variance
+    does not suffer the cancellation of sum(x**2) / n - mean**2 when the payoff mean dwarfs its spread.
+    """
+
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def update(self, discounted_payoff: np.ndarray) -> None:
+        if discounted_payoff.size == 0:
+            return
+        chunk_mean = float(np.mean(discounted_payoff))
+        deviation = discounted_payoff - chunk_mean
+        chunk = PayoffStatistics(
+            n=discounted_payoff.size,
+            mean=chunk_mean,
+            m2=float(np.dot(deviation, deviation)),
+        )
+        merged = self.merge(chunk)
+        self.n, self.mean, self.m2 = merged.n, merged.mean, merged.m2
+
+    def merge(self, other: "PayoffStatistics") -> "PayoffStatistics":
+        n = self.n + other.n
+        if n == 0:
+            return PayoffStatistics()
+        delta = other.mean - self.mean
+        return PayoffStatistics(
+            n=n,
+            mean=self.mean + delta * other.n / n,
+            m2=self.m2 + other.m2 + delta**2 * self.n * other.n / n,
+        )
+
+    @property
+    def variance(self) -> float:
+        """Population variance of the discounted payoff, as np.std(...) ** 2."""
+        return self.m2 / self.n
+
+    @property
+    def standard_error(self) -> float:
+        return np.sqrt(self.variance / self.n)
+
+
+def gbm_paths_from_normals(
+    z_t: np.ndarray,
+    S0: float,
+    mue: float,
+    div_yield: float,
+    sigma: float,
+    dt: float,
+) -> np.ndarray:
+    """
+    Geometric Brownian motion paths from standard normal increments, S0 at slice 0.
+
+    :param z_t: normals with shape (n_paths, no_of_slices - 1), one per time step
+    :return: price array with shape (n_paths, no_of_slices)
+    """
+    exp_mean = (mue - div_yield - sigma**2 * 0.5) * dt
+    exp_diffusion = sigma * np.sqrt(dt)
+
+    log_paths = np.empty((z_t.shape[0], z_t.shape[1] + 1))
+    log_paths[:, 0] = 0.0
+    np.cumsum(exp_mean + exp_diffusion * z_t, axis=1, out=log_paths[:, 1:])
+    return S0 * np.exp(log_paths)
+
+
+def simulate_gbm_chunk(
+    rng,
+    n_paths: int,
+    S0: float,
+    mue: float,
+    div_yield: float,
+    sigma: float,
+    dt: float,
+    no_of_slices: int,
+) -> np.ndarray:
+    """
+    Simulate n_paths geometric Brownian motion paths, S0 at slice 0, same scheme as
+    MonteCarloOptionPricing.stock_price_simulation but without the Python time loop.
+
+    :param rng: np.random.RandomState, np.random.Generator or the np.random module
+    :return: price array with shape (n_paths, no_of_slices)
+    """
+    # draw the full (n_paths, no_of_slices) block so the stream lines up with the in-memory z_t
+    z_t = rng.standard_normal((n_paths, no_of_slices))
+    return gbm_paths_from_normals(z_t[:, :-1], S0, mue, div_yield, sigma, dt)
+
+
+def _window_hits(barrier_check: np.ndarray, window: int, required: int) -> np.ndarray:
+    """Parisian check: does any window of consecutive slices hold >= required barrier hits."""
+    csum = np.zeros((barrier_check.shape[0], barrier_check.shape[1] + 1))
+    np.cumsum(barrier_check, axis=1, out=csum[:, 1:])
+    window_sums = csum[:, window:-1] - csum[:, : -window - 1]
+    return np.any(window_sums >= required, axis=1)
+
+
+def path_payoff(
+    price_array: np.ndarray,
+    K: float,
+    payoff: str,
+    option_type: str = "call",
+    avg_method: str = "arithmetic",
+    barrier_price: Optional[float] = None,
+    barrier_type: Optional[str] = None,
+    barrier_direction: Optional[str] = None,
+    parisian_window: Optional[int] = None,
+    parisian_barrier_days: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Undiscounted payoff of every path in price_array.
+
+    :param payoff: european, asian, barrier or lookback
+    :param parisian_window: no. of slices in the parisian window (derived from parisian_barrier_days)
+    :return: payoff array with shape (n_paths,)
+    """
+    assert (
+        option_type == "call" or option_type == "put"
+    ), "option type must be either call or put"
+    sign = 1.0 if option_type == "call" else -1.0
+
+    if payoff == "european":
+        return np.maximum(sign * (price_array[:, -1] - K), 0.0)
+
+    elif payoff == "asian":
+        assert (
+            avg_method == "arithmetic" or avg_method == "geometric"
+        ), "arithmetic or geometric average?"
+        if avg_method == "arithmetic":
+            average_prices = np.average(price_array, axis=1)
+        else:
+            average_prices = np.exp(np.average(np.log(price_array), axis=1))
+        return np.maximum(sign * (average_prices - K), 0.0)
+
+    elif payoff == "barrier":
+        assert (
+            barrier_type == "knock-in" or barrier_type == "knock-out"
+        ), "barrier type must be either knock-in or knock-out"
+        assert (
+            barrier_direction == "up" or barrier_direction == "down"
+        ), "barrier direction must be either up or down"
+        if barrier_direction == "up":
+            barrier_check = price_array >= barrier_price
+        else:
+            barrier_check = price_array <= barrier_price
+
+        if parisian_window is not None:
+            hit = _window_hits(barrier_check, parisian_window, parisian_barrier_days)
+        else:
+            hit = np.any(barrier_check, axis=1)
+
+        intrinsic_val = np.maximum(sign * (price_array[:, -1] - K), 0.0)
+        if barrier_type == "knock-in":
+            return np.where(hit, intrinsic_val, 0.0)
+        return np.where(hit, 0.0, intrinsic_val)
+
+    elif payoff == "lookback":
+        if option_type == "call":
+            return np.maximum(np.max(price_array, axis=1) - K, 0.0)
+        return np.maximum(K - np.min(price_array, axis=1), 0.0)
+
+    raise ValueError(f"Unknown payoff: {payoff}")
+
+
+class StreamingMonteCarloPricing:
+    def __init__(
+        self,
+        r: float,
+        S0: float,
+        K: float,
+        T: float,
+        sigma: float,
+        div_yield: float = 0.0,
+        simulation_rounds: int = 10000,
+        no_of_slices: int = 4,
+        fix_random_seed: bool or int = False,
+        chunk_size: int = 10000,
+    ):
+        """
+        Chunked counterpart of MonteCarloOptionPricing for constant interest rate and volatility.
+
+        Paths are regenerated from the same random state for every pricing call, so all payoffs are
+        priced on the same set of paths, as they are in the in-memory class.
+
+        :param r: interest rate, constant
+        :param S0: current price of the underlying asset (e.g. stock)
+        :param K: exercise price
+        :param T: time to maturity, in years, a float number
+        :param sigma: volatility (in standard deviation) of the asset annual returns
+        :param div_yield: annual dividend yield
+        :param simulation_rounds: total no. of simulated paths
+        :param no_of_slices: between time 0 and time T, the number of slices
+        :param fix_random_seed: boolean or integer, False continues from the global numpy random state
+        :param chunk_size: no. of paths simulated at a time, bounds the peak memory
+        """
+        assert sigma >= 0, "volatility cannot be less than zero"
+        assert S0 >= 0, "initial stock price cannot be less than zero"
+        assert T >= 0, "time to maturity cannot be less than zero"
+        assert div_yield >= 0, "dividend yield cannot be less than zero"
+        assert no_of_slices >= 0, "no of slices per year cannot be less than zero"
+        assert simulation_rounds >= 0, "simulation rounds cannot be less than zero"
+        assert chunk_size > 0, "chunk size must be positive"
+
+        self.S0 = float(S0)
+        self.K = float(K)
+        self.T = float(T)
+        self.mue = float(r)
+        self.sigma = float(sigma)
+        self.div_yield = float(div_yield)
+
+        self.no_of_slices = int(no_of_slices)
+        self.simulation_rounds = int(simulation_rounds)
+        self.chunk_size = int(chunk_size)
+
+        self._dt = self.T / self.no_of_slices
+        self.discount_factor = np.exp(-self.mue * self._dt * self.no_of_slices)
+
+        if type(fix_random_seed) is bool:
+            self._random_state = (
+                np.random.RandomState(15000).get_state()
+                if fix_random_seed
+                else np.random.get_state()
+            )
+        elif type(fix_random_seed) is int:
+            self._random_state = np.random.RandomState(fix_random_seed).get_state()
+
+        self.statistics = None
+
+    def _iter_price_chunks(self) -> Iterator[np.ndarray]:
+        rng = np.random.RandomState()
+        rng.set_state(self._random_state)
+
+        for start in range(0, self.simulation_rounds, self.chunk_size):
+            n_paths = min(self.chunk_size, self.simulation_rounds - start)
+            yield simulate_gbm_chunk(
+                rng,
+                n_paths,
+                self.S0,
+                self.mue,
+                self.div_yield,
+                self.sigma,
+                self._dt,
+                self.no_of_slices,
+            )
+
+    def _price(self, payoff: str, **payoff_kwargs) -> float:
+        self.statistics = PayoffStatistics()
+        for price_chunk in self._iter_price_chunks():
+            self.statistics.update(
+                path_payoff(price_chunk, self.K, payoff, **payoff_kwargs)
+                * self.discount_factor
+            )
+
+        self.expectation = self.statistics.mean
+        self.standard_error = self.statistics.standard_error
+        return self.expectation
+
+    def european_option(self, option_type: str = "call") -> float:
+        self._price("european", option_type=option_type)
+
+        print("-" * 64)
+        print(
+            " European %s streaming monte carlo \n S0 %4.1f \n K %2.1f \n"
+            " Option Value %4.3f \n Standard Error %4.5f "
+            % (option_type, self.S0, self.K, self.expectation, self.standard_error)
+        )
+        print("-" * 64)
+
+        return self.expectation
+
+    def european_call(self) -> float:
+        return self.european_option(option_type="call")
+
+    def asian_avg_price_option(
+        self, avg_method: str = "arithmetic", option_type: str = "call"
+    ) -> float:
+        """
+        Asian average price option. Note avg_method="geometric" averages the path prices geometrically,
+        whereas MonteCarloOptionPricing applies the geometric mean across the discounted payoffs.
+        """
+        self._price("asian", option_type=option_type, avg_method=avg_method)
+
+        print("-" * 64)
+        print(
+            " Asian %s streaming monte carlo %s average \n S0 %4.1f \n K %2.1f \n"
+            " Option Value %4.3f \n Standard Error %4.5f "
+            % (
+                option_type,
+                avg_method,
+                self.S0,
+                self.K,
+                self.expectation,
+                self.standard_error,
+            )
+        )
+        print("-" * 64)
+
+        return self.expectation
+
+    def barrier_option(
+        self,
+        option_type: str,
+        barrier_price: float,
+        barrier_type: str,
+        barrier_direction: str,
+        parisian_barrier_days: int or None = None,
+    ) -> float:
+        parisian_window = None
+        if parisian_barrier_days is not None:
+            parisian_window = int(
+                parisian_barrier_days * self.no_of_slices / (self.T * 252)
+            )
+
+        self._price(
+            "barrier",
+            option_type=option_type,
+            barrier_price=barrier_price,
+            barrier_type=barrier_type,
+            barrier_direction=barrier_direction,
+            parisian_window=parisian_window,
+            parisian_barrier_days=parisian_barrier_days,
+        )
+
+        print("-" * 64)
+        print(
+            " Barrier european %s (streaming) \n Type: %s \n Direction: %s @ %s \n S0 %4.1f \n K %2.1f \n"
+            " Option Value %4.3f \n Standard Error %4.5f "
+            % (
+                option_type,
+                barrier_type,
+                barrier_direction,
+                barrier_price,
+                self.S0,
+                self.K,
+                self.expectation,
+                self.standard_error,
+            )
+        )
+        print("-" * 64)
+
+        return self.expectation
+
+    def look_back_european(self, option_type: str = "call") -> float:
+        self._price("lookback", option_type=option_type)
+
+        print("-" * 64)
+        print(
+            " Lookback european %s streaming monte carlo \n S0 %4.1f \n K %2.1f \n"
+            " Option Value %4.3f \n Standard Error %4.5f "
+            % (option_type, self.S0, self.K, self.expectation, self.standard_error)
+        )
+        print("-" * 64)
+
+        return self.expectation
@@ -0,0 +1,281 @@
+# -*- coding:utf-8 -*-
+"""
+Variance-reduced Monte Carlo option pricing.
+
+VarianceReducedMonteCarloPricing prices the same payoffs as StreamingMonteCarloPricing (and therefore
+MonteCarloOptionPricing) with a selectable engine:
+
+- "none": plain pseudo-random paths
+- "antithetic": every normal draw z is paired with -z, the estimator averages the pair
+- "control_variate": the payoff is regressed on a control with a closed-form mean, the vanilla European
+  payoff priced by BSMOptionValuation (the discounted terminal price for European payoffs)
+- "sobol": scrambled Sobol points with a Brownian bridge construction (randomized QMC), the standard error
+  comes from n_replicates independent scramblings
+
+Every pricing call also sets effective_sample_size and ess_gain: the no. of plain Monte Carlo paths that
+would give the same standard error, and that number divided by the no. of paths actually simulated.
+"""
+
+import sys
+import warnings
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+from scipy import special
+from scipy.stats import qmc
+
+from monte_carlo_streaming import (
+    PayoffStatistics,
+    StreamingMonteCarloPricing,
+    gbm_paths_from_normals,
+    path_payoff,
+)
+
+VARIANCE_REDUCTION_METHODS = ("none", "antithetic", "control_variate", "sobol")
+
+
+def brownian_bridge(z_t: np.ndarray, dt: float) -> np.ndarray:
+    """
+    Brownian bridge construction of Brownian increments.
+
+    The first column of z_t fixes the terminal value W(T), the next ones the mid points of the remaining
+    intervals, so the leading (best distributed) Sobol dimensions drive the coarse shape of the path.
+
+    :param z_t: standard normals with shape (n_paths, n_steps)
+    :param dt: time step
+    :return: normalised increments (W(t_k) - W(t_k-1)) / sqrt(dt), shape (n_paths, n_steps)
+    """
+    n_paths, n_steps = z_t.shape
+    times = dt * np.arange(1, n_steps + 1)
+
+    w = np.empty((n_paths, n_steps))
+    w[:, -1] = np.sqrt(times[-1]) * z_t[:, 0]
+
+    j = 1
+    intervals = [(-1, n_steps - 1)]  # index -1 stands for W(0) = 0
+    while intervals:
+        left, right = intervals.pop(0)
+        if right - left <= 1:
+            continue
+        mid = (left + right) // 2
+        t_left = 0.0 if left < 0 else times[left]
+        t_mid, t_right = times[mid], times[right]
+
+        w_left = 0.0 if left < 0 else w[:, left]
+        span = t_right - t_left
+        bridge_mean = (
+            (t_right - t_mid) * w_left + (t_mid - t_left) * w[:, right]
+        ) / span
+        bridge_std = np.sqrt((t_mid - t_left) * (t_right - t_mid) / span)
+        w[:, mid] = bridge_mean + bridge_std * z_t[:, j]
+        j += 1
+        intervals += [(left, mid), (mid, right)]
+
+    return np.diff(w, axis=1, prepend=0.0) / np.sqrt(dt)
+
+
+class VarianceReducedMonteCarloPricing(StreamingMonteCarloPricing):
+    def __init__(
+        self,
+        r: float,
+        S0: float,
+        K: float,
+        T: float,
+        sigma: float,
+        div_yield: float = 0.0,
+        simulation_rounds: int = 10000,
+        no_of_slices: int = 4,
+        fix_random_seed: bool or int = False,
+        chunk_size: int = 10000,
+        variance_reduction: str = "antithetic",
+        n_replicates: int = 16,
+    ):
+        """
+        :param variance_reduction: none, antithetic, control_variate or sobol
+        :param n_replicates: no. of independent Sobol scramblings, only used by sobol
+        """
+        assert (
+            variance_reduction in VARIANCE_REDUCTION_METHODS
+        ), f"variance reduction must be one of {VARIANCE_REDUCTION_METHODS}"
+        assert (
+            n_replicates > 1
+        ), "at least two replicates are needed for a standard error"
+
+        super().__init__(
+            r=r,
+            S0=S0,
+            K=K,
+            T=T,
+            sigma=sigma,
+            div_yield=div_yield,
+            simulation_rounds=simulation_rounds,
+            no_of_slices=no_of_slices,
+            fix_random_seed=fix_random_seed,
+            chunk_size=chunk_size,
+        )
+        self.variance_reduction = variance_reduction
+        self.n_replicates = int(n_replicates)
+
+        self.effective_sample_size = None
+        self.ess_gain = None
+
+    def _paths(self, z_t: np.ndarray) -> np.ndarray:
+        return gbm_paths_from_normals(
+            z_t, self.S0, self.mue, self.div_yield, self.sigma, self._dt
+        )
+
+    def _iter_normal_chunks(self, n_paths: int) -> Iterator[np.ndarray]:
+        rng = np.random.RandomState()
+        rng.set_state(self._random_state)
+
+        for start in range(0, n_paths, self.chunk_size):
+            yield rng.standard_normal(
+                (min(self.chunk_size, n_paths - start), self.no_of_slices - 1)
+            )
+
+    def _control_mean(self, payoff: str, option_type: str) -> float:
+        """Closed-form expectation of the discounted control payoff."""
+        # the last slice sits (no_of_slices - 1) * dt after S0, while payoffs are discounted over T
+        t_last = self._dt * (self.no_of_slices - 1)
+        extra_discount = np.exp(-self.mue * (self.T - t_last))
+
+        if payoff == "european":
+            return self.S0 * np.exp(-self.div_yield * t_last) * extra_discount
+
+        # the analytic reference lives in ../bsm, only needed for non-European payoffs
+        bsm_dir = str(Path(__file__).parent.parent / "bsm")
+        if bsm_dir not in sys.path:
+            sys.path.insert(0, bsm_dir)
+        from BSM_option_class import BSMOptionValuation
+
+        bsm = BSMOptionValuation(
+            self.S0, self.K, t_last, self.mue, self.sigma, self.div_yield
+        )
+        value = bsm.call_value() if option_type == "call" else bsm.put_value()
+        return value * extra_discount
+
+    def _control(self, price_array: np.ndarray, payoff: str, option_type: str):
+        """Discounted control payoff of every path, see _control_mean."""
+        if payoff == "european":
+            return price_array[:, -1] * self.discount_factor
+        return (
+            path_payoff(price_array, self.K, "european", option_type=option_type)
+            * self.discount_factor
+        )
+
+    def _price_antithetic(self, payoff: str, payoff_kwargs: dict):
+        plain, paired = PayoffStatistics(), PayoffStatistics()
+        for z_t in self._iter_normal_chunks(self.simulation_rounds // 2):
+            y_plus = path_payoff(self._paths(z_t), self.K, payoff, **payoff_kwargs)
+            y_minus = path_payoff(self._paths(-z_t), self.K, payoff, **payoff_kwargs)
+            plain.update(np.concatenate([y_plus, y_minus]) * self.discount_factor)
+            paired.update(0.5 * (y_plus + y_minus) * self.discount_factor)
+        return paired.mean, paired.standard_error, plain
+
+    def _price_control_variate(self, payoff: str, payoff_kwargs: dict):
+        option_type = payoff_kwargs.get("option_type", "call")
+        control_mean = self._control_mean(payoff, option_type)
+
+        # running means and co-moment of payoff and control, merged per chunk
+        # (Chan et al.) like PayoffStatistics, so no sum-of-products cancellation
+        plain, control = PayoffStatistics(), PayoffStatistics()
+        co_moment = 0.0
+        for z_t in self._iter_normal_chunks(self.simulation_rounds):
+            price_array = self._paths(z_t)
+            y = path_payoff(price_array, self.K, payoff, **payoff_kwargs)
+            y = y * self.discount_factor
+            x = self._control(price_array, payoff, option_type)
+
+            n_chunk = x.size
+            if n_chunk == 0:
+                continue
+            mean_x, mean_y = float(np.mean(x)), float(np.mean(y))
+            chunk_co_moment = float(np.dot(x - mean_x, y - mean_y))
+            co_moment += chunk_co_moment + (
+                (mean_x - control.mean)
+                * (mean_y - plain.mean)
+                * control.n
+                * n_chunk
+                / (control.n + n_chunk)
+            )
+            plain.update(y)
+            control.update(x)
+
+        n = control.n
+        var_x = control.variance
+        cov_xy = co_moment / n
+        beta = cov_xy / var_x if var_x > 0 else 0.0
+        self.control_beta = beta
+
+        expectation = plain.mean - beta * (control.mean - control_mean)
+        residual_var = max(plain.variance - beta * cov_xy, 0.0)
+        return expectation, np.sqrt(residual_var / n), plain
+
+    def _price_sobol(self, payoff: str, payoff_kwargs: dict):
+        plain = PayoffStatistics()
+        rng = np.random.RandomState()
+        rng.set_state(self._random_state)
+        seeds = np.random.SeedSequence(rng.randint(2**31)).spawn(self.n_replicates)
+        rounds_per_replicate = self.simulation_rounds // self.n_replicates
+
+        replicate_means = []
+        for seed in seeds:
+            sampler = qmc.Sobol(
+                d=self.no_of_slices - 1,
+                scramble=True,
+                seed=np.random.default_rng(seed),
+            )
+            replicate = PayoffStatistics()
+            for start in range(0, rounds_per_replicate, self.chunk_size):
+                with warnings.catch_warnings():
+                    # balance properties need power of 2 sizes, the estimate is still unbiased
+                    warnings.simplefilter("ignore", UserWarning)
+                    u = sampler.random(
+                        min(self.chunk_size, rounds_per_replicate - start)
+                    )
+                z_t = special.ndtri(np.clip(u, 1e-12, 1 - 1e-12))
+                y = path_payoff(
+                    self._paths(brownian_bridge(z_t, self._dt)),
+                    self.K,
+                    payoff,
+                    **payoff_kwargs,
+                )
+                replicate.update(y * self.discount_factor)
+            replicate_means.append(replicate.mean)
+            plain = plain.merge(replicate)
+
+        replicate_means = np.array(replicate_means)
+        standard_error = np.std(replicate_means, ddof=1) / np.sqrt(self.n_replicates)
+        return replicate_means.mean(), standard_error, plain
+
+    def _price(self, payoff: str, **payoff_kwargs) -> float:
+        if self.variance_reduction == "none":
+            self.effective_sample_size = float(self.simulation_rounds)
+            self.ess_gain = 1.0
+            return super()._price(payoff, **payoff_kwargs)
+
+        engine = {
+            "antithetic": self._price_antithetic,
+            "control_variate": self._price_control_variate,
+            "sobol": self._price_sobol,
+        }[self.variance_reduction]
+        self.expectation, self.standard_error, self.statistics = engine(
+            payoff, payoff_kwargs
+        )
+
+        # plain monte carlo paths needed for the same standard error
+        if self.standard_error > 0:
+            self.effective_sample_size = (
+                self.statistics.variance / self.standard_error**2
+            )
+        else:
+            self.effective_sample_size = np.inf
+        self.ess_gain = self.effective_sample_size / self.statistics.n
+
+        print("-" * 64)
+        print(
+            " Variance reduction: %s \n Effective sample size %4.0f \n ESS gain %4.2fx "
+            % (self.variance_reduction, self.effective_sample_size, self.ess_gain)
+        )
+        return self.expectation
@@ -0,0 +1,278 @@
+# -*- coding:utf-8 -*-
+"""
+Stochastic process kernels for Monte Carlo simulation.
+
+Unlike MonteCarloOptionPricing.vasicek_model / cox_ingersoll_ross_model / heston /
+stock_price_simulation_with_poisson_jump, which loop over the slices in Python and overwrite self.r and
+self.sigma, every process here is an immutable parameter object whose simulate() returns a read-only Paths
+object. Rate, volatility and price processes are combined by passing the rate and volatility Paths into
+AssetPriceProcess.simulate.
+
+- Vasicek: exact AR(1) transition, solved as a linear filter (scipy.signal.lfilter) along the time axis
+- CIR and Heston variance: full truncation Euler scheme in a compiled kernel (Numba when installed,
+  otherwise a NumPy kernel that is vectorized across paths). The scheme is path-dependent, so the NumPy
+  fallback still loops over time steps in Python: it is only ~1.5x faster than the original loops
+  (in-place steps on precomputed shocks); the large speed-up needs numba
+- asset price: log-Euler steps with optional Merton jumps, accumulated with np.cumsum
+
+Paths have shape (n_paths, no_of_slices), slice 0 being the initial value, the same layout as
+MonteCarloOptionPricing.price_array.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import numpy as np
+from scipy.signal import lfilter
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover
+    njit = None
+
+
+@dataclass(frozen=True)
+class Paths:
+    """
+    Read-only simulated paths.
+
+    :param values: shape (n_paths, no_of_slices), slice 0 is the initial value
+    :param dt: time step in years
+    :param shocks: standard normals that drove the process, shape (n_paths, no_of_slices - 1)
+    """
+
+    values: np.ndarray
+    dt: float
+    shocks: Optional[np.ndarray] = None
+
+    def __post_init__(self):
+        self.values.setflags(write=False)
+        if self.shocks is not None:
+            self.shocks.setflags(write=False)
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+
+def discount_table(
+    rate: Union[float, Paths], no_of_slices: int, dt: float
+) -> np.ndarray:
+    """
+    Discount factor from each slice back to slice 0, exp(-sum of r * dt over the previous steps).
+
+    :return: shape (no_of_slices,) for a constant rate, (n_paths, no_of_slices) for rate paths
+    """
+    if isinstance(rate, Paths):
+        accrued = np.cumsum(rate.values[:, :-1] * dt, axis=1)
+        return np.exp(-np.concatenate([np.zeros((rate.shape[0], 1)), accrued], axis=1))
+    return np.exp(-rate * dt * np.arange(no_of_slices))
+
+
+def _sqrt_diffusion_numpy(x0, kappa, theta, sigma, dt, z):
+    """Full truncation Euler for dx = kappa (theta - x) dt + sigma sqrt(x) dW, vectorized over paths.
+
+    Each step depends on the previous one through sqrt(max(x, 0)), so time is still a Python loop; the
+    scaled shocks and drift constants are computed up front and every step runs in place on contiguous
+    time-major rows.
+    """
+    n_paths, n_steps = z.shape
+    x = np.empty((n_steps + 1, n_paths))
+    x[0] = x0
+    noise = z.T * (sigma * np.sqrt(dt))
+    decay = 1.0 - kappa * dt
+    drift = kappa * theta * dt
+    x_plus = np.empty(n_paths)
+    for i in range(n_steps):
+        np.maximum(x[i], 0.0, out=x_plus)
+        step = x[i + 1]
+        # x + kappa (theta - x+) dt + sigma sqrt(x+) sqrt(dt) z, with x+ = max(x, 0)
+        np.sqrt(x_plus, out=step)
+        step *= noise[i]
+        step += x[i]
+        step += drift
+        x_plus *= kappa * dt
+        step -= x_plus
+    return x.T.copy()
+
+
+def _sqrt_diffusion_scalar(x0, kappa, theta, sigma, dt, z):
+    n_paths, n_steps = z.shape
+    x = np.empty((n_paths, n_steps + 1))
+    sqrt_dt = np.sqrt(dt)
+    for p in range(n_paths):
+        x[p, 0] = x0
+        for i in range(n_steps):
+            x_plus = max(x[p, i], 0.0)
+            x[p, i + 1] = (
+                x[p, i]
+                + kappa * (theta - x_plus) * dt
+                + sigma * np.sqrt(x_plus) * sqrt_dt * z[p, i]
+            )
+    return x
+
+
+_sqrt_diffusion_numba = (
+    njit(cache=True)(_sqrt_diffusion_scalar) if njit is not None else None
+)
+
+
+def sqrt_diffusion_kernel(x0, kappa, theta, sigma, dt, z, use_numba=None):
+    """
+    Square-root diffusion stepping kernel shared by CIR and Heston.
+
+    :param use_numba: None picks Numba when it is installed
+    """
+    if use_numba is None:
+        use_numba = _sqrt_diffusion_numba is not None
+    if use_numba:
+        assert _sqrt_diffusion_numba is not None, "numba is not installed"
+        return _sqrt_diffusion_numba(
+            float(x0), float(kappa), float(theta), float(sigma), float(dt), z
+        )
+    return _sqrt_diffusion_numpy(x0, kappa, theta, sigma, dt, z)
+
+
+@dataclass(frozen=True)
+class VasicekProcess:
+    """
+    dr = a(b - r) * dt + sigma_r * dz, interest rate can be negative.
+
+    :param r0: initial short rate (annualized)
+    :param a: speed of mean-reversion
+    :param b: long-term mean rate
+    :param sigma_r: interest rate volatility
+    """
+
+    r0: float
+    a: float
+    b: float
+    sigma_r: float
+
+    def simulate(self, n_paths: int, no_of_slices: int, dt: float, rng) -> Paths:
+        z = rng.standard_normal((n_paths, no_of_slices - 1))
+        phi = np.exp(-self.a * dt)
+        step_std = np.sqrt(
+            self.sigma_r**2 / (2 * self.a) * (1 - np.exp(-2 * self.a * dt))
+        )
+
+        # r_i - b = phi * (r_i-1 - b) + step_std * z_i is a first-order linear filter along time
+        deviation = lfilter(
+            [1.0],
+            [1.0, -phi],
+            step_std * z,
+            axis=1,
+            zi=np.full((n_paths, 1), phi * (self.r0 - self.b)),
+        )[0]
+        values = np.empty((n_paths, no_of_slices))
+        values[:, 0] = self.r0
+        values[:, 1:] = self.b + deviation
+        return Paths(values=values, dt=dt, shocks=z)
+
+
+@dataclass(frozen=True)
+class CIRProcess:
+    """
+    dr = a(b - r) * dt + sigma_r * sqrt(r) * dz, full truncation keeps the drift and diffusion
+    well defined when the discretised rate dips below zero.
+    """
+
+    r0: float
+    a: float
+    b: float
+    sigma_r: float
+    use_numba: Optional[bool] = None
+
+    def simulate(self, n_paths: int, no_of_slices: int, dt: float, rng) -> Paths:
+        assert 2 * self.a * self.b > self.sigma_r**2, "Feller condition"
+        z = rng.standard_normal((n_paths, no_of_slices - 1))
+        values = sqrt_diffusion_kernel(
+            self.r0, self.a, self.b, self.sigma_r, dt, z, self.use_numba
+        )
+        return Paths(values=np.maximum(values, 0.0), dt=dt, shocks=z)
+
+
+@dataclass(frozen=True)
+class HestonProcess:
+    """
+    dv = kappa(theta - v) * dt + sigma_v * sqrt(v) * dZ for the variance v.
+    simulate returns the volatility sqrt(max(v, 0)); its shocks are used by AssetPriceProcess to
+    correlate the price with the volatility.
+
+    :param v0: initial variance
+    :param kappa: rate at which v reverts to theta
+    :param theta: long-term variance
+    :param sigma_v: volatility of the variance
+    """
+
+    v0: float
+    kappa: float
+    theta: float
+    sigma_v: float
+    use_numba: Optional[bool] = None
+
+    def simulate(self, n_paths: int, no_of_slices: int, dt: float, rng) -> Paths:
+        assert 2 * self.kappa * self.theta > self.sigma_v**2, "Feller condition"
+        z = rng.standard_normal((n_paths, no_of_slices - 1))
+        variance = sqrt_diffusion_kernel(
+            self.v0, self.kappa, self.theta, self.sigma_v, dt, z, self.use_numba
+        )
+        return Paths(values=np.sqrt(np.maximum(variance, 0.0)), dt=dt, shocks=z)
+
+
+@dataclass(frozen=True)
+class AssetPriceProcess:
+    """
+    Log-Euler asset price dS/S = (r - q - lambda k) dt + sigma dW + (J - 1) dN with optional Merton jumps,
+    ln(J) ~ N(jump_mean, jump_std), N a Poisson process with jump_intensity jumps per year.
+
+    :param rho: correlation between the price and the volatility shocks (Heston), used when the
+        volatility Paths carry shocks
+    """
+
+    S0: float
+    div_yield: float = 0.0
+    rho: float = 0.0
+    jump_intensity: float = 0.0
+    jump_mean: float = 0.0
+    jump_std: float = 0.0
+
+    def simulate(
+        self,
+        n_paths: int,
+        no_of_slices: int,
+        dt: float,
+        rng,
+        rate: Union[float, Paths] = 0.0,
+        volatility: Union[float, Paths] = 0.2,
+    ) -> Paths:
+        """
+        :param rate: constant short rate or rate Paths (e.g. from VasicekProcess / CIRProcess)
+        :param volatility: constant volatility or volatility Paths (e.g. from HestonProcess)
+        """
+        n_steps = no_of_slices - 1
+        r = rate.values[:, :-1] if isinstance(rate, Paths) else rate
+        sigma = (
+            volatility.values[:, :-1] if isinstance(volatility, Paths) else volatility
+        )
+
+        z = rng.standard_normal((n_paths, n_steps))
+        if isinstance(volatility, Paths) and volatility.shocks is not None and self.rho:
+            z = self.rho * volatility.shocks + np.sqrt(1 - self.rho**2) * z
+
+        k = np.exp(self.jump_mean + 0.5 * self.jump_std**2) - 1
+        increments = (
+            r - self.div_yield - self.jump_intensity * k - 0.5 * sigma**2
+        ) * dt + sigma * np.sqrt(dt) * z
+
+        if self.jump_intensity > 0:
+            # the sum of m normal jump sizes is normal with m times the mean and variance
+            m = rng.poisson(lam=self.jump_intensity * dt, size=(n_paths, n_steps))
+            increments = increments + (
+                m * self.jump_mean
+                + np.sqrt(m) * self.jump_std * rng.standard_normal((n_paths, n_steps))
+            )
+
+        log_paths = np.zeros((n_paths, no_of_slices))
+        np.cumsum(increments, axis=1, out=log_paths[:, 1:])
+        return Paths(values=self.S0 * np.exp(log_paths), dt=dt, shocks=z)
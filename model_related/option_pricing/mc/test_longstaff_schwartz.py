@@ -0,0 +1,62 @@
+import numpy as np
+from longstaff_schwartz import longstaff_schwartz
+from monte_carlo_class import MonteCarloOptionPricing
+from monte_carlo_streaming import simulate_gbm_chunk
+
+
+def _paths(n_paths=20000, n_steps=50, seed=0):
+    dt = 1.0 / n_steps
+    rng = np.random.RandomState(seed)
+    price_array = simulate_gbm_chunk(
+        rng, n_paths, 36.0, 0.06, 0.0, 0.2, dt, n_steps + 1
+    )
+    discount_table = np.exp(-0.06 * dt * np.arange(n_steps + 1))
+    return price_array, discount_table
+
+
+def test_american_put_matches_longstaff_schwartz_table():
+    # Longstaff and Schwartz (2001), table 1: S0=36, K=40, sigma=0.2, T=1 -> 4.478
+    price_array, discount_table = _paths()
+
+    for basis in ("laguerre", "power"):
+        for solver in ("normal", "qr"):
+            values, exercise_index = longstaff_schwartz(
+                price_array, 40.0, discount_table, "put", basis=basis, solver=solver
+            )
+            assert abs(values[0] - 4.478) < 0.06
+            assert exercise_index.shape == (1, price_array.shape[0])
+
+
+def test_several_strikes_on_the_same_paths():
+    price_array, discount_table = _paths(n_paths=5000)
+    strikes = [32.0, 36.0, 40.0]
+
+    values, exercise_index = longstaff_schwartz(
+        price_array, strikes, discount_table, "put"
+    )
+    single, _ = longstaff_schwartz(price_array, 36.0, discount_table, "put")
+
+    assert np.all(np.diff(values) > 0)
+    assert np.isclose(values[1], single[0])
+    assert exercise_index.min() >= -1 and exercise_index.max() == 50
+
+
+def test_american_option_method_returns_value_per_strike(capsys):
+    mc = MonteCarloOptionPricing(
+        r=0.06,
+        S0=36.0,
+        K=40.0,
+        T=1.0,
+        sigma=0.2,
+        simulation_rounds=2000,
+        no_of_slices=20,
+    )
+    mc.stock_price_simulation()
+
+    value = mc.american_option_longstaff_schwartz(option_type="put")
+    values = mc.american_option_longstaff_schwartz(
+        option_type="put", strikes=[38.0, 40.0]
+    )
+
+    assert np.isclose(values[1], value)
+    assert "Longstaff-Schwartz" in capsys.readouterr().out
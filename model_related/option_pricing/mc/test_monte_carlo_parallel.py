@@ -0,0 +1,35 @@
+import numpy as np
+from monte_carlo_parallel import ParallelMonteCarloPricing
+
+PARAMS = dict(
+    r=0.05, S0=40.0, K=40.0, T=0.5, sigma=0.3, simulation_rounds=4000, no_of_slices=20
+)
+
+
+def test_same_seed_and_workers_is_bit_identical():
+    first = ParallelMonteCarloPricing(
+        **PARAMS, fix_random_seed=11, n_workers=2, chunk_size=500
+    )
+    second = ParallelMonteCarloPricing(
+        **PARAMS, fix_random_seed=11, n_workers=2, chunk_size=500
+    )
+
+    assert first.european_call() == second.european_call()
+    assert first.standard_error == second.standard_error
+
+
+def test_speedup_report_runs_identical_blocks():
+    mc = ParallelMonteCarloPricing(**PARAMS, fix_random_seed=11, n_workers=2)
+    report = mc.speedup_report("asian", option_type="call", avg_method="arithmetic")
+
+    assert report["identical"]
+    assert report["n_workers"] == 2
+    assert report["speedup"] > 0
+
+
+def test_price_close_to_black_scholes():
+    mc = ParallelMonteCarloPricing(
+        **dict(PARAMS, simulation_rounds=40000), fix_random_seed=1, n_workers=1
+    )
+    # BSM call value, the last slice is (no_of_slices - 1) * dt = 0.475 years out, discounted over T
+    assert abs(mc.european_call() - 3.7410) < 4 * mc.standard_error
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from monte_carlo_class import MonteCarloOptionPricing
+from monte_carlo_streaming import PayoffStatistics, StreamingMonteCarloPricing
+
+PARAMS = dict(
+    r=0.05, S0=40.0, K=40.0, T=0.5, sigma=0.3, simulation_rounds=2000, no_of_slices=50
+)
+
+
+@pytest.fixture
+def both_modes():
+    np.random.seed(7)
+    in_memory = MonteCarloOptionPricing(**PARAMS)
+    in_memory.stock_price_simulation()
+
+    np.random.seed(7)
+    streaming = StreamingMonteCarloPricing(**PARAMS, chunk_size=300)
+    return in_memory, streaming
+
+
+def test_chunked_paths_reproduce_in_memory_prices(both_modes):
+    in_memory, streaming = both_modes
+    disc = np.exp(-np.sum(in_memory.r, axis=1))
+
+    assert np.isclose(streaming.european_call(), in_memory.european_call())
+    expected_se = np.std(in_memory.terminal_profit * disc) / np.sqrt(
+        PARAMS["simulation_rounds"]
+    )
+    assert np.isclose(streaming.standard_error, expected_se)
+
+    assert np.isclose(
+        streaming.asian_avg_price_option(option_type="put"),
+        in_memory.asian_avg_price_option(option_type="put"),
+    )
+    assert np.isclose(
+        streaming.barrier_option("call", 45.0, "knock-out", "up"),
+        in_memory.barrier_option("call", 45.0, "knock-out", "up"),
+    )
+    assert np.isclose(
+        streaming.barrier_option(
+            "put", 35.0, "knock-in", "down", parisian_barrier_days=5
+        ),
+        in_memory.barrier_option(
+            "put", 35.0, "knock-in", "down", parisian_barrier_days=5
+        ),
+    )
+    assert np.isclose(
+        streaming.look_back_european("put"), in_memory.look_back_european("put")
+    )
+
+
+def test_price_does_not_depend_on_chunk_size():
+    small = StreamingMonteCarloPricing(**PARAMS, fix_random_seed=3, chunk_size=7)
+    large = StreamingMonteCarloPricing(**PARAMS, fix_random_seed=3, chunk_size=10**6)
+
+    assert np.isclose(small.european_option("put"), large.european_option("put"))
+    assert small.statistics.n == PARAMS["simulation_rounds"]
+
+
+def test_payoff_statistics_merge():
+    x = np.random.default_rng(0).standard_normal(101)
+    stats_a, stats_b = PayoffStatistics(), PayoffStatistics()
+    stats_a.update(x[:40])
+    stats_b.update(x[40:])
+    merged = stats_a.merge(stats_b)
+
+    assert np.isclose(merged.mean, x.mean())
+    assert np.isclose(merged.standard_error, x.std() / np.sqrt(x.size))
+
+
+def test_payoff_statistics_large_mean():
+    # sum of squares minus squared mean cancels to noise at this offset
+    x = 1e9 + np.random.default_rng(1).standard_normal(10_000)
+    stats = PayoffStatistics()
+    for chunk in np.array_split(x, 7):
+        stats.update(chunk)
+
+    assert np.isclose(stats.mean, x.mean())
+    assert np.isclose(stats.variance, x.var(), rtol=1e-6)
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from monte_carlo_variance_reduction import (
+    VarianceReducedMonteCarloPricing,
+    brownian_bridge,
+)
+
+PARAMS = dict(
+    r=0.05, S0=40.0, K=40.0, T=0.5, sigma=0.3, simulation_rounds=8000, no_of_slices=32
+)
+# BSM call value for the simulated horizon, 31/32 of T, discounted over T
+BSM_CALL = 3.7836
+
+
+def test_brownian_bridge_gives_independent_standard_increments():
+    z_t = np.random.default_rng(0).standard_normal((200_000, 7))
+    increments = brownian_bridge(z_t, dt=0.1)
+
+    assert np.allclose(np.cov(increments, rowvar=False), np.eye(7), atol=0.02)
+
+
+@pytest.mark.parametrize("method", ["antithetic", "control_variate", "sobol"])
+def test_variance_reduction_is_unbiased_and_gains_samples(method):
+    mc = VarianceReducedMonteCarloPricing(
+        **PARAMS, fix_random_seed=2, variance_reduction=method
+    )
+
+    assert abs(mc.european_call() - BSM_CALL) < 4 * mc.standard_error + 1e-3
+    assert mc.ess_gain > 1.0
+    assert mc.effective_sample_size > PARAMS["simulation_rounds"]
+
+
+def test_control_variate_on_asian_uses_bsm_control():
+    plain = VarianceReducedMonteCarloPricing(
+        **PARAMS, fix_random_seed=2, variance_reduction="none"
+    )
+    cv = VarianceReducedMonteCarloPricing(
+        **PARAMS, fix_random_seed=2, variance_reduction="control_variate"
+    )
+
+    plain_value = plain.asian_avg_price_option(option_type="put")
+    cv_value = cv.asian_avg_price_option(option_type="put")
+
+    assert plain.ess_gain == 1.0
+    assert cv.standard_error < plain.standard_error
+    assert abs(cv_value - plain_value) < 4 * plain.standard_error
+
+
+def test_control_variate_beta_when_payoff_mean_dwarfs_spread():
+    # deep in the money the call payoff is the control minus a constant, beta = 1;
+    # raw sums of squares at this price level cancel to noise
+    params = dict(PARAMS, S0=1e8, K=1.0, sigma=1e-5, chunk_size=1000)
+    cv = VarianceReducedMonteCarloPricing(
+        **params, fix_random_seed=2, variance_reduction="control_variate"
+    )
+    cv.european_call()
+
+    assert np.isclose(cv.control_beta, 1.0, rtol=0, atol=1e-9)
+    # the residual is a constant, its standard error is rounding noise
+    assert cv.standard_error < 1e-4
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from monte_carlo_streaming import gbm_paths_from_normals
+from stochastic_processes import (
+    AssetPriceProcess,
+    CIRProcess,
+    HestonProcess,
+    VasicekProcess,
+    _sqrt_diffusion_scalar,
+    discount_table,
+    sqrt_diffusion_kernel,
+)
+
+
+def test_vasicek_filter_matches_recursion():
+    process = VasicekProcess(r0=0.03, a=0.5, b=0.05, sigma_r=0.01)
+    paths = process.simulate(100, 12, 1 / 12, np.random.default_rng(0))
+
+    phi = np.exp(-0.5 / 12)
+    step_std = np.sqrt(0.01**2 / 1.0 * (1 - np.exp(-1.0 / 12)))
+    expected = np.full(100, 0.03)
+    for i in range(11):
+        expected = 0.05 + phi * (expected - 0.05) + step_std * paths.shocks[:, i]
+        assert np.allclose(paths.values[:, i + 1], expected)
+
+
+def test_sqrt_diffusion_numpy_kernel_matches_scalar_loop():
+    z = np.random.default_rng(1).standard_normal((50, 30))
+    vectorized = sqrt_diffusion_kernel(0.04, 2.0, 0.04, 0.3, 0.01, z, use_numba=False)
+
+    assert np.allclose(
+        vectorized, _sqrt_diffusion_scalar(0.04, 2.0, 0.04, 0.3, 0.01, z)
+    )
+
+
+def test_paths_are_read_only_and_processes_combine():
+    rng = np.random.default_rng(2)
+    rate = CIRProcess(r0=0.05, a=0.5, b=0.05, sigma_r=0.1).simulate(200, 25, 0.01, rng)
+    vol = HestonProcess(v0=0.09, kappa=2.0, theta=0.09, sigma_v=0.3).simulate(
+        200, 25, 0.01, rng
+    )
+    price = AssetPriceProcess(S0=40.0, rho=-0.7).simulate(
+        200, 25, 0.01, rng, rate=rate, volatility=vol
+    )
+
+    assert price.shape == rate.shape == vol.shape == (200, 25)
+    assert np.all(price.values[:, 0] == 40.0)
+    assert discount_table(rate, 25, 0.01).shape == (200, 25)
+    assert np.corrcoef(price.shocks.ravel(), vol.shocks.ravel())[0, 1] < -0.6
+    with pytest.raises(ValueError):
+        price.values[0, 0] = 1.0
+
+
+def test_constant_inputs_reproduce_gbm_and_jumps_keep_the_martingale():
+    process = AssetPriceProcess(S0=40.0, div_yield=0.01)
+    paths = process.simulate(
+        10, 5, 0.1, np.random.default_rng(3), rate=0.05, volatility=0.3
+    )
+    expected = gbm_paths_from_normals(paths.shocks, 40.0, 0.05, 0.01, 0.3, 0.1)
+    assert np.allclose(paths.values, expected)
+
+    jump = AssetPriceProcess(S0=40.0, jump_intensity=2.0, jump_mean=-0.1, jump_std=0.2)
+    terminal = jump.simulate(
+        200_000, 2, 0.5, np.random.default_rng(4), rate=0.05, volatility=0.2
+    ).values[:, -1]
+    assert abs(terminal.mean() - 40.0 * np.exp(0.05 * 0.5)) < 0.15